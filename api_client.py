@@ -0,0 +1,348 @@
+import time
+import random
+import requests
+import threading
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+from requests.adapters import HTTPAdapter
+from config import *
+
+api_url = API_URL
+
+# OpenTDB response codes.
+RESPONSE_SUCCESS = 0
+RESPONSE_NO_RESULTS = 1
+RESPONSE_INVALID_PARAMETER = 2
+RESPONSE_TOKEN_NOT_FOUND = 3
+RESPONSE_TOKEN_EMPTY = 4
+RESPONSE_RATE_LIMIT = 5
+
+# One keep-alive session shared by every request, so connections are reused.
+session = requests.Session()
+session.mount("https://", HTTPAdapter(pool_connections=2, pool_maxsize=4))
+session.mount("http://", HTTPAdapter(pool_connections=2, pool_maxsize=4))
+
+# Circuit breaker state: consecutive failed fetches, and when the circuit may close again.
+breaker_lock = threading.Lock()
+consecutive_failures = 0
+circuit_open_until = 0.0
+# Rate limiting: once OpenTDB has asked us to slow down, the API is not called again
+# before rate_limited_until. Rate limits are not failures and never open the circuit.
+rate_limited_until = 0.0
+
+# OpenTDB session token, requested on first use and renewed for every new game.
+token_lock = threading.Lock()
+session_token = ""
+# After a failed token request, no token is requested again before token_retry_at.
+token_retry_at = 0.0
+
+
+def backoff_delay(attempt: int) -> float:
+    """
+    Computes how long to wait before the next retry, using exponential backoff with full jitter.
+
+    Args:
+        attempt (int): The number of the retry (0 for the first one).
+
+    Returns:
+        float: The delay in seconds.
+    """
+    return random.uniform(0, min(API_BACKOFF_MAX, API_BACKOFF_BASE * 2**attempt))
+
+
+def circuit_is_open() -> bool:
+    """
+    Tells whether the circuit breaker currently blocks calls to the API.
+
+    Returns:
+        bool: True if the API should not be called, False otherwise.
+    """
+    return time.monotonic() < circuit_open_until
+
+
+def rate_limit_wait() -> float:
+    """
+    Tells how long the API still asks us to wait after rate limiting us.
+
+    Returns:
+        float: The remaining wait in seconds (0 if the API is not rate limiting us).
+    """
+    return max(rate_limited_until - time.monotonic(), 0.0)
+
+
+def retry_after() -> float:
+    """
+    Tells how long callers should wait before asking the API again.
+
+    Returns:
+        float: The remaining open time of the circuit breaker or rate limit wait,
+            or the base backoff delay.
+    """
+    return max(circuit_open_until - time.monotonic(), rate_limit_wait(), API_BACKOFF_BASE)
+
+
+def record_result(success: bool) -> None:
+    """
+    Updates the circuit breaker after a fetch. The circuit opens for CIRCUIT_BREAKER_COOLDOWN
+    seconds once CIRCUIT_BREAKER_THRESHOLD fetches in a row have failed.
+
+    Args:
+        success (bool): Whether the fetch returned questions.
+    """
+    global consecutive_failures, circuit_open_until
+
+    with breaker_lock:
+        if success:
+            consecutive_failures = 0
+            circuit_open_until = 0.0
+        else:
+            consecutive_failures += 1
+            if consecutive_failures >= CIRCUIT_BREAKER_THRESHOLD:
+                circuit_open_until = time.monotonic() + CIRCUIT_BREAKER_COOLDOWN
+
+
+def record_rate_limit() -> None:
+    """
+    Remembers that the API rate limited us, so that it is not called again for
+    API_RATE_LIMIT_DELAY seconds.
+    """
+    global rate_limited_until
+
+    with breaker_lock:
+        rate_limited_until = time.monotonic() + API_RATE_LIMIT_DELAY
+
+
+def with_query(url: str, **params) -> str:
+    """
+    Adds or replaces query parameters in a URL.
+
+    Args:
+        url (str): The URL to update.
+        **params: The query parameters to set.
+
+    Returns:
+        str: The updated URL.
+    """
+    parts = urlsplit(url)
+    query = dict(parse_qsl(parts.query))
+    query.update(params)
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def build_api_url(
+    difficulty: str = "", category: int = 0, amount: int = 0, url: str = ""
+) -> str:
+    """
+    Builds the URL of a request for questions of a single difficulty level (and category),
+    so that every fetched question can be used.
+
+    Args:
+        difficulty (str, optional): The difficulty level of the questions (any level if not given).
+        category (int, optional): The OpenTDB category id (any category if not given).
+        amount (int, optional): The number of questions to fetch (default is QUESTION_BATCH_SIZE).
+        url (str, optional): The URL of the questions endpoint (default is api_url).
+
+    Returns:
+        str: The URL to request.
+    """
+    params = {"amount": amount or QUESTION_BATCH_SIZE}
+    if difficulty:
+        params["difficulty"] = difficulty
+    if category:
+        params["category"] = category
+
+    return with_query(url or api_url, **params)
+
+
+def token_url(url: str, **params) -> str:
+    """
+    Builds the URL of OpenTDB's token endpoint next to the questions endpoint.
+
+    Args:
+        url (str): The URL of the questions endpoint.
+        **params: The query parameters of the token request.
+
+    Returns:
+        str: The URL of the token endpoint.
+    """
+    parts = urlsplit(url)
+    path = parts.path.rsplit("/", 1)[0] + "/api_token.php"
+    return urlunsplit(parts._replace(path=path, query=urlencode(params)))
+
+
+def request_token(url: str = "", timeout: float = None) -> str:
+    """
+    Asks the API for a new session token and stores it. When no token could be had,
+    fetches go on without one for TOKEN_RETRY_DELAY seconds (or until the next game)
+    instead of asking again every time.
+
+    Args:
+        url (str, optional): The URL of the questions endpoint (default is api_url).
+        timeout (float, optional): The request timeout in seconds (default is API_TIMEOUT).
+
+    Returns:
+        str: The new token, an empty string if the API gave none, or None if the API
+            could not be reached.
+    """
+    global session_token, token_retry_at
+
+    try:
+        response = session.get(
+            token_url(url or api_url, command="request"), timeout=timeout or API_TIMEOUT
+        )
+        token = response.json()["token"] if response.status_code == 200 else ""
+    except (requests.exceptions.JSONDecodeError, KeyError, TypeError):
+        token = ""
+    except requests.exceptions.RequestException:
+        token = None
+
+    session_token = token or ""
+    if not token:
+        token_retry_at = time.monotonic() + TOKEN_RETRY_DELAY
+    return token
+
+
+def reset_token(url: str = "", timeout: float = None) -> None:
+    """
+    Asks the API to forget the questions already returned for the current token,
+    which is needed once the token has been exhausted.
+
+    Args:
+        url (str, optional): The URL of the questions endpoint (default is api_url).
+        timeout (float, optional): The request timeout in seconds (default is API_TIMEOUT).
+    """
+    global session_token
+
+    try:
+        response = session.get(
+            token_url(url or api_url, command="reset", token=session_token),
+            timeout=timeout or API_TIMEOUT,
+        )
+        if response.status_code != 200 or response.json()["response_code"] != RESPONSE_SUCCESS:
+            session_token = ""
+    except (requests.exceptions.RequestException, KeyError, TypeError):
+        session_token = ""
+
+
+def clear_token() -> None:
+    """
+    Drops the current session token, so that a new one is requested by the next fetch.
+    Called at the start of every game.
+    """
+    global session_token, token_retry_at
+
+    with token_lock:
+        session_token = ""
+        token_retry_at = 0.0
+
+
+def request_results(url: str, timeout: float = None):
+    """
+    Sends a single request to the API.
+
+    Args:
+        url (str): The URL to request.
+        timeout (float, optional): The request timeout in seconds (default is API_TIMEOUT).
+
+    Returns:
+        tuple: The OpenTDB response code (None if the request itself failed) and the results list.
+    """
+    try:
+        response = session.get(url, timeout=timeout or API_TIMEOUT)
+    except requests.exceptions.RequestException:
+        return None, []
+
+    if response.status_code == 429:
+        return RESPONSE_RATE_LIMIT, []
+    if response.status_code != 200:
+        return None, []
+
+    try:
+        data = response.json()
+        return data["response_code"], data["results"]
+    except (requests.exceptions.JSONDecodeError, KeyError, TypeError):
+        return None, []
+
+
+def fetch_results(url: str = "", retries: int = None, timeout: float = None) -> list:
+    """
+    Fetches one batch of raw questions from the API, retrying failed requests with
+    exponential backoff. Nothing is requested while the circuit breaker is open.
+    When the API rate limits us, the next attempt waits API_RATE_LIMIT_DELAY seconds
+    (see retry_after); a fetch without retries gives up at once instead.
+    When USE_SESSION_TOKEN is set, the session token is sent along, and renewed or
+    reset once when the API reports it as unknown or exhausted, which does not use up
+    a retry.
+
+    Args:
+        url (str, optional): The URL to request (default is api_url).
+        retries (int, optional): The number of retries (default is API_MAX_RETRIES).
+        timeout (float, optional): The timeout of each request (default is API_TIMEOUT).
+
+    Returns:
+        list: The "results" list of the API response (empty if the API has no matching
+            questions), or None if the API could not be reached or rate limited us.
+    """
+    if circuit_is_open():
+        return None
+
+    url = url or api_url
+    retries = API_MAX_RETRIES if retries is None else retries
+
+    attempt = 0
+    token_renewed = False
+
+    while True:
+        wait = rate_limit_wait()
+        if wait:
+            if not retries:
+                return None
+            time.sleep(wait)
+
+        if USE_SESSION_TOKEN:
+            with token_lock:
+                token = session_token
+                if not token and time.monotonic() >= token_retry_at:
+                    token = request_token(url, timeout)
+            if token is None:
+                # The token request could not reach the API: neither will this one.
+                response_code, results = None, []
+            else:
+                response_code, results = request_results(
+                    with_query(url, token=token) if token else url, timeout
+                )
+        else:
+            response_code, results = request_results(url, timeout)
+
+        if (
+            response_code in (RESPONSE_TOKEN_NOT_FOUND, RESPONSE_TOKEN_EMPTY)
+            and not token_renewed
+        ):
+            token_renewed = True
+            if response_code == RESPONSE_TOKEN_NOT_FOUND:
+                clear_token()
+            else:
+                with token_lock:
+                    reset_token(url, timeout)
+            continue
+
+        if response_code == RESPONSE_SUCCESS:
+            record_result(True)
+            return results
+
+        if response_code in (RESPONSE_NO_RESULTS, RESPONSE_INVALID_PARAMETER):
+            # The API is up, but asking again would give the same answer.
+            record_result(True)
+            return []
+
+        if response_code == RESPONSE_RATE_LIMIT:
+            # The API is up but asks us to slow down: wait, without counting a failure.
+            record_rate_limit()
+        if attempt == retries:
+            break
+        if response_code != RESPONSE_RATE_LIMIT:
+            time.sleep(backoff_delay(attempt))
+        attempt += 1
+
+    if response_code != RESPONSE_RATE_LIMIT:
+        record_result(False)
+    return None
@@ -1,31 +1,45 @@
-import cv2
-import pygame
-import inflect
-import numpy as np
-from config import *
-from project import get_question
+import time
 
-pygame.init()
+# Taken before the heavy imports (pygame, OpenCV, numpy, requests...), to measure the
+# whole cold start up to the first menu frame.
+start_time = time.perf_counter()
 
-# Load sounds
+import math
+import pygame
+import profiler
+from config import *
+from video import BackgroundVideo, stop_transcodes
+from text_cache import render_text
+from assets import (
+    get_font,
+    preload_fonts,
+    get_image,
+    get_sound,
+    memory_report,
+    set_screen_size,
+    declare_screen_assets,
+    preload_screen,
+)
+from project import (
+    play_round,
+    get_question_nowait,
+    prefetch_questions,
+    start_game_session,
+    rank_players,
+    inflect_engine,
+)
+
+first_frame_shown = False
+
+# Sounds and images, loaded through the asset manager
 title_music_path = "Musics/title.mp3"
 settings_music_path = "Musics/settings.mp3"
 question_music_path = "Musics/question.wav"
-result_sound = pygame.mixer.Sound("Musics/endgame.mp3")
-correct_sound = pygame.mixer.Sound("Musics/correct.mp3")
-incorrect_sound = pygame.mixer.Sound("Musics/incorrect.wav")
-
-# Get the current screen size
-screen_info = pygame.display.Info()
-screen_width = screen_info.current_w
-screen_height = screen_info.current_h
-
-# Set the window size to match the screen size
-screen = pygame.display.set_mode((screen_width, screen_height))
-
-pygame.display.set_caption("Culture Kingdom")
-
-font = pygame.font.Font(None, FONT_SIZE)
+result_sound_path = "Musics/endgame.mp3"
+correct_sound_path = "Musics/correct.mp3"
+incorrect_sound_path = "Musics/incorrect.wav"
+settings_background_path = "Backgrounds/Pregame.jpg"
+result_image_path = "Backgrounds/results.jpg"
 
 # Background video paths
 background_video_paths = {
@@ -35,56 +49,222 @@ background_video_paths = {
     "result": "Backgrounds/pre_result.mp4",
 }
 
-# Load background videos
-background_videos = {
-    state: cv2.VideoCapture(path) for state, path in background_video_paths.items()
-}
+# Background videos, opened when their screen is first needed (see get_background_video)
+background_videos = {}
+
+# Gamepads opened for simultaneous rounds (see assign_answer_inputs)
+joysticks = []
+
+# Set by init()
+screen = None
+screen_width = 0
+screen_height = 0
+font = None
+
+
+def init() -> None:
+    """
+    Initializes Pygame and opens the full-screen window. Nothing is loaded when the module
+    is imported: sounds, images and videos are loaded when their screen first needs them.
+
+    Returns:
+        None
+    """
+    global screen, screen_width, screen_height, font
+
+    pygame.init()
+
+    # Get the current screen size
+    screen_info = pygame.display.Info()
+    screen_width = screen_info.current_w
+    screen_height = screen_info.current_h
+
+    # Set the window size to match the screen size
+    screen = pygame.display.set_mode((screen_width, screen_height))
+    set_screen_size((screen_width, screen_height))
+
+    pygame.display.set_caption("Culture Kingdom")
+
+    preload_fonts()
+    font = get_font(FONT_SIZE)
+
+
+def report_startup_time() -> None:
+    """
+    Prints how long the cold start took, the first time a menu frame is shown.
+
+    Returns:
+        None
+    """
+    global first_frame_shown
+
+    if not first_frame_shown:
+        first_frame_shown = True
+        elapsed = (time.perf_counter() - start_time) * 1000
+        print(f"First menu frame shown {elapsed:.0f} ms after startup")
+
+
+def show_timed_screen(duration: int, draw_frame, skippable: bool = True):
+    """
+    Shows a screen for a fixed time while the main loop keeps running: frames keep being
+    drawn (so videos keep playing) and events keep being processed, instead of freezing
+    the window with pygame.time.wait.
+
+    Args:
+        duration (int): How long the screen is shown, in milliseconds.
+        draw_frame (Callable): Draws one frame of the screen.
+        skippable (bool): Whether a key press or a click ends the screen early.
+
+    Returns:
+        Any: STATE_EXIT if the window was closed, otherwise None once the time is over or skipped.
+    """
+    end_time = pygame.time.get_ticks() + duration
+
+    while pygame.time.get_ticks() < end_time:
+        draw_frame()
+        flip_display()
+        limit_frame_rate()
+
+        for event in poll_events():
+            if event.type == pygame.QUIT:
+                return STATE_EXIT
+
+            if skippable and event.type in (pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN):
+                return None
+
+    return None
+
+
+def get_background_video(name: str) -> BackgroundVideo:
+    """
+    Returns a background video, opening it and starting its decoder thread on first use.
+
+    Args:
+        name (str): The name of the video in background_video_paths.
+
+    Returns:
+        BackgroundVideo: The background video.
+    """
+    if name not in background_videos:
+        background_videos[name] = BackgroundVideo(
+            background_video_paths[name], (screen_width, screen_height)
+        )
+    return background_videos[name]
+
 
 STATE_MENU = 0
 STATE_SETTINGS = 1
 STATE_PLAY = 2
 STATE_EXIT = 3
 
+# Assets of each screen, preloaded in the background while the previous screen runs
+declare_screen_assets("settings", [(settings_background_path, True)])
+declare_screen_assets(
+    "play",
+    [(settings_background_path, True)],
+    [correct_sound_path, incorrect_sound_path],
+)
+declare_screen_assets("ranking", [(result_image_path, False)], [result_sound_path])
 
-def get_video_frame(video_capture: cv2.VideoCapture) -> pygame.Surface:
+# Frame governor shared by every screen loop.
+clock = pygame.time.Clock()
+
+
+def limit_frame_rate(idle: bool = False) -> None:
     """
-    Fetches the next frame from the given video capture object, looping back to the start if the video ends.
+    Waits until the next frame is due, so that screen loops don't keep a CPU core busy.
+    Video frames are timed by the videos themselves, so they play at their native speed.
 
     Args:
-        video_capture (cv2.VideoCapture): The video capture object to read frames from.
+        idle (bool): True for static screens, rendered at IDLE_FPS instead of TARGET_FPS.
 
     Returns:
-        pygame.Surface: The current video frame as a Pygame surface, or None if unable to read a frame.
-    """
-    ret, frame = video_capture.read()
-    if not ret:  # Loop video if it ends
-        video_capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
-        ret, frame = video_capture.read()
-    if ret:
-        frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        return pygame.surfarray.make_surface(np.transpose(frame, (1, 0, 2)))
-    return None
+        None
+    """
+    if profiler.enabled:
+        pygame.display.update(profiler.draw_overlay(screen, get_font(24), [memory_report()]))
 
+    clock.tick(IDLE_FPS if idle else TARGET_FPS)
+    profiler.end_frame()
 
-def display_video_frame_in_center(video_capture: cv2.VideoCapture) -> None:
+
+def flip_display(rects: list = None) -> None:
     """
-    Displays the current frame of the given video capture object, scaled to fit the entire screen.
+    Presents the frame: the whole screen, or only the given areas.
 
     Args:
-        video_capture (cv2.VideoCapture): The video capture object to display frames from.
+        rects (list, optional): The areas of the screen to update (default is the whole screen).
 
     Returns:
         None
     """
-    background_frame = get_video_frame(video_capture)
+    with profiler.stage("flip"):
+        if rects is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(rects)
 
-    if background_frame is not None:
-        background_frame = pygame.transform.scale(
-            background_frame, (screen_width, screen_height)
-        )
 
-        # Blit the background frame to cover the entire screen
-        screen.blit(background_frame, (0, 0))
+# Window events after which the whole window must be drawn again.
+REPAINT_EVENTS = (
+    pygame.VIDEOEXPOSE,
+    pygame.WINDOWEXPOSED,
+    pygame.WINDOWSHOWN,
+    pygame.WINDOWRESTORED,
+)
+
+
+def poll_events(renderer=None) -> list:
+    """
+    Takes the pending input and window events.
+
+    Args:
+        renderer (DirtyScreen, optional): The renderer of the current static screen, fully
+            redrawn on the next frame when the window was exposed or restored.
+
+    Returns:
+        list: The events.
+    """
+    with profiler.stage("event_polling"):
+        events = pygame.event.get()
+
+    if renderer is not None and any(event.type in REPAINT_EVENTS for event in events):
+        renderer.invalidate()
+
+    return events
+
+
+def get_video_frame(video: BackgroundVideo) -> pygame.Surface:
+    """
+    Fetches the next frame of the given background video, already decoded and scaled
+    to the screen size by its decoder thread.
+
+    Args:
+        video (BackgroundVideo): The video to read frames from.
+
+    Returns:
+        pygame.Surface: The current video frame as a Pygame surface, or None if no frame is ready yet.
+    """
+    return video.get_frame()
+
+
+def display_video_frame_in_center(video: BackgroundVideo) -> None:
+    """
+    Displays the current frame of the given background video, covering the entire screen.
+
+    Args:
+        video (BackgroundVideo): The video to display frames from.
+
+    Returns:
+        None
+    """
+    background_frame = get_video_frame(video)
+
+    if background_frame is not None:
+        # Blit the background frame to cover the entire screen, swapping its BGR
+        # pixels into the screen format on the way.
+        with profiler.stage("color_conversion"):
+            screen.blit(background_frame, (0, 0))
 
 
 def display_text(
@@ -94,8 +274,8 @@ def display_text(
     color: tuple = BLACK,
     custom_font: pygame.font.Font = None,
     max_width: int = None,
-) -> None:
-    """ ""
+) -> pygame.Rect:
+    """
     Displays text on the screen, with optional line wrapping if the text exceeds the specified maximum width.
 
     Args:
@@ -107,42 +287,44 @@ def display_text(
         max_width (int, optional): Maximum width of the text box for line wrapping.
 
     Returns:
-        None
+        pygame.Rect: The area of the screen covered by the text.
     """
     # Choose the font
     current_font = custom_font if custom_font else font
 
-    # Split text into lines if max_width is provided
-    if max_width:
-        words = text.split(" ")
-        lines = []
-        current_line = ""
+    # Render each line (wrapped to max_width, reusing cached surfaces) and blit it with line spacing
+    line_height = current_font.get_linesize()
+    text_rect = pygame.Rect(x, y, 0, 0)
+    with profiler.stage("text_render"):
+        for i, rendered_text in enumerate(render_text(text, current_font, color, max_width)):
+            text_rect.union_ip(screen.blit(rendered_text, (x, y + i * line_height)))
 
-        for word in words:
-            # Test if adding the next word will exceed the width
-            test_line = f"{current_line} {word}".strip()
-            text_width, _ = current_font.size(test_line)
+    return text_rect
 
-            if text_width <= max_width:
-                # Add word to the current line
-                current_line = test_line
-            else:
-                # Start a new line and add the current line to lines
-                lines.append(current_line)
-                current_line = word  # Start new line with the word that exceeded width
 
-        # Add the last line
-        if current_line:
-            lines.append(current_line)
-    else:
-        # If max_width is not set, treat the entire text as a single line
-        lines = [text]
+def draw_button(
+    text: str, x: int, y: int, width: int, height: int, color: tuple, hovered: bool
+) -> pygame.Rect:
+    """
+    Draws a button on the screen.
 
-    # Render each line and blit it with line spacing
-    line_height = current_font.get_linesize()
-    for i, line in enumerate(lines):
-        rendered_text = current_font.render(line, True, color)
-        screen.blit(rendered_text, (x, y + i * line_height))
+    Args:
+        text (str): The text displayed on the button.
+        x (int): The x-coordinate of the button's top-left corner.
+        y (int): The y-coordinate of the button's top-left corner.
+        width (int): The width of the button.
+        height (int): The height of the button.
+        color (tuple): The text color of the button.
+        hovered (bool): Whether the mouse is over the button.
+
+    Returns:
+        pygame.Rect: The area of the screen covered by the button.
+    """
+    with profiler.stage("button_draw"):
+        button_rect = pygame.draw.rect(screen, BLUE if hovered else BLACK, (x, y, width, height))
+        return button_rect.union(
+            display_text(text, x + 40, y + 30, color, custom_font=get_font(50))
+        )
 
 
 def button(
@@ -153,6 +335,7 @@ def button(
     height: int,
     action=None,
     color: tuple = WHITE,
+    renderer=None,
 ):
     """
     Displays an interactive button on the screen and handles click events.
@@ -165,6 +348,7 @@ def button(
         height (int): The height of the button.
         action (Any, optional): The action to trigger when the button is clicked (default is None).
         color (tuple): The text color of the button (default is WHITE).
+        renderer (DirtyScreen, optional): Draw the button through this renderer instead of directly.
 
     Returns:
         Any: The value of `action` if the button is clicked, otherwise None.
@@ -172,22 +356,27 @@ def button(
     mouse = pygame.mouse.get_pos()
     click = pygame.mouse.get_pressed()
 
-    if x + width > mouse[0] > x and y + height > mouse[1] > y:
-        pygame.draw.rect(screen, BLUE, (x, y, width, height))
-        if click[0] == 1 and action is not None:
-            return action
-    else:
-        pygame.draw.rect(screen, BLACK, (x, y, width, height))
+    hovered = x + width > mouse[0] > x and y + height > mouse[1] > y
+    if hovered and click[0] == 1 and action is not None:
+        return action
 
-    display_text(text, x + 40, y + 30, color, custom_font=pygame.font.Font(None, 50))
+    if renderer is not None:
+        renderer.add(
+            ("button", x, y),
+            (text, width, height, color, hovered),
+            lambda: draw_button(text, x, y, width, height, color, hovered),
+        )
+    else:
+        draw_button(text, x, y, width, height, color, hovered)
 
 
-def exit_button(color: tuple = WHITE):
+def exit_button(color: tuple = WHITE, renderer=None):
     """
     Displays a pre-configured "Exit Game" button in the bottom-right corner of the screen.
 
     Args:
         color (tuple): The text color of the button (default is WHITE).
+        renderer (DirtyScreen, optional): Draw the button through this renderer instead of directly.
 
     Returns:
         Any: The action triggered by clicking the button (STATE_EXIT).
@@ -200,13 +389,17 @@ def exit_button(color: tuple = WHITE):
         BUTTON_HEIGHT,
         STATE_EXIT,
         color=color,
+        renderer=renderer,
     )
 
 
-def back_button():
+def back_button(renderer=None):
     """
     Displays a "Back" button in the bottom-left corner of the screen.
 
+    Args:
+        renderer (DirtyScreen, optional): Draw the button through this renderer instead of directly.
+
     Returns:
         Any: The action triggered by clicking the button (STATE_MENU).
     """
@@ -217,9 +410,115 @@ def back_button():
         BUTTON_WIDTH,
         BUTTON_HEIGHT,
         STATE_MENU,
+        renderer=renderer,
     )
 
 
+class DirtyScreen:
+    """
+    Retained-mode renderer for static screens (a still background with text and buttons).
+
+    Each frame, the screen declares its elements with a hashable state describing what they
+    show. Only the elements whose state changed are redrawn, over the background restored
+    in their old area, and only those areas are presented with pygame.display.update.
+    A frame where nothing changed presents nothing at all.
+    Elements are expected not to overlap each other.
+    """
+
+    def __init__(self, background: pygame.Surface):
+        """
+        Args:
+            background (pygame.Surface): The image drawn behind every element.
+        """
+        self.background = background
+        # Elements on screen: key -> (state, rect), and elements declared for the next frame.
+        self.drawn = {}
+        self.elements = {}
+        self.full_redraw = True
+
+    def add(self, key, state, draw) -> None:
+        """
+        Declares an element of the next frame.
+
+        Args:
+            key (Any): A name identifying the element from one frame to the next.
+            state (Any): A hashable description of what the element shows.
+            draw (Callable): Draws the element and returns the pygame.Rect it covers.
+        """
+        self.elements[key] = (state, draw)
+
+    def text(
+        self,
+        text: str,
+        x: int,
+        y: int,
+        color: tuple = BLACK,
+        custom_font: pygame.font.Font = None,
+        max_width: int = None,
+    ) -> None:
+        """
+        Declares a text of the next frame (see display_text for the arguments).
+        """
+        self.add(
+            ("text", x, y),
+            (text, color, custom_font, max_width),
+            lambda: display_text(text, x, y, color, custom_font, max_width),
+        )
+
+    def invalidate(self) -> None:
+        """
+        Forces the next frame to be drawn and presented entirely.
+        """
+        self.full_redraw = True
+
+    def present(self) -> None:
+        """
+        Draws the elements that changed since the last frame and presents their areas.
+
+        Returns:
+            None
+        """
+        elements, self.elements = self.elements, {}
+
+        if self.full_redraw:
+            screen.blit(self.background, (0, 0))
+            self.drawn = {key: (state, draw()) for key, (state, draw) in elements.items()}
+            self.full_redraw = False
+            flip_display()
+            return
+
+        changed = {
+            key
+            for key, (state, _) in elements.items()
+            if key not in self.drawn or self.drawn[key][0] != state
+        }
+        removed = [key for key in self.drawn if key not in elements]
+
+        if not changed and not removed:
+            return
+
+        # Erase the old content of the elements that changed or disappeared.
+        erased = [self.drawn[key][1] for key in list(changed) + removed if key in self.drawn]
+        for rect in erased:
+            screen.blit(self.background, rect, rect)
+
+        dirty = list(erased)
+        drawn = {}
+        for key, (state, draw) in elements.items():
+            if key in changed:
+                rect = draw()
+                dirty.append(rect)
+            else:
+                rect = self.drawn[key][1]
+                # Redraw unchanged elements partly erased with the background.
+                if rect.collidelist(erased) != -1:
+                    draw()
+            drawn[key] = (state, rect)
+
+        self.drawn = drawn
+        flip_display(dirty)
+
+
 def main_menu() -> tuple:
     """
     Displays the main menu screen, allowing the user to choose between starting a new game,
@@ -232,11 +531,13 @@ def main_menu() -> tuple:
     pygame.mixer.music.load(title_music_path)
     pygame.mixer.music.play(-1)
 
-    video_capture = background_videos["menu"]
+    video_capture = get_background_video("menu")
+
+    preload_screen("settings")
 
-    title_font = pygame.font.Font(None, 150)
+    title_font = get_font(150)
 
-    pygame.display.flip()
+    flip_display()
 
     while True:
         display_video_frame_in_center(video_capture)
@@ -244,7 +545,7 @@ def main_menu() -> tuple:
         display_text("Culture Kingdom", screen_width // 2 - 400, 175, RED, title_font)
 
         display_text(
-            "King.Flow23", 20, screen_height - 80, WHITE, pygame.font.Font(None, 100)
+            "King.Flow23", 20, screen_height - 80, WHITE, get_font(100)
         )
 
         if (
@@ -278,9 +579,11 @@ def main_menu() -> tuple:
         if exit_button() == STATE_EXIT:
             return STATE_EXIT, 0
 
-        pygame.display.flip()
+        flip_display()
+        report_startup_time()
+        limit_frame_rate()
 
-        for event in pygame.event.get():
+        for event in poll_events():
             if event.type == pygame.QUIT:
                 return STATE_EXIT, 0
 
@@ -304,17 +607,18 @@ def game_settings(solo: bool = False) -> tuple:
     num_questions = 0
     entering_players = True
 
-    txt_font = pygame.font.Font(None, FONT_SIZE)
+    txt_font = get_font(FONT_SIZE)
 
-    settings_background = pygame.image.load("Backgrounds/pregame.jpg")
-    settings_background = pygame.transform.scale(
-        settings_background, (screen_width, screen_height)
-    )
+    preload_screen("play")
+    # Start decoding the question video while the players are being set up.
+    get_background_video("questions")
+
+    settings_background = get_image(settings_background_path, fit_screen=True)
+    renderer = DirtyScreen(settings_background)
 
     while entering_players:
-        screen.blit(settings_background, (0, 0))
 
-        display_text(
+        renderer.text(
             "Welcome to Culture Kingdom, our quiz game !!",
             175,
             50,
@@ -323,7 +627,7 @@ def game_settings(solo: bool = False) -> tuple:
         )
 
         if solo == False:
-            display_text(
+            renderer.text(
                 "How many players are playing today ?",
                 250,
                 150,
@@ -331,7 +635,7 @@ def game_settings(solo: bool = False) -> tuple:
                 custom_font=txt_font,
             )
         else:
-            display_text(
+            renderer.text(
                 "Unlimited rounds! Play as long as you'd like. You can quit anytime.",
                 50,
                 150,
@@ -341,14 +645,14 @@ def game_settings(solo: bool = False) -> tuple:
             )
             num_players = 1
 
-        if exit_button() == STATE_EXIT:
+        if exit_button(renderer=renderer) == STATE_EXIT:
             return STATE_EXIT, [], 0
 
-        if back_button() == STATE_MENU:
+        if back_button(renderer=renderer) == STATE_MENU:
             pygame.mixer.music.stop()
             return STATE_MENU, [], 0
 
-        for event in pygame.event.get():
+        for event in poll_events(renderer):
             if event.type == pygame.QUIT:
                 return STATE_EXIT
 
@@ -359,7 +663,7 @@ def game_settings(solo: bool = False) -> tuple:
                     num_players = int(event.unicode)
 
         if num_players == 1 and solo == False:
-            display_text(
+            renderer.text(
                 f"==> Seems like today, we'll only play with one player.",
                 50,
                 400,
@@ -367,7 +671,7 @@ def game_settings(solo: bool = False) -> tuple:
                 custom_font=txt_font,
             )
         elif num_players > 0 and solo == False:
-            display_text(
+            renderer.text(
                 f"==> So there'll be {num_players} players",
                 50,
                 400,
@@ -375,23 +679,23 @@ def game_settings(solo: bool = False) -> tuple:
                 custom_font=txt_font,
             )
 
-        pygame.display.flip()
+        renderer.present()
+        limit_frame_rate(idle=True)
 
     for i in range(num_players):
         player_name = ""
         entering_name = True
 
         while entering_name:
-            screen.blit(settings_background, (0, 0))
 
-            if exit_button() == STATE_EXIT:
+            if exit_button(renderer=renderer) == STATE_EXIT:
                 return STATE_EXIT, [], 0
 
-            if back_button() == STATE_MENU:
+            if back_button(renderer=renderer) == STATE_MENU:
                 pygame.mixer.music.stop()
                 return STATE_MENU, [], 0
 
-            display_text(
+            renderer.text(
                 f"Please, enter a name for player {i + 1}: ",
                 100,
                 50,
@@ -399,7 +703,7 @@ def game_settings(solo: bool = False) -> tuple:
                 custom_font=txt_font,
             )
 
-            for event in pygame.event.get():
+            for event in poll_events(renderer):
                 if event.type == pygame.QUIT:
                     return STATE_EXIT
 
@@ -412,21 +716,21 @@ def game_settings(solo: bool = False) -> tuple:
                     else:
                         player_name += event.unicode
 
-            display_text(
+            renderer.text(
                 f"==> Player {i + 1} name is: {player_name}",
                 100,
                 300,
                 BLACK,
                 custom_font=txt_font,
             )
-            pygame.display.flip()
+            renderer.present()
+            limit_frame_rate(idle=True)
 
     entering_questions = True
     if solo == False:
         while entering_questions:
-            screen.blit(settings_background, (0, 0))
 
-            display_text(
+            renderer.text(
                 "Good now, choose the number of questions / rounds !!",
                 50,
                 50,
@@ -434,14 +738,14 @@ def game_settings(solo: bool = False) -> tuple:
                 custom_font=txt_font,
             )
 
-            if exit_button() == STATE_EXIT:
+            if exit_button(renderer=renderer) == STATE_EXIT:
                 return STATE_EXIT, [], 0
 
-            if back_button() == STATE_MENU:
+            if back_button(renderer=renderer) == STATE_MENU:
                 pygame.mixer.music.stop()
                 return STATE_MENU, [], 0
 
-            for event in pygame.event.get():
+            for event in poll_events(renderer):
                 if event.type == pygame.QUIT:
                     return STATE_EXIT
 
@@ -452,7 +756,7 @@ def game_settings(solo: bool = False) -> tuple:
                         num_questions = int(event.unicode)
 
             if num_questions > 0:
-                display_text(
+                renderer.text(
                     f"Okay, today we are going to play on {num_questions} round(s)",
                     50,
                     300,
@@ -460,7 +764,8 @@ def game_settings(solo: bool = False) -> tuple:
                     custom_font=txt_font,
                 )
 
-            pygame.display.flip()
+            renderer.present()
+            limit_frame_rate(idle=True)
 
     else:
         num_questions = -1
@@ -468,9 +773,54 @@ def game_settings(solo: bool = False) -> tuple:
     return STATE_PLAY, players, num_questions
 
 
+def wait_for_question(difficulty: str, video_capture: BackgroundVideo):
+    """
+    Takes the next question from the pool, showing a "loading" frame while the background
+    worker fetches it if the pool is empty, so the video and input keep running. While the
+    source has nothing to give, refills are only requested again after
+    api_client.retry_after (see project.prefetch_questions), not on every frame.
+
+    Args:
+        difficulty (str): The difficulty level of the question.
+        video_capture (BackgroundVideo): The background video to keep playing while loading.
+
+    Returns:
+        Any: The question tuple, or the next state (STATE_MENU or STATE_EXIT) if the player leaves.
+    """
+    question_data = get_question_nowait(difficulty)
+    waiting_since = time.perf_counter()
+
+    while question_data is None:
+        display_video_frame_in_center(video_capture)
+        display_text("Loading question...", 50, 50, WHITE)
+
+        if exit_button() == STATE_EXIT:
+            return STATE_EXIT
+
+        if back_button() == STATE_MENU:
+            pygame.mixer.music.stop()
+            return STATE_MENU
+
+        flip_display()
+        now = time.perf_counter()
+        profiler.record("question_wait", now - waiting_since)
+        waiting_since = now
+        limit_frame_rate()
+
+        for event in poll_events():
+            if event.type == pygame.QUIT:
+                return STATE_EXIT
+
+        question_data = get_question_nowait(difficulty)
+
+    return question_data
+
+
 def play_game(players: list, num_questions: int):
     """
     Runs the main game loop where players answer questions and accumulate points.
+    Each round follows project.play_round, with the screens below to interact with
+    the players.
 
     Args:
         players (list): List of player names.
@@ -479,18 +829,21 @@ def play_game(players: list, num_questions: int):
     Returns:
         Any: The next state of the game (STATE_MENU or STATE_EXIT).
     """
-    EASY_POINT = 1
-    MEDIUM_POINT = 2
-    HARD_POINT = 3
-
     scores = {player: 0 for player in players}
 
-    video_capture = background_videos["questions"]
+    video_capture = get_background_video("questions")
+
+    # Start decoding the result video before the end of the game.
+    get_background_video("result")
 
     pygame.mixer.music.stop()
     pygame.mixer.music.load(question_music_path)
     pygame.mixer.music.play(-1)
 
+    start_game_session()
+    prefetch_questions()
+    preload_screen("ranking")
+
     round_num = 0
 
     questions_num = num_questions
@@ -498,85 +851,52 @@ def play_game(players: list, num_questions: int):
     if num_questions == -1:
         num_questions = 1
 
-    while round_num < num_questions:
-        for player in players:
-            difficulty = choose_difficulty(player)
+    # Simultaneous rounds need an input device per player, otherwise players take turns.
+    inputs = assign_answer_inputs(players) if ROUND_MODE == "simultaneous" else None
 
-            if difficulty == STATE_MENU:
-                return STATE_MENU
-            elif difficulty == STATE_EXIT:
-                return STATE_EXIT
+    def next_question(difficulty):
+        question_data = wait_for_question(difficulty, video_capture)
+        # Start loading the next question while this one is answered.
+        prefetch_questions()
+        return question_data
 
-            question, choices, correct_answer, category = get_question(difficulty)
-
-            pygame.display.flip()
+    if inputs is not None:
+        round_mode = "simultaneous"
 
-            asking = True
-            selected = 0
+        def collect_answers(answering, difficulty, question_data):
+            return collect_simultaneous_answers(
+                answering, scores, round_num, difficulty, question_data, inputs, video_capture
+            )
 
-            while asking:
-                display_video_frame_in_center(video_capture)
+        def show_result(answering, scores, difficulty, question_data, answers, points):
+            return show_round_results(answering, question_data[2], answers, points, video_capture)
 
-                display_text(f"--- Round {round_num + 1} ---", 50, 50, WHITE)
-                display_text(f"Difficulty : {difficulty.capitalize()}", 50, 100, WHITE)
-                display_text(f"Subject : {category}", 50, 150, WHITE)
-                display_text(f"Let's go {player} !!", 50, 250, WHITE)
-                display_text(f"Score : {scores[player]}", screen_width - 350, 50, WHITE)
-                display_text(question, 50, 350, WHITE, max_width=screen_width - 50)
+    else:
+        round_mode = "turns"
 
-                y = 500
-                for i, choice in enumerate(choices):
-                    color = BLUE if i == selected else WHITE
-                    display_text(
-                        f"{i + 1}. {choice}", 50, y, color, max_width=screen_width - 50
-                    )
-                    y += 80
+        def collect_answers(answering, difficulty, question_data):
+            return ask_player(
+                answering[0], scores, round_num, difficulty, question_data, video_capture
+            )
 
-                if exit_button() == STATE_EXIT:
-                    return STATE_EXIT
+        def show_result(answering, scores, difficulty, question_data, answers, points):
+            player = answering[0]
+            return show_turn_result(player, question_data[2], points[player], video_capture)
 
-                if back_button() == STATE_MENU:
-                    pygame.mixer.music.stop()
-                    return STATE_MENU
-
-                pygame.display.flip()
-
-                for event in pygame.event.get():
-                    if event.type == pygame.QUIT:
-                        return STATE_EXIT
-
-                    if event.type == pygame.KEYDOWN:
-                        if event.key == pygame.K_UP:
-                            selected = (selected - 1) % len(choices)
-                        elif event.key == pygame.K_DOWN:
-                            selected = (selected + 1) % len(choices)
-                        elif event.key == pygame.K_RETURN:
-                            asking = False
-                            if choices[selected] == correct_answer:
-                                if difficulty == "easy":
-                                    scores[player] += EASY_POINT
-                                    result_message = f"Correct! Well done {player}! Your good answer made you win {EASY_POINT} points."
-                                elif difficulty == "medium":
-                                    scores[player] += MEDIUM_POINT
-                                    result_message = f"Correct! Well done {player}! Your good answer made you win {MEDIUM_POINT} points."
-                                elif difficulty == "hard":
-                                    scores[player] += HARD_POINT
-                                    result_message = f"Correct! Well done {player}! Your good answer made you win {HARD_POINT} points."
-                                correct_sound.play()
-                                result_color = GREEN
-                            else:
-                                result_message = f"Incorrect! The correct answer was: {correct_answer}. You'll do better next time {player}."
-                                incorrect_sound.play()
-                                result_color = RED
-                            break
-
-            display_video_frame_in_center(video_capture)
-            display_text(
-                result_message, 50, 100, result_color, max_width=screen_width - 50
-            )
+    while round_num < num_questions:
+        state = play_round(
+            players,
+            scores,
+            round_num,
+            round_mode,
+            choose_difficulty,
+            next_question,
+            collect_answers,
+            show_result,
+        )
 
-            pygame.display.flip()
-            pygame.time.wait(3000)
+        if state is not None:
+            return state
 
         round_num += 1
 
@@ -586,6 +906,297 @@ def play_game(players: list, num_questions: int):
     return show_ranking(scores)
 
 
+def ask_player(
+    player: str,
+    scores: dict,
+    round_num: int,
+    difficulty: str,
+    question_data: tuple,
+    video_capture: BackgroundVideo,
+):
+    """
+    Asks a question to a player, who picks a choice with the arrow keys and Enter.
+
+    Args:
+        player (str): The name of the player.
+        scores (dict): A dictionary containing the scores of all players.
+        round_num (int): The number of the round, from 0.
+        difficulty (str): The difficulty level of the question.
+        question_data (tuple): The question tuple.
+        video_capture (BackgroundVideo): The background video of the questions.
+
+    Returns:
+        Any: The answer, as {player: (choice, seconds taken)} (see project.play_round),
+            or the next state (STATE_MENU or STATE_EXIT) if the player leaves.
+    """
+    question, choices, correct_answer, category = question_data
+
+    flip_display()
+
+    selected = 0
+    start = time.perf_counter()
+
+    while True:
+        display_video_frame_in_center(video_capture)
+
+        display_text(f"--- Round {round_num + 1} ---", 50, 50, WHITE)
+        display_text(f"Difficulty : {difficulty.capitalize()}", 50, 100, WHITE)
+        display_text(f"Subject : {category}", 50, 150, WHITE)
+        display_text(f"Let's go {player} !!", 50, 250, WHITE)
+        display_text(f"Score : {scores[player]}", screen_width - 350, 50, WHITE)
+        display_text(question, 50, 350, WHITE, max_width=screen_width - 50)
+
+        y = 500
+        for i, choice in enumerate(choices):
+            color = BLUE if i == selected else WHITE
+            display_text(f"{i + 1}. {choice}", 50, y, color, max_width=screen_width - 50)
+            y += 80
+
+        if exit_button() == STATE_EXIT:
+            return STATE_EXIT
+
+        if back_button() == STATE_MENU:
+            pygame.mixer.music.stop()
+            return STATE_MENU
+
+        flip_display()
+        limit_frame_rate()
+
+        for event in poll_events():
+            if event.type == pygame.QUIT:
+                return STATE_EXIT
+
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_UP:
+                    selected = (selected - 1) % len(choices)
+                elif event.key == pygame.K_DOWN:
+                    selected = (selected + 1) % len(choices)
+                elif event.key == pygame.K_RETURN:
+                    return {player: (choices[selected], time.perf_counter() - start)}
+
+
+def show_turn_result(
+    player: str, correct_answer: str, points: int, video_capture: BackgroundVideo
+):
+    """
+    Shows whether a player answered correctly, for a few seconds.
+
+    Args:
+        player (str): The name of the player.
+        correct_answer (str): The correct answer of the question.
+        points (int): The points the player earned.
+        video_capture (BackgroundVideo): The background video of the questions.
+
+    Returns:
+        Any: STATE_EXIT if the player quits, otherwise None.
+    """
+    if points:
+        result_message = f"Correct! Well done {player}! Your good answer made you win {points} points."
+        get_sound(correct_sound_path).play()
+        result_color = GREEN
+    else:
+        result_message = f"Incorrect! The correct answer was: {correct_answer}. You'll do better next time {player}."
+        get_sound(incorrect_sound_path).play()
+        result_color = RED
+
+    # Keep loading the next question while the result is shown.
+    prefetch_questions()
+
+    def draw_result():
+        display_video_frame_in_center(video_capture)
+        display_text(result_message, 50, 100, result_color, max_width=screen_width - 50)
+        display_text("Press any key to continue", 50, screen_height - 200, WHITE)
+
+    if show_timed_screen(RESULT_DISPLAY_TIME, draw_result) == STATE_EXIT:
+        return STATE_EXIT
+
+    return None
+
+
+def assign_answer_inputs(players: list):
+    """
+    Gives every player their own input device for simultaneous rounds: a row of keys
+    of PLAYER_ANSWER_KEYS each, then a gamepad each.
+
+    Args:
+        players (list): List of player names.
+
+    Returns:
+        tuple: The (player, choice index) of each answer key code, the player of each
+            gamepad (by joystick instance id) and the input hint of each player, or None
+            if there are not enough input devices for every player.
+    """
+    keys = {}
+    gamepads = {}
+    hints = {}
+
+    # Joysticks only send events while they are open.
+    joysticks[:] = [pygame.joystick.Joystick(i) for i in range(pygame.joystick.get_count())]
+
+    for i, player in enumerate(players):
+        if i < len(PLAYER_ANSWER_KEYS):
+            for choice, key in enumerate(PLAYER_ANSWER_KEYS[i]):
+                keys[pygame.key.key_code(key)] = (player, choice)
+            hints[player] = "/".join(key.upper() for key in PLAYER_ANSWER_KEYS[i])
+        elif i - len(PLAYER_ANSWER_KEYS) < len(joysticks):
+            joystick = joysticks[i - len(PLAYER_ANSWER_KEYS)]
+            gamepads[joystick.get_instance_id()] = player
+            hints[player] = f"buttons 1-4 of gamepad {i - len(PLAYER_ANSWER_KEYS) + 1}"
+        else:
+            return None
+
+    return keys, gamepads, hints
+
+
+def collect_simultaneous_answers(
+    players: list,
+    scores: dict,
+    round_num: int,
+    difficulty: str,
+    question_data: tuple,
+    inputs: tuple,
+    video_capture: BackgroundVideo,
+):
+    """
+    Asks a question to all the players at the same time, each answering with their own
+    input device, within ANSWER_TIMEOUT seconds.
+
+    Args:
+        players (list): List of player names.
+        scores (dict): A dictionary containing the scores of all players.
+        round_num (int): The number of the round, from 0.
+        difficulty (str): The difficulty level of the question.
+        question_data (tuple): The question tuple.
+        inputs (tuple): The input devices of the players (see assign_answer_inputs).
+        video_capture (BackgroundVideo): The background video of the questions.
+
+    Returns:
+        Any: The answers, as player -> (choice, seconds taken) (see project.play_round),
+            or the next state (STATE_MENU or STATE_EXIT) if the players leave.
+    """
+    keys, gamepads, hints = inputs
+    question, choices, correct_answer, category = question_data
+
+    answers = {}
+    start = time.perf_counter()
+
+    while len(answers) < len(players):
+        remaining = ANSWER_TIMEOUT - (time.perf_counter() - start)
+        if remaining <= 0:
+            break
+
+        display_video_frame_in_center(video_capture)
+
+        display_text(f"--- Round {round_num + 1} ---", 50, 50, WHITE)
+        display_text(f"Difficulty : {difficulty.capitalize()}", 50, 100, WHITE)
+        display_text(f"Subject : {category}", 50, 150, WHITE)
+        display_text(f"Time left : {math.ceil(remaining)} s", screen_width - 350, 50, WHITE)
+        display_text(question, 50, 250, WHITE, max_width=screen_width - 50)
+
+        y = 400
+        for i, choice in enumerate(choices):
+            display_text(f"{i + 1}. {choice}", 50, y, WHITE, max_width=screen_width // 2 - 50)
+            y += 80
+
+        y = 400
+        for player in players:
+            status = "answered" if player in answers else hints[player]
+            color = GREEN if player in answers else WHITE
+            display_text(f"{player} ({scores[player]}) : {status}", screen_width // 2, y, color)
+            y += 50
+
+        if exit_button() == STATE_EXIT:
+            return STATE_EXIT
+
+        if back_button() == STATE_MENU:
+            pygame.mixer.music.stop()
+            return STATE_MENU
+
+        flip_display()
+        limit_frame_rate()
+
+        for event in poll_events():
+            if event.type == pygame.QUIT:
+                return STATE_EXIT
+
+            if event.type == pygame.KEYDOWN and event.key in keys:
+                player, choice = keys[event.key]
+            elif (
+                event.type == pygame.JOYBUTTONDOWN
+                and event.instance_id in gamepads
+                and event.button < len(choices)
+            ):
+                player, choice = gamepads[event.instance_id], event.button
+            else:
+                continue
+
+            # Only the first answer of each player counts.
+            if player not in answers:
+                answers[player] = (choices[choice], time.perf_counter() - start)
+
+    return answers
+
+
+def show_round_results(
+    players: list,
+    correct_answer: str,
+    answers: dict,
+    points: dict,
+    video_capture: BackgroundVideo,
+):
+    """
+    Shows the correct answer and the result of every player, for a few seconds.
+
+    Args:
+        players (list): List of player names.
+        correct_answer (str): The correct answer of the question.
+        answers (dict): The answers, as player -> (choice, seconds taken).
+        points (dict): The points each player earned.
+        video_capture (BackgroundVideo): The background video of the questions.
+
+    Returns:
+        Any: STATE_EXIT if the players quit, otherwise None.
+    """
+    result_lines = []
+    for player in players:
+        if player not in answers:
+            result_lines.append((f"{player} : no answer", RED))
+        elif points[player]:
+            result_lines.append(
+                (f"{player} : +{points[player]} points ({answers[player][1]:.1f} s)", GREEN)
+            )
+        else:
+            result_lines.append((f"{player} : wrong ({answers[player][1]:.1f} s)", RED))
+
+    if any(points.values()):
+        get_sound(correct_sound_path).play()
+    else:
+        get_sound(incorrect_sound_path).play()
+
+    # Keep loading the next question while the result is shown.
+    prefetch_questions()
+
+    def draw_result():
+        display_video_frame_in_center(video_capture)
+        display_text(
+            f"The correct answer was: {correct_answer}",
+            50,
+            100,
+            WHITE,
+            max_width=screen_width - 50,
+        )
+        y = 250
+        for text, color in result_lines:
+            display_text(text, 50, y, color)
+            y += 50
+        display_text("Press any key to continue", 50, screen_height - 200, WHITE)
+
+    if show_timed_screen(RESULT_DISPLAY_TIME, draw_result) == STATE_EXIT:
+        return STATE_EXIT
+
+    return None
+
+
 def choose_difficulty(player: str) -> str:
     """
     Allows a player to select the difficulty level for their question.
@@ -600,32 +1211,30 @@ def choose_difficulty(player: str) -> str:
     selected_difficulty = 0
     difficulties = ["easy", "medium", "hard"]
 
-    while selecting:
+    settings_background = get_image(settings_background_path, fit_screen=True)
+    renderer = DirtyScreen(settings_background)
 
-        settings_background = pygame.image.load("Backgrounds/pregame.jpg")
-        settings_background = pygame.transform.scale(
-            settings_background, (screen_width, screen_height)
-        )
-        screen.blit(settings_background, (0, 0))
+    while selecting:
 
-        display_text(f"{player}, choose your question difficulty !!", 50, 50, BLACK)
+        renderer.text(f"{player}, choose your question difficulty !!", 50, 50, BLACK)
 
         y = 150
         for i, difficulty in enumerate(difficulties):
             color = BLUE if i == selected_difficulty else BLACK
-            display_text(f"{i + 1}. {difficulty.capitalize()}", 50, y, color)
+            renderer.text(f"{i + 1}. {difficulty.capitalize()}", 50, y, color)
             y += 50
 
-        if exit_button() == STATE_EXIT:
+        if exit_button(renderer=renderer) == STATE_EXIT:
             return STATE_EXIT
 
-        if back_button() == STATE_MENU:
+        if back_button(renderer=renderer) == STATE_MENU:
             pygame.mixer.music.stop()
             return STATE_MENU
 
-        pygame.display.flip()
+        renderer.present()
+        limit_frame_rate(idle=True)
 
-        for event in pygame.event.get():
+        for event in poll_events(renderer):
             if event.type == pygame.QUIT:
                 return STATE_EXIT
 
@@ -652,102 +1261,64 @@ def show_ranking(scores: dict):
     """
     pygame.mixer.music.stop()
 
-    result_image = pygame.image.load("Backgrounds/results.jpg")
-    video_capture = background_videos["result"]
+    result_image = get_image(result_image_path)
+    video_capture = get_background_video("result")
 
-    fps = video_capture.get(cv2.CAP_PROP_FPS)
-    frame_delay = int(1000 / fps)
+    p = inflect_engine()
+    ranking = rank_players(scores)
 
-    p = inflect.engine()
-    sorted_scores = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+    if (
+        show_timed_screen(
+            RESULT_DISPLAY_TIME, lambda: display_video_frame_in_center(video_capture)
+        )
+        == STATE_EXIT
+    ):
+        return STATE_EXIT
 
-    wait_time = 3000
-    start_time = pygame.time.get_ticks()
+    get_sound(result_sound_path).play()
 
-    while pygame.time.get_ticks() - start_time < wait_time:
-        display_video_frame_in_center(video_capture)
-        pygame.time.delay(frame_delay)
-        pygame.display.flip()
+    # The ranking doesn't change anymore, so its lines are built only once.
+    ranking_lines = [("----- Final Ranking -----", 50, BLUE)]
+    y = 100
 
-    result_sound.play()
+    for rank, players, score in ranking:
+        # Every player of the ranking takes one row.
+        y += 50 * len(players)
+        ranking_lines.append(
+            (f"{p.ordinal(rank)}: {p.join(players)} with {score} points", y, BLACK)
+        )
+    y += 150
+
+    winners = ranking[0][1]
+    if len(winners) > 1:
+        player_text = p.join(winners)
+        ranking_lines.append(
+            (f"Congratulations {player_text} ! You are all joint winners!", y, GREEN)
+        )
+    else:
+        ranking_lines.append(
+            (f"Congratulations {winners[0]} ! You are the overall winner!", y, GREEN)
+        )
 
+    renderer = DirtyScreen(result_image)
     running = True
 
     while running:
-        y = 100
-        screen.blit(result_image, (0, 0))
-
-        display_text("----- Final Ranking -----", 50, 50, BLUE)
-
-        rank = 1
-        previous_score = None
-        previous_rank = 1
-        tied_players = []
-        display_rank = 1
-
-        for player, score in sorted_scores:
-            if score == previous_score:
-                tied_players.append(player)
-                rank = previous_rank
-            else:
-                if tied_players:
-                    rank_text = p.ordinal(display_rank)
-                    player_text = p.join(tied_players)
-                    display_text(
-                        f"{rank_text}: {player_text} with {previous_score} points",
-                        50,
-                        y,
-                        BLACK,
-                    )
-                    display_rank = rank
-
-                    tied_players = []
-
-                tied_players.append(player)
-                previous_score = score
-                previous_rank = rank
-
-            rank += 1
-            y += 50
-
-        if tied_players:
-            rank_text = p.ordinal(display_rank)
-            player_text = p.join(tied_players)
-            display_text(
-                f"{rank_text}: {player_text} with {previous_score} points", 50, y, BLACK
-            )
-            y += 150
-
-        tied_players = [
-            player for player, score in sorted_scores if score == sorted_scores[0][1]
-        ]
-        if len(tied_players) > 1:
-            player_text = p.join(tied_players)
-            display_text(
-                f"Congratulations {player_text} ! You are all joint winners!",
-                50,
-                y,
-                GREEN,
-            )
-        else:
-            display_text(
-                f"Congratulations {tied_players[0]} ! You are the overall winner!",
-                50,
-                y,
-                GREEN,
-            )
+        for text, line_y, color in ranking_lines:
+            renderer.text(text, 50, line_y, color)
 
-        if back_button() == STATE_MENU:
+        if back_button(renderer=renderer) == STATE_MENU:
             pygame.mixer.music.stop()
             return STATE_MENU
 
-        if exit_button() == STATE_EXIT:
+        if exit_button(renderer=renderer) == STATE_EXIT:
             running = False
             return STATE_EXIT
 
-        pygame.display.flip()
+        renderer.present()
+        limit_frame_rate(idle=True)
 
-        for event in pygame.event.get():
+        for event in poll_events(renderer):
             if event.type == pygame.QUIT:
                 return STATE_EXIT
 
@@ -760,6 +1331,8 @@ def main() -> None:
     Returns:
         None
     """
+    init()
+
     state = STATE_MENU
 
     while state != STATE_EXIT:
@@ -770,6 +1343,15 @@ def main() -> None:
         elif state == STATE_PLAY:
             state = play_game(players, num_questions)
 
+    for video in background_videos.values():
+        video.stop()
+    stop_transcodes()
+
+    print(memory_report())
+
+    if profiler.enabled:
+        profiler.export_trace()
+
     pygame.quit()
 
 
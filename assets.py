@@ -0,0 +1,203 @@
+import pygame
+import threading
+from config import *
+
+# Fonts loaded once and shared by every screen, keyed by (face, size).
+fonts = {}
+
+
+def get_font(size: int, face: str = None) -> pygame.font.Font:
+    """
+    Returns the font of the given face and size, loading it from disk only the first time.
+
+    Args:
+        size (int): The size of the font.
+        face (str, optional): The path of the font file (default is Pygame's default font).
+
+    Returns:
+        pygame.font.Font: The shared font object.
+    """
+    key = (face, size)
+
+    if key not in fonts:
+        fonts[key] = pygame.font.Font(face, size)
+
+    return fonts[key]
+
+
+def preload_fonts(sizes: list = PRELOAD_FONT_SIZES, face: str = None) -> None:
+    """
+    Loads the fonts used by the screens ahead of time, so that no font file is read
+    while a screen is running.
+
+    Args:
+        sizes (list): The font sizes to load.
+        face (str, optional): The path of the font file (default is Pygame's default font).
+    """
+    for size in sizes:
+        get_font(size, face)
+
+
+# Decoded images and sounds, loaded once. Images scaled to the screen are keyed by
+# (path, True) and dropped when the screen size changes.
+asset_lock = threading.Lock()
+images = {}
+sounds = {}
+screen_size = None
+
+# Assets each screen needs, so they can be preloaded before switching to it.
+screen_assets = {}
+
+
+def set_screen_size(size: tuple) -> None:
+    """
+    Sets the size images are scaled to, dropping the images scaled for another size.
+
+    Args:
+        size (tuple): The (width, height) of the screen.
+    """
+    global screen_size
+
+    with asset_lock:
+        if size != screen_size:
+            for key in [key for key in images if key[1]]:
+                del images[key]
+        screen_size = size
+
+
+def load_image(path: str, fit_screen: bool) -> pygame.Surface:
+    """
+    Reads an image from disk, scaled to the screen size if asked.
+
+    Args:
+        path (str): The path of the image file.
+        fit_screen (bool): Whether to scale the image to the screen size.
+
+    Returns:
+        pygame.Surface: The decoded image.
+    """
+    image = pygame.image.load(path)
+    if fit_screen:
+        image = pygame.transform.scale(image, screen_size)
+    return image
+
+
+def get_image(path: str, fit_screen: bool = False) -> pygame.Surface:
+    """
+    Returns an image, reading and scaling it only the first time it is needed.
+
+    Args:
+        path (str): The path of the image file.
+        fit_screen (bool): Whether to scale the image to the screen size.
+
+    Returns:
+        pygame.Surface: The shared image.
+    """
+    key = (path, fit_screen)
+
+    with asset_lock:
+        image = images.get(key)
+    if image is None:
+        image = load_image(path, fit_screen)
+        with asset_lock:
+            images[key] = image
+
+    return image
+
+
+def get_sound(path: str) -> pygame.mixer.Sound:
+    """
+    Returns a sound, reading and decoding it only the first time it is needed.
+
+    Args:
+        path (str): The path of the sound file.
+
+    Returns:
+        pygame.mixer.Sound: The shared sound.
+    """
+    with asset_lock:
+        sound = sounds.get(path)
+    if sound is None:
+        sound = pygame.mixer.Sound(path)
+        with asset_lock:
+            sounds[path] = sound
+
+    return sound
+
+
+def declare_screen_assets(
+    screen_name: str, image_paths: tuple = (), sound_paths: tuple = ()
+) -> None:
+    """
+    Declares the assets a screen needs.
+
+    Args:
+        screen_name (str): The name of the screen.
+        image_paths (tuple): The images of the screen, as (path, fit_screen) pairs.
+        sound_paths (tuple): The paths of the sounds of the screen.
+    """
+    screen_assets[screen_name] = (list(image_paths), list(sound_paths))
+
+
+def preload_screen(screen_name: str) -> threading.Thread:
+    """
+    Loads the assets of a screen on a background thread, before switching to it.
+
+    Args:
+        screen_name (str): The name of a screen declared with declare_screen_assets.
+
+    Returns:
+        threading.Thread: The loading thread.
+    """
+    screen_images, screen_sounds = screen_assets.get(screen_name, ([], []))
+
+    def load_all():
+        try:
+            for path, fit_screen in screen_images:
+                get_image(path, fit_screen)
+            for path in screen_sounds:
+                get_sound(path)
+        except (pygame.error, FileNotFoundError):
+            # The screen will report the error when it loads the asset itself.
+            pass
+
+    thread = threading.Thread(target=load_all, daemon=True)
+    thread.start()
+    return thread
+
+
+def memory_usage() -> dict:
+    """
+    Reports the memory used by the loaded assets.
+
+    Returns:
+        dict: The number of bytes used by images and sounds, and the number of fonts.
+    """
+    with asset_lock:
+        image_bytes = sum(
+            image.get_pitch() * image.get_height() for image in images.values()
+        )
+        sound_bytes = 0
+        mixer_settings = pygame.mixer.get_init()
+        if mixer_settings:
+            frequency, sample_format, channels = mixer_settings
+            bytes_per_second = frequency * channels * abs(sample_format) // 8
+            sound_bytes = sum(
+                int(sound.get_length() * bytes_per_second) for sound in sounds.values()
+            )
+
+    return {"images": image_bytes, "sounds": sound_bytes, "fonts": len(fonts)}
+
+
+def memory_report() -> str:
+    """
+    Describes the memory used by the loaded assets in a single line.
+
+    Returns:
+        str: The report, with sizes in MiB.
+    """
+    usage = memory_usage()
+    return (
+        f"assets: images {usage['images'] / 2**20:.1f} MiB, "
+        f"sounds {usage['sounds'] / 2**20:.1f} MiB, {usage['fonts']} fonts"
+    )
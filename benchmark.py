@@ -0,0 +1,149 @@
+import sys
+import argparse
+from mock_opentdb import MockOpenTDB
+from headless import (
+    run_benchmark,
+    run_import_benchmark,
+    correct_strategy,
+    random_strategy,
+    scripted_strategy,
+    MockServerSource,
+)
+
+strategies = {
+    "random": random_strategy,
+    "correct": correct_strategy,
+    "alternate": scripted_strategy([True, False]),
+}
+
+
+def print_report(report: dict) -> None:
+    """
+    Prints the measures of a benchmark run.
+
+    Args:
+        report (dict): The measures returned by headless.run_benchmark.
+    """
+    print(f"questions:              {report['questions']}")
+    print(f"elapsed:                {report['seconds']:.3f} s")
+    print(f"questions per second:   {report['questions_per_second']:.1f}")
+    print(f"API calls:              {report['api_calls']}")
+    print(f"API calls per question: {report['api_calls_per_question']:.3f}")
+    print(f"cache hit rate:         {report['cache_hit_rate']:.1%}")
+    print(f"peak memory:            {report['peak_memory'] / 1024:.0f} KiB")
+    print(f"p50 time-to-question:   {report['p50_time_to_question'] * 1000:.2f} ms")
+    print(f"p99 time-to-question:   {report['p99_time_to_question'] * 1000:.2f} ms")
+
+
+def print_import_report(report: dict) -> None:
+    """
+    Prints the measures of an import benchmark run.
+
+    Args:
+        report (dict): The measures returned by headless.run_import_benchmark.
+    """
+    print(f"questions imported:     {report['questions']}")
+    print(f"text cleaning:          {report['clean_seconds']:.3f} s")
+    print(f"cleaned per second:     {report['cleaned_per_second']:.0f}")
+    print(f"clean cache hit rate:   {report['clean_cache_hit_rate']:.1%}")
+    print(f"bank import:            {report['import_seconds']:.3f} s")
+    print(f"imported per second:    {report['imported_per_second']:.0f}")
+
+
+def main(argv: list = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Play headless games against a stub question source and report throughput."
+    )
+    parser.add_argument("--players", type=int, default=8)
+    parser.add_argument("--rounds", type=int, default=30)
+    parser.add_argument("--strategy", choices=sorted(strategies), default="random")
+    parser.add_argument(
+        "--difficulty", choices=["random", "easy", "medium", "hard"], default="random"
+    )
+    parser.add_argument(
+        "--flow",
+        choices=["console", "app"],
+        default="console",
+        help="fetch like project.ask_question (console) or like app.play_game (app)",
+    )
+    parser.add_argument(
+        "--round-mode",
+        choices=["turns", "simultaneous"],
+        default="turns",
+        help="a question per player in turn, or one question per round for everyone",
+    )
+    parser.add_argument(
+        "--source",
+        choices=["stub", "mock"],
+        default="stub",
+        help="in-process stub, or the HTTP API client against a local mock OpenTDB server",
+    )
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="simulated API latency, in ms"
+    )
+    parser.add_argument(
+        "--error-rate", type=float, default=0.0, help="mock server only: HTTP 500 rate"
+    )
+    parser.add_argument(
+        "--rate-limit",
+        type=float,
+        default=0.0,
+        help="mock server only: seconds required between two requests",
+    )
+    parser.add_argument(
+        "--import-questions",
+        type=int,
+        default=0,
+        help="instead of a game, measure the import of this many questions into a bank",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+
+    args = parser.parse_args(argv)
+
+    if args.import_questions:
+        print(f"Importing {args.import_questions} questions")
+        print_import_report(run_import_benchmark(args.import_questions, args.seed))
+        return
+
+    print(
+        f"{args.players} players x {args.rounds} rounds "
+        f"({args.round_mode}, {args.flow} flow, {args.source} source)"
+    )
+
+    if args.source == "stub":
+        report = run_benchmark(
+            args.players,
+            args.rounds,
+            strategies[args.strategy],
+            args.difficulty,
+            args.flow,
+            args.latency / 1000,
+            args.seed,
+            round_mode=args.round_mode,
+        )
+    else:
+        server = MockOpenTDB(
+            latency=args.latency / 1000,
+            error_rate=args.error_rate,
+            rate_limit_interval=args.rate_limit,
+            # Enough questions for the whole game, even with a session token.
+            questions_per_level=args.players * args.rounds,
+            seed=args.seed,
+        )
+        with server:
+            report = run_benchmark(
+                args.players,
+                args.rounds,
+                strategies[args.strategy],
+                args.difficulty,
+                args.flow,
+                seed=args.seed,
+                source=MockServerSource(server),
+                round_mode=args.round_mode,
+            )
+
+    print_report(report)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
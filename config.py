@@ -1,9 +1,119 @@
 API_URL = "https://opentdb.com/api.php?amount=15&type=multiple"
 
+# Number of questions asked to the API per request (at most 50), and the OpenTDB
+# category id to play with (0 for any category).
+QUESTION_BATCH_SIZE = 15
+QUESTION_CATEGORY = 0
+
+# Question pool: refill a difficulty level when it holds fewer questions than
+# POOL_LOW_WATER, and never keep more than POOL_MAX_SIZE questions per level.
+POOL_LOW_WATER = 2
+POOL_MAX_SIZE = 50
+
+# API client: request timeout (seconds), retries with exponential backoff
+# (seconds, with jitter) and minimum wait after OpenTDB rate limiting.
+API_TIMEOUT = 5
+API_MAX_RETRIES = 3
+API_BACKOFF_BASE = 0.5
+API_BACKOFF_MAX = 8
+API_RATE_LIMIT_DELAY = 5
+# When the on-disk cache backs the API up (see question_sources.default_source), give
+# the API a single short attempt before falling back to the cache.
+API_FALLBACK_RETRIES = 0
+API_FALLBACK_TIMEOUT = 2
+
+# Circuit breaker: stop calling the API for CIRCUIT_BREAKER_COOLDOWN seconds after
+# CIRCUIT_BREAKER_THRESHOLD failed fetches in a row, and use the cache meanwhile.
+CIRCUIT_BREAKER_THRESHOLD = 3
+CIRCUIT_BREAKER_COOLDOWN = 60
+
+# Ask OpenTDB for a session token so it never returns the same question twice in a game.
+USE_SESSION_TOKEN = True
+# When no token can be had, play without one for TOKEN_RETRY_DELAY seconds (or until
+# the next game) rather than asking again before every request.
+TOKEN_RETRY_DELAY = 60
+
+# Serve questions only from the on-disk cache, without calling the API.
+OFFLINE_MODE = False
+
+# On-disk question cache: maximum number of questions and maximum age (seconds).
+CACHE_PATH = "question_cache.db"
+CACHE_MAX_SIZE = 5000
+CACHE_MAX_AGE = 90 * 24 * 3600
+
+# Compact question bank file built by question_bank.py (for instance for tournaments).
+# When set, questions are drawn from it instead of the API.
+QUESTION_BANK_PATH = ""
+
+# Number of distinct HTML-encoded texts (categories, common answers...) whose cleaned
+# version is memoized by project.clean_text.
+CLEAN_TEXT_CACHE_SIZE = 4096
+
+# Number of question hashes remembered per game to filter out duplicates.
+SEEN_QUESTIONS_LIMIT = 10000
+
+# Frame rate cap of screens with a background video, and of static screens.
+TARGET_FPS = 60
+IDLE_FPS = 15
+
+# How rounds are played: "turns" asks every player their own question in turn,
+# "simultaneous" asks one question per round to all players at once (one fetch per round).
+ROUND_MODE = "turns"
+# Answer keys of each player in simultaneous Pygame rounds, one row of the keyboard each.
+# Players beyond these rows answer with a gamepad, whose first four buttons pick the choices.
+PLAYER_ANSWER_KEYS = [
+    ("1", "2", "3", "4"),
+    ("q", "w", "e", "r"),
+    ("a", "s", "d", "f"),
+    ("z", "x", "c", "v"),
+]
+
+# How long answer results and the pre-ranking video are shown (milliseconds).
+RESULT_DISPLAY_TIME = 3000
+
+# Number of background video frames decoded ahead of the render loop.
+VIDEO_BUFFER_SIZE = 8
+# Frames a late video may skip to catch up, beyond that its timing restarts.
+VIDEO_MAX_FRAME_SKIP = 5
+# Optionally decode short looping background clips only once, keeping their frames in
+# memory at the decode size, as long as all the cached frames fit in VIDEO_CACHE_BUDGET
+# bytes (longer clips keep streaming). Off by default to spare low-end machines' memory.
+VIDEO_PRELOAD = False
+VIDEO_CACHE_BUDGET = 128 * 1024 * 1024
+# Background clips are transcoded once to their decode size (the screen resolution, or the
+# clip's own if smaller, times VIDEO_QUALITY) and kept in VIDEO_TRANSCODE_DIR, so that later
+# runs decode fewer pixels. Clips already at their decode size are used as they are.
+VIDEO_TRANSCODE = True
+VIDEO_TRANSCODE_DIR = "video_cache"
+# Decode resolution relative to the screen, for low-end machines: 0.5 decodes a quarter
+# of the pixels and scales frames up with a cheap nearest-neighbour scale.
+VIDEO_QUALITY = 1.0
+
+# Rendered text surfaces kept between frames (bytes), and memoized line wrappings.
+TEXT_CACHE_BUDGET = 32 * 1024 * 1024
+TEXT_WRAP_CACHE_SIZE = 512
+
+# Render loop profiling: per-stage frame timings, shown in an on-screen overlay and
+# written to PROFILE_TRACE_PATH (.csv or .json) on exit. Off by default.
+PROFILE_ENABLED = False
+PROFILE_TRACE_PATH = "frame_trace.csv"
+# Number of frames kept for the trace (the overlay only shows the last PROFILE_OVERLAY_FRAMES).
+PROFILE_HISTORY = 36000
+PROFILE_OVERLAY_FRAMES = 120
+
+# Online game server (server.py): address, seconds given to answer each question
+# (also in simultaneous Pygame rounds), and players per room.
+SERVER_HOST = "0.0.0.0"
+SERVER_PORT = 8765
+ANSWER_TIMEOUT = 20
+ROOM_MAX_PLAYERS = 16
+
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
 BLUE = (0, 0, 255)
 GREEN = (0, 255, 0)
 RED = (255, 0, 0)
 FONT_SIZE = 75
+# Font sizes loaded at startup: buttons, text, signature and title.
+PRELOAD_FONT_SIZES = [50, FONT_SIZE, 100, 150]
 BUTTON_WIDTH, BUTTON_HEIGHT = 250, 100
@@ -0,0 +1,53 @@
+import pytest
+import project
+import api_client
+import question_cache
+from mock_opentdb import MockOpenTDB
+
+
+@pytest.fixture
+def temporary_cache(tmp_path, monkeypatch):
+    """
+    Points the question cache to an empty database, closed after the test.
+    """
+    question_cache.close()
+    monkeypatch.setattr(question_cache, "cache_path", str(tmp_path / "cache.db"))
+    yield
+    question_cache.close()
+
+
+@pytest.fixture
+def fresh_game(temporary_cache, monkeypatch):
+    """
+    Starts from empty question pools, nothing seen, no session token, no rate limit and a
+    closed circuit breaker, with an empty question cache.
+    """
+    monkeypatch.setattr(api_client, "session_token", "")
+    monkeypatch.setattr(api_client, "token_retry_at", 0.0)
+    monkeypatch.setattr(api_client, "consecutive_failures", 0)
+    monkeypatch.setattr(api_client, "circuit_open_until", 0.0)
+    monkeypatch.setattr(api_client, "rate_limited_until", 0.0)
+    monkeypatch.setattr(project, "seen_questions", set())
+    monkeypatch.setattr(project, "seen_order", project.deque())
+    monkeypatch.setattr(project, "prefetch_retry_at", {})
+    for pool in project.question_pool.values():
+        pool.clear()
+    yield
+    project.prefetch_requests.join()
+    for pool in project.question_pool.values():
+        pool.clear()
+
+
+@pytest.fixture
+def mock_server(fresh_game, monkeypatch):
+    """
+    Serves the API from a local MockOpenTDB (10 questions per category and difficulty),
+    with short retry delays.
+    """
+    monkeypatch.setattr(api_client, "API_MAX_RETRIES", 2)
+    monkeypatch.setattr(api_client, "API_BACKOFF_BASE", 0.01)
+    monkeypatch.setattr(api_client, "API_RATE_LIMIT_DELAY", 0.2)
+
+    with MockOpenTDB(questions_per_level=10) as server:
+        monkeypatch.setattr(api_client, "api_url", server.url)
+        yield server
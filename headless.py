@@ -0,0 +1,382 @@
+import os
+import html
+import time
+import random
+import tempfile
+import threading
+import tracemalloc
+from contextlib import contextmanager
+import project
+import question_cache
+from question_bank import build_bank
+from question_sources import QuestionSource, OpenTDBSource, parse_results
+from config import *
+
+
+def make_stub_result(number: int, difficulty: str) -> dict:
+    """
+    Builds a fake question in the layout of the OpenTDB API.
+
+    Args:
+        number (int): A number making the question unique.
+        difficulty (str): The difficulty level of the question.
+
+    Returns:
+        dict: The question, as found in the "results" list of an API response.
+    """
+    return {
+        "type": "multiple",
+        "difficulty": difficulty,
+        "category": "Simulation",
+        "question": f"Stub question #{number} ({difficulty})?",
+        "correct_answer": f"Answer {number}",
+        "incorrect_answers": [f"Wrong {number}.{i}" for i in range(3)],
+    }
+
+
+def make_encoded_result(number: int, rng: random.Random) -> dict:
+    """
+    Builds a fake question HTML-encoded like OpenTDB's, sometimes twice, with category
+    names and answers repeated across questions like in real dumps.
+
+    Args:
+        number (int): A number making the question unique.
+        rng (random.Random): The random generator picking the repeated parts.
+
+    Returns:
+        dict: The question, as found in the "results" list of an API response.
+    """
+    encode = html.escape if number % 10 else lambda text: html.escape(html.escape(text))
+    return {
+        "type": "multiple",
+        "difficulty": rng.choice(project.DIFFICULTIES),
+        "category": html.escape(f"Entertainment: Film & TV {rng.randrange(24)}"),
+        "question": encode(f'Which "question #{number}" is the {rng.randrange(1000)}th?'),
+        "correct_answer": html.escape(f"Answer & {rng.randrange(2000)}"),
+        "incorrect_answers": [html.escape(f"Wrong's {rng.randrange(300)}") for _ in range(3)],
+    }
+
+
+class StubQuestionSource(QuestionSource):
+    """
+    A local question source standing in for the API in headless simulations, which
+    counts the calls it gets.
+    """
+
+    def __init__(self, latency: float = 0.0, seed: int = 0):
+        """
+        Args:
+            latency (float): Simulated network latency of each call, in seconds.
+            seed (int): Seed of the difficulty picked for requests without one.
+        """
+        self.latency = latency
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.calls = 0
+        self.next_number = 0
+
+    def fetch(self, n: int, difficulty: str = "", category: int = 0) -> list:
+        """
+        Serves a batch of unique questions (see QuestionSource.fetch).
+        """
+        if self.latency:
+            time.sleep(self.latency)
+
+        with self.lock:
+            self.calls += 1
+            first = self.next_number
+            self.next_number += n
+            levels = [difficulty or self.random.choice(project.DIFFICULTIES) for _ in range(n)]
+
+        return parse_results(
+            [make_stub_result(first + i, level) for i, level in enumerate(levels)]
+        )
+
+
+class MockServerSource(OpenTDBSource):
+    """
+    Question source sending real requests through api_client to a mock_opentdb.MockOpenTDB
+    server. Its calls are the question requests received by the server, retries included.
+    """
+
+    def __init__(self, server):
+        """
+        Args:
+            server (mock_opentdb.MockOpenTDB): The running mock server.
+        """
+        super().__init__(server.url)
+        self.server = server
+
+    @property
+    def calls(self) -> int:
+        return self.server.question_requests
+
+
+def correct_strategy(player: str, question: tuple, rng: random.Random) -> str:
+    """
+    Answering strategy of a player who always knows the answer.
+    """
+    return question[2]
+
+
+def random_strategy(player: str, question: tuple, rng: random.Random) -> str:
+    """
+    Answering strategy of a player who picks a random choice.
+    """
+    return rng.choice(question[1])
+
+
+def scripted_strategy(answers: list):
+    """
+    Builds an answering strategy following a script.
+
+    Args:
+        answers (list): For each turn, in order, True to answer correctly or False to answer
+            wrongly. The script starts over once it is exhausted.
+
+    Returns:
+        Callable: The answering strategy.
+    """
+    turn = [0]
+
+    def answer(player: str, question: tuple, rng: random.Random) -> str:
+        correct = answers[turn[0] % len(answers)]
+        turn[0] += 1
+        if correct:
+            return question[2]
+        return next(choice for choice in question[1] if choice != question[2])
+
+    return answer
+
+
+@contextmanager
+def stub_environment(source: QuestionSource):
+    """
+    Plugs a question source into project, with empty pools and an in-memory
+    question cache, and restores the real source afterwards.
+
+    Args:
+        source (QuestionSource): The question source to use.
+    """
+    previous_source = project.question_source
+    cache_path = question_cache.cache_path
+
+    question_cache.close()
+    question_cache.cache_path = ":memory:"
+    project.question_source = source
+    for pool in project.question_pool.values():
+        pool.clear()
+
+    try:
+        yield source
+    finally:
+        project.prefetch_requests.join()
+        project.question_source = previous_source
+        question_cache.close()
+        question_cache.cache_path = cache_path
+        for pool in project.question_pool.values():
+            pool.clear()
+
+
+def next_question(difficulty: str, flow: str) -> tuple:
+    """
+    Gets a question the way the game does it.
+
+    Args:
+        difficulty (str): The difficulty level of the question.
+        flow (str): "console" to block on project.get_question like project.ask_question,
+            "app" to use the background prefetcher like app.play_game.
+
+    Returns:
+        tuple: The question tuple.
+    """
+    if flow == "console":
+        return project.get_question(difficulty)
+
+    question = project.get_question_nowait(difficulty)
+    while question is None:
+        # app.play_game shows a loading frame at TARGET_FPS meanwhile.
+        time.sleep(1 / TARGET_FPS)
+        question = project.get_question_nowait(difficulty)
+
+    project.prefetch_questions()
+    return question
+
+
+def play_headless_game(
+    players: list,
+    num_rounds: int,
+    answer_strategy=random_strategy,
+    difficulty: str = "random",
+    flow: str = "console",
+    seed: int = 0,
+    round_mode: str = "turns",
+) -> dict:
+    """
+    Plays a whole game without display nor human, through project.play_round like
+    project.main and app.play_game: every round, each player in turn gets a question
+    and answers it, or in simultaneous rounds, all the players answer the same question.
+
+    Args:
+        players (list): The names of the players.
+        num_rounds (int): The number of rounds.
+        answer_strategy (Callable): Picks the answer of a player, given the player, the
+            question tuple and a random generator.
+        difficulty (str): The difficulty of every question, or "random" to pick one per turn.
+        flow (str): "console" or "app", see next_question.
+        seed (int): Seed of the random choices of the strategies.
+        round_mode (str): "turns" or "simultaneous" (see config.ROUND_MODE).
+
+    Returns:
+        dict: The final "scores", the "times" each question took to be ready (seconds),
+            and the number of "hits" (questions already in the pool when asked for).
+    """
+    rng = random.Random(seed)
+    scores = {player: 0 for player in players}
+    times = []
+    hits = []
+
+    def choose_difficulty(player):
+        return rng.choice(project.DIFFICULTIES) if difficulty == "random" else difficulty
+
+    def timed_question(level):
+        hits.append(bool(project.question_pool[level]))
+        start = time.perf_counter()
+        question = next_question(level, flow)
+        times.append(time.perf_counter() - start)
+        return question
+
+    def collect_answers(answering, level, question):
+        return {player: (answer_strategy(player, question, rng), 0.0) for player in answering}
+
+    def show_result(answering, scores, level, question, answers, points):
+        return None
+
+    project.start_game_session()
+
+    for round_num in range(num_rounds):
+        project.play_round(
+            players,
+            scores,
+            round_num,
+            round_mode,
+            choose_difficulty,
+            timed_question,
+            collect_answers,
+            show_result,
+        )
+
+    return {"scores": scores, "times": times, "hits": sum(hits)}
+
+
+def percentile(values: list, fraction: float) -> float:
+    """
+    Computes a percentile with the nearest-rank method.
+
+    Args:
+        values (list): The values (not necessarily sorted).
+        fraction (float): The percentile, between 0 and 1.
+
+    Returns:
+        float: The percentile of the values (0 if there are none).
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def run_benchmark(
+    num_players: int,
+    num_rounds: int,
+    answer_strategy=random_strategy,
+    difficulty: str = "random",
+    flow: str = "console",
+    latency: float = 0.0,
+    seed: int = 0,
+    source=None,
+    round_mode: str = "turns",
+) -> dict:
+    """
+    Plays a headless game against a stub question source and measures its throughput.
+
+    Args:
+        num_players (int): The number of players.
+        num_rounds (int): The number of rounds.
+        answer_strategy (Callable): The answering strategy of every player.
+        difficulty (str): The difficulty of every question, or "random".
+        flow (str): "console" or "app", see next_question.
+        latency (float): Simulated network latency of the default stub source, in seconds.
+        seed (int): Seed of the random choices.
+        source (optional): The question source (default is a StubQuestionSource), for
+            instance a MockServerSource.
+        round_mode (str): "turns" or "simultaneous" (see config.ROUND_MODE).
+
+    Returns:
+        dict: The measures of the run.
+    """
+    players = [f"Player_{i + 1}" for i in range(num_players)]
+    if source is None:
+        source = StubQuestionSource(latency, seed)
+
+    with stub_environment(source):
+        tracemalloc.start()
+        start = time.perf_counter()
+        result = play_headless_game(
+            players, num_rounds, answer_strategy, difficulty, flow, seed, round_mode
+        )
+        elapsed = time.perf_counter() - start
+        _, peak_memory = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    questions = len(result["times"])
+
+    return {
+        "questions": questions,
+        "seconds": elapsed,
+        "questions_per_second": questions / elapsed if elapsed else 0.0,
+        "api_calls": source.calls,
+        "api_calls_per_question": source.calls / questions if questions else 0.0,
+        "cache_hit_rate": result["hits"] / questions if questions else 0.0,
+        "peak_memory": peak_memory,
+        "p50_time_to_question": percentile(result["times"], 0.5),
+        "p99_time_to_question": percentile(result["times"], 0.99),
+        "scores": result["scores"],
+    }
+
+
+def run_import_benchmark(num_questions: int, seed: int = 0) -> dict:
+    """
+    Measures the import of raw questions: cleaning their text with project.clean_results,
+    then writing them into a question bank file.
+
+    Args:
+        num_questions (int): The number of questions to import.
+        seed (int): Seed of the generated questions.
+
+    Returns:
+        dict: The measures of the run.
+    """
+    rng = random.Random(seed)
+    results = [make_encoded_result(number, rng) for number in range(num_questions)]
+    project.unescape_text.cache_clear()
+
+    start = time.perf_counter()
+    for _ in project.clean_results(results):
+        pass
+    clean_seconds = time.perf_counter() - start
+    cache_info = project.unescape_text.cache_info()
+
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        count = build_bank(results, os.path.join(directory, "benchmark.bank"))
+        import_seconds = time.perf_counter() - start
+
+    return {
+        "questions": count,
+        "clean_seconds": clean_seconds,
+        "cleaned_per_second": num_questions / clean_seconds if clean_seconds else 0.0,
+        "import_seconds": import_seconds,
+        "imported_per_second": num_questions / import_seconds if import_seconds else 0.0,
+        "clean_cache_hit_rate": cache_info.hits / ((cache_info.hits + cache_info.misses) or 1),
+    }
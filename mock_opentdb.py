@@ -0,0 +1,282 @@
+import sys
+import json
+import time
+import html
+import random
+import secrets
+import argparse
+import threading
+from urllib.parse import urlsplit, parse_qs
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+DIFFICULTIES = ["easy", "medium", "hard"]
+CATEGORIES = {9: "General Knowledge", 17: "Science & Nature", 23: "History"}
+
+
+def build_question_bank(questions_per_level: int) -> list:
+    """
+    Generates the questions served by the mock server, HTML-encoded like OpenTDB's.
+
+    Args:
+        questions_per_level (int): The number of questions per category and difficulty.
+
+    Returns:
+        list: The questions, as (category id, result dict) pairs.
+    """
+    bank = []
+    for category_id, category in CATEGORIES.items():
+        for difficulty in DIFFICULTIES:
+            for i in range(questions_per_level):
+                name = f"{category_id}-{difficulty}-{i}"
+                bank.append(
+                    (
+                        category_id,
+                        {
+                            "type": "multiple",
+                            "difficulty": difficulty,
+                            "category": html.escape(category),
+                            "question": html.escape(f'Which is "answer {name}"?'),
+                            "correct_answer": html.escape(f"Answer {name}"),
+                            "incorrect_answers": [
+                                html.escape(f"Wrong {name} & {j}") for j in range(3)
+                            ],
+                        },
+                    )
+                )
+    return bank
+
+
+class MockOpenTDB:
+    """
+    A local stand-in for the OpenTDB API (https://opentdb.com/api_config.php), serving
+    /api.php and /api_token.php with the same response codes, session tokens and
+    difficulty/category filters. Latency, server errors and rate limiting can be injected
+    to test and benchmark the client offline.
+    """
+
+    def __init__(
+        self,
+        port: int = 0,
+        questions_per_level: int = 50,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        rate_limit_interval: float = 0.0,
+        seed: int = 0,
+    ):
+        """
+        Args:
+            port (int): The port to listen on (0 for any free port).
+            questions_per_level (int): The number of questions per category and difficulty.
+            latency (float): Delay added to every response, in seconds.
+            error_rate (float): Probability of answering a request with an HTTP 500 error.
+            rate_limit_interval (float): Minimum time between two question requests of
+                a client, in seconds, like OpenTDB's limit of one request every 5 seconds.
+            seed (int): Seed of the injected errors and of the question order.
+        """
+        self.bank = build_question_bank(questions_per_level)
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rate_limit_interval = rate_limit_interval
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        # Questions already served to each token, by index in the bank.
+        self.tokens = {}
+        self.last_request = {}
+        self.question_requests = 0
+        self.token_requests = 0
+
+        handler = type("Handler", (MockOpenTDBHandler,), {"api": self})
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+        self.server.daemon_threads = True
+        self.thread = None
+
+    @property
+    def url(self) -> str:
+        """
+        The URL of the questions endpoint, in the format of config.API_URL.
+        """
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/api.php?amount=15&type=multiple"
+
+    def start(self) -> "MockOpenTDB":
+        """
+        Starts serving on a background thread.
+
+        Returns:
+            MockOpenTDB: The server itself.
+        """
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        """
+        Stops the server.
+        """
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def questions(self, query: dict, client: str) -> tuple:
+        """
+        Answers a request to /api.php.
+
+        Args:
+            query (dict): The query parameters of the request.
+            client (str): The address of the client, for rate limiting.
+
+        Returns:
+            tuple: The HTTP status and the JSON response.
+        """
+        try:
+            amount = int(query.get("amount", "10"))
+            category = int(query.get("category", "0"))
+        except ValueError:
+            return 200, {"response_code": 2, "results": []}
+        difficulty = query.get("difficulty", "")
+        token = query.get("token", "")
+
+        if not 1 <= amount <= 50 or (category and category not in CATEGORIES):
+            return 200, {"response_code": 2, "results": []}
+        if difficulty and difficulty not in DIFFICULTIES:
+            return 200, {"response_code": 2, "results": []}
+
+        with self.lock:
+            self.question_requests += 1
+
+            now = time.monotonic()
+            if now - self.last_request.get(client, -1e9) < self.rate_limit_interval:
+                return 429, {"response_code": 5, "results": []}
+            self.last_request[client] = now
+
+            if token and token not in self.tokens:
+                return 200, {"response_code": 3, "results": []}
+
+            matching = [
+                index
+                for index, (question_category, result) in enumerate(self.bank)
+                if (not category or question_category == category)
+                and (not difficulty or result["difficulty"] == difficulty)
+            ]
+            if len(matching) < amount:
+                return 200, {"response_code": 1, "results": []}
+
+            if token:
+                matching = [index for index in matching if index not in self.tokens[token]]
+                if len(matching) < amount:
+                    return 200, {"response_code": 4, "results": []}
+
+            chosen = self.random.sample(matching, amount)
+            if token:
+                self.tokens[token].update(chosen)
+
+        return 200, {"response_code": 0, "results": [self.bank[index][1] for index in chosen]}
+
+    def token(self, query: dict) -> tuple:
+        """
+        Answers a request to /api_token.php.
+
+        Args:
+            query (dict): The query parameters of the request.
+
+        Returns:
+            tuple: The HTTP status and the JSON response.
+        """
+        command = query.get("command", "")
+        token = query.get("token", "")
+
+        with self.lock:
+            self.token_requests += 1
+
+            if command == "request":
+                token = secrets.token_hex(32)
+                self.tokens[token] = set()
+                return 200, {
+                    "response_code": 0,
+                    "response_message": "Token Generated Successfully!",
+                    "token": token,
+                }
+
+            if command == "reset":
+                if token not in self.tokens:
+                    return 200, {"response_code": 3, "token": ""}
+                self.tokens[token] = set()
+                return 200, {"response_code": 0, "token": token}
+
+        return 200, {"response_code": 2}
+
+
+class MockOpenTDBHandler(BaseHTTPRequestHandler):
+    """
+    Routes HTTP requests to the MockOpenTDB instance set as the "api" class attribute.
+    """
+
+    api = None
+    # Keep connections alive, like the real API, so client connection pooling is exercised.
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        query = {key: values[0] for key, values in parse_qs(parts.query).items()}
+
+        if self.api.latency:
+            time.sleep(self.api.latency)
+
+        if self.api.error_rate and self.api.random.random() < self.api.error_rate:
+            status, body = 500, {"error": "injected failure"}
+        elif parts.path.endswith("/api.php"):
+            status, body = self.api.questions(query, self.client_address[0])
+        elif parts.path.endswith("/api_token.php"):
+            status, body = self.api.token(query)
+        else:
+            status, body = 404, {"error": "not found"}
+
+        data = json.dumps(body).encode()
+        try:
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+        except ConnectionError:
+            # The client timed out while latency was injected.
+            self.close_connection = True
+
+    def log_message(self, format, *args):
+        # Keep test and benchmark output clean.
+        pass
+
+
+def main(argv: list = None) -> None:
+    parser = argparse.ArgumentParser(description="Serve a local mock of the OpenTDB API.")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--questions", type=int, default=50, help="per category and difficulty")
+    parser.add_argument("--latency", type=float, default=0.0, help="in ms")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="seconds between requests")
+    parser.add_argument("--seed", type=int, default=0)
+
+    args = parser.parse_args(argv)
+
+    server = MockOpenTDB(
+        args.port,
+        args.questions,
+        args.latency / 1000,
+        args.error_rate,
+        args.rate_limit,
+        args.seed,
+    )
+    print(f"Serving mock OpenTDB at {server.url} (set it as API_URL in config.py)")
+    try:
+        server.server.serve_forever()
+    except KeyboardInterrupt:
+        server.server.server_close()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,212 @@
+import csv
+import json
+import time
+import pygame
+import threading
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from config import *
+
+# Stages of a frame, in the columns order of the trace. Stages may nest (a button
+# includes its text), and video decoding and scaling run on the decoder threads.
+STAGES = [
+    "video_decode",
+    "color_conversion",
+    "scaling",
+    "text_render",
+    "button_draw",
+    "flip",
+    "event_polling",
+    "question_wait",
+]
+
+enabled = PROFILE_ENABLED
+
+# Time spent in each stage during the current frame, shared with the decoder threads.
+stage_lock = threading.Lock()
+current_stages = {}
+frame_start = time.perf_counter()
+# Finished frames, as (start time, frame time, stage times) tuples, in seconds.
+frames = deque(maxlen=PROFILE_HISTORY)
+
+# Returned by stage when profiling is off, so that disabled stages cost one check.
+disabled_stage = nullcontext()
+
+
+def enable(on: bool = True) -> None:
+    """
+    Turns profiling on or off, dropping the frames recorded so far.
+
+    Args:
+        on (bool): Whether to profile.
+    """
+    global enabled, frame_start
+
+    enabled = on
+    frames.clear()
+    with stage_lock:
+        current_stages.clear()
+    frame_start = time.perf_counter()
+
+
+def record(name: str, seconds: float) -> None:
+    """
+    Adds time spent in a stage to the current frame. Safe to call from any thread.
+
+    Args:
+        name (str): The stage (see STAGES).
+        seconds (float): The time spent.
+    """
+    if not enabled:
+        return
+    with stage_lock:
+        current_stages[name] = current_stages.get(name, 0.0) + seconds
+
+
+@contextmanager
+def timed(name: str):
+    """
+    Context manager recording the time spent in its block as a stage.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - start)
+
+
+def stage(name: str):
+    """
+    Times a stage of the current frame:
+
+        with profiler.stage("flip"):
+            pygame.display.flip()
+
+    Args:
+        name (str): The stage (see STAGES).
+
+    Returns:
+        The context manager timing the stage, doing nothing when profiling is off.
+    """
+    if not enabled:
+        return disabled_stage
+    return timed(name)
+
+
+def end_frame() -> None:
+    """
+    Closes the current frame, called once per iteration of the render loop.
+    """
+    global frame_start
+
+    if not enabled:
+        return
+
+    now = time.perf_counter()
+    with stage_lock:
+        stages = dict(current_stages)
+        current_stages.clear()
+    frames.append((frame_start, now - frame_start, stages))
+    frame_start = now
+
+
+def summary(count: int = PROFILE_OVERLAY_FRAMES) -> dict:
+    """
+    Averages the timings of the last frames.
+
+    Args:
+        count (int): The number of frames to average.
+
+    Returns:
+        dict: The "fps", the average "frame_time" and the average time of each stage
+            ("stages"), in seconds.
+    """
+    recent = list(frames)[-count:]
+    if not recent:
+        return {"fps": 0.0, "frame_time": 0.0, "stages": {name: 0.0 for name in STAGES}}
+
+    total = sum(frame_time for _, frame_time, _ in recent)
+    return {
+        "fps": len(recent) / total if total else 0.0,
+        "frame_time": total / len(recent),
+        "stages": {
+            name: sum(stages.get(name, 0.0) for _, _, stages in recent) / len(recent)
+            for name in STAGES
+        },
+    }
+
+
+def draw_overlay(
+    screen: pygame.Surface, font: pygame.font.Font, extra_lines: list = ()
+) -> pygame.Rect:
+    """
+    Draws the FPS, the average time of each stage and a histogram of the last frame
+    times in the top-left corner of the screen. The red line marks the TARGET_FPS budget.
+
+    Args:
+        screen (pygame.Surface): The surface to draw on.
+        font (pygame.font.Font): The font of the text.
+        extra_lines (list, optional): More lines of text to show, such as memory use.
+
+    Returns:
+        pygame.Rect: The area of the screen covered by the overlay.
+    """
+    stats = summary()
+    lines = [f"{stats['fps']:.1f} FPS  {stats['frame_time'] * 1000:.2f} ms/frame"]
+    lines += [f"{name}: {stats['stages'][name] * 1000:.2f} ms" for name in STAGES]
+    lines += extra_lines
+
+    line_height = font.get_linesize()
+    graph_height = 60
+    width = max(PROFILE_OVERLAY_FRAMES * 2, max(font.size(line)[0] for line in lines)) + 20
+    height = len(lines) * line_height + graph_height + 30
+    overlay_rect = pygame.Rect(0, 0, width, height)
+
+    # Opaque, since static screens don't redraw what is under the overlay.
+    screen.fill(BLACK, overlay_rect)
+
+    for i, line in enumerate(lines):
+        screen.blit(font.render(line, True, WHITE), (10, 10 + i * line_height))
+
+    # One bar per frame, full height at twice the frame budget.
+    budget = 1 / TARGET_FPS
+    bottom = height - 10
+    for i, (_, frame_time, _) in enumerate(list(frames)[-PROFILE_OVERLAY_FRAMES:]):
+        bar = min(graph_height, int(frame_time / (2 * budget) * graph_height))
+        color = (0, 200, 0) if frame_time <= budget * 1.05 else (230, 160, 0)
+        pygame.draw.rect(screen, color, (10 + i * 2, bottom - bar, 2, bar))
+    budget_y = bottom - graph_height // 2
+    pygame.draw.line(screen, (220, 0, 0), (10, budget_y), (width - 10, budget_y))
+
+    return overlay_rect
+
+
+def export_trace(path: str = PROFILE_TRACE_PATH) -> None:
+    """
+    Writes the recorded frames to a trace file: JSON if the path ends with .json, CSV
+    otherwise, with one row per frame and times in milliseconds.
+
+    Args:
+        path (str): The path of the trace file.
+    """
+    rows = [
+        {
+            "frame": i,
+            "start_ms": round((start - frames[0][0]) * 1000, 3),
+            "frame_ms": round(frame_time * 1000, 3),
+            **{f"{name}_ms": round(stages.get(name, 0.0) * 1000, 3) for name in STAGES},
+        }
+        for i, (start, frame_time, stages) in enumerate(frames)
+    ]
+
+    if path.endswith(".json"):
+        with open(path, "w") as trace:
+            json.dump({"target_fps": TARGET_FPS, "frames": rows}, trace)
+        return
+
+    with open(path, "w", newline="") as trace:
+        writer = csv.DictWriter(
+            trace, ["frame", "start_ms", "frame_ms"] + [f"{name}_ms" for name in STAGES]
+        )
+        writer.writeheader()
+        writer.writerows(rows)
@@ -1,11 +1,40 @@
-import re
 import html
 import random
-import inflect
-import requests
+import time
+import queue
+import hashlib
+import logging
+import threading
+import api_client
+import question_sources
+from functools import lru_cache
+from collections import deque
 from config import *
 
-api_url = API_URL
+DIFFICULTIES = ["easy", "medium", "hard"]
+
+# Where questions are fetched from (see question_sources). Deployments and headless
+# simulations can plug in another source.
+question_source = question_sources.default_source()
+
+# In-memory pool of ready-to-ask questions, one queue per difficulty level.
+question_pool = {difficulty: deque() for difficulty in DIFFICULTIES}
+
+# Compact hashes of the questions already pooled or asked during the current game,
+# oldest first, so that long games never show the same question twice.
+seen_questions = set()
+seen_order = deque()
+seen_lock = threading.Lock()
+
+# Background refills: difficulty levels waiting to be fetched by the worker thread.
+prefetch_requests = queue.Queue()
+pending_prefetches = set()
+prefetch_lock = threading.Lock()
+prefetch_thread = None
+# Earliest time (time.monotonic) each difficulty level may be refilled again after a
+# refill that brought nothing, so that callers polling the pool do not hit the network
+# at frame rate.
+prefetch_retry_at = {}
 
 
 def game_opening() -> None:
@@ -166,6 +195,8 @@ def get_difficulty(difficulty_choice:str = "") -> str:
 def clean_text(text: str) -> str:
     """
     Clean the text extrate from the API by removing any unwanted char.
+    Texts without HTML entities are returned as they are, and the others are memoized,
+    since category names and common answers come back in almost every batch.
 
     Args:
         text (str): The text to be cleaned.
@@ -173,15 +204,179 @@ def clean_text(text: str) -> str:
     Returns:
         str: The cleaned text.
     """
-    cleaned_text = re.sub(r"&amp;", "&", text)
-    cleaned_text = html.unescape(text)
+    if "&" not in text:
+        return text
+    return unescape_text(text)
+
+
+@lru_cache(maxsize=CLEAN_TEXT_CACHE_SIZE)
+def unescape_text(text: str) -> str:
+    """
+    Decodes the HTML entities of a text, including the doubly encoded ones OpenTDB
+    sometimes returns ("&amp;amp;", "&amp;quot;").
+
+    Args:
+        text (str): The text to decode.
+
+    Returns:
+        str: The decoded text.
+    """
+    while "&amp;" in text:
+        text = text.replace("&amp;", "&")
+    return html.unescape(text)
+
+
+def clean_result(result: dict) -> dict:
+    """
+    Cleans every text field of a raw question returned by the API.
+
+    Args:
+        result (dict): One entry of the "results" list returned by the API.
+
+    Returns:
+        dict: A copy of the question with its question, answers and category cleaned.
+    """
+    cleaned = dict(result)
+    cleaned["question"] = clean_text(result["question"])
+    cleaned["correct_answer"] = clean_text(result["correct_answer"])
+    cleaned["incorrect_answers"] = [clean_text(answer) for answer in result["incorrect_answers"]]
+    cleaned["category"] = clean_text(result["category"])
+    return cleaned
+
+
+def clean_results(results):
+    """
+    Cleans a batch or a stream of raw questions (see clean_result), lazily, so that
+    whole question dumps can be cleaned while they are read.
+
+    Args:
+        results (Iterable): Entries of the "results" list returned by the API.
+
+    Yields:
+        dict: The cleaned questions, in order.
+    """
+    return map(clean_result, results)
+
+
+def parse_question(result: dict) -> tuple:
+    """
+    Turns a raw question returned by the API into the tuple used by the game.
+
+    Args:
+        result (dict): One entry of the "results" list returned by the API.
+
+    Returns:
+        tuple: A tuple containing the question, shuffled choices, correct answer and the category.
+    """
+    result = clean_result(result)
+    choices = result["incorrect_answers"]
+    choices.append(result["correct_answer"])
+    random.shuffle(choices)
+
+    return (
+        result["question"],
+        choices,
+        result["correct_answer"],
+        result["category"],
+    )
+
+
+def question_hash(question: str) -> int:
+    """
+    Computes a compact 64-bit fingerprint of a question text.
+
+    Args:
+        question (str): The cleaned question text.
+
+    Returns:
+        int: The fingerprint of the question.
+    """
+    return int.from_bytes(hashlib.blake2b(question.encode(), digest_size=8).digest(), "big")
+
+
+def mark_seen(question: str) -> bool:
+    """
+    Remembers a question for the current game. Only the last SEEN_QUESTIONS_LIMIT
+    questions are remembered, so memory stays bounded in unlimited games.
+
+    Args:
+        question (str): The cleaned question text.
+
+    Returns:
+        bool: True if the question is new, False if it was already seen in this game.
+    """
+    fingerprint = question_hash(question)
 
-    return cleaned_text
+    with seen_lock:
+        if fingerprint in seen_questions:
+            return False
+
+        seen_questions.add(fingerprint)
+        seen_order.append(fingerprint)
+        if len(seen_order) > SEEN_QUESTIONS_LIMIT:
+            seen_questions.discard(seen_order.popleft())
+
+    return True
+
+
+def start_game_session() -> None:
+    """
+    Starts a new game: forgets the questions seen in the previous game (except the ones
+    still waiting in the pool) and asks the API for a fresh session token.
+    """
+    with seen_lock:
+        seen_questions.clear()
+        seen_order.clear()
+    prefetch_retry_at.clear()
+
+    for pool in question_pool.values():
+        for question in list(pool):
+            mark_seen(question[0])
+
+    api_client.clear_token()
+
+
+def fill_question_pool(difficulty: str) -> int:
+    """
+    Fetches one batch of questions of the given difficulty (and of QUESTION_CATEGORY)
+    from the question source and stores every new one in the pool, so that none of the
+    fetched questions is thrown away. Questions already seen during the game are skipped,
+    unless the source has nothing new left, in which case they are asked again.
+    The default source saves questions fetched from the API in the on-disk cache, and
+    uses that cache when the API is unreachable or when OFFLINE_MODE is set.
+
+    Args:
+        difficulty (str): The difficulty level that needs questions.
+
+    Returns:
+        int: The number of questions added to the pool (0 if nothing could be loaded).
+    """
+    fetched = question_source.fetch(QUESTION_BATCH_SIZE, difficulty, QUESTION_CATEGORY)
+
+    added = 0
+    for level, question in fetched or []:
+        pool = question_pool.get(level)
+        if pool is not None and len(pool) < POOL_MAX_SIZE and mark_seen(question[0]):
+            pool.append(question)
+            added += 1
+
+    if fetched and not added:
+        # Every question the source gave was already seen (a small cache or bank played
+        # through): repeat them rather than wait forever for new ones.
+        for level, question in fetched:
+            pool = question_pool.get(level)
+            if pool is not None and len(pool) < POOL_MAX_SIZE:
+                pool.append(question)
+                added += 1
+
+    return added
 
 
 def get_question(difficulty: str) -> tuple:
     """
-    Retrieve informations about the question and the question itself from the API based on the difficulty level.
+    Retrieve informations about the question and the question itself based on the difficulty level.
+    Questions are served from the in-memory pool, which is refilled in bulk from the API
+    (or from the on-disk cache when offline) when it drops below the low-water mark.
 
     Args:
         difficulty (str): The difficulty level of the question.
@@ -189,147 +384,422 @@ def get_question(difficulty: str) -> tuple:
     Returns:
         tuple: A tuple containing the questions, choices, correct answer and the category.
     """
-    while True:
-        response = requests.get(api_url)
+    pool = question_pool[difficulty]
 
-        if response.status_code != 200:
-            # print(f"Failed to retrieve data: {response.status_code}")
-            continue
+    if len(pool) < POOL_LOW_WATER:
+        fill_question_pool(difficulty)
+
+    while not pool:
+        if not fill_question_pool(difficulty):
+            time.sleep(api_client.retry_after())
+
+    return pool.popleft()
+
+
+def prefetch_worker() -> None:
+    """
+    Runs forever on a background thread, refilling the pool of each difficulty level
+    requested through the prefetch queue. A failed refill is logged and retried later,
+    like an empty one, without stopping the worker.
+    """
+    while True:
+        difficulty = prefetch_requests.get()
 
         try:
-            data = response.json()
-            results = data["results"]
-        except requests.exceptions.JSONDecodeError or IndexError:
-            # print("Failed to decode JSON response")
-            # print("Response content:", response.content)
-            continue
-
-        for result in results:
-            if result["difficulty"] == difficulty:
-                question = clean_text(result["question"])
-                correct_answer = clean_text(result["correct_answer"])
-                choices = result["incorrect_answers"]
-                choices.append(correct_answer)
-                choices = [clean_text(choice) for choice in choices]
-                random.shuffle(choices)
-                category = clean_text(result["category"])
-
-                return (
-                    question,
-                    choices,
-                    correct_answer,
-                    category,
-                )
+            while len(question_pool[difficulty]) < POOL_LOW_WATER:
+                if not fill_question_pool(difficulty):
+                    prefetch_retry_at[difficulty] = time.monotonic() + api_client.retry_after()
+                    break
+        except Exception:
+            logging.exception("Refilling the %s question pool failed", difficulty)
+            prefetch_retry_at[difficulty] = time.monotonic() + api_client.retry_after()
+        finally:
+            with prefetch_lock:
+                pending_prefetches.discard(difficulty)
+            prefetch_requests.task_done()
+
+
+def prefetch_questions(difficulty: str = "") -> None:
+    """
+    Asks the background worker to refill the pool without blocking the caller.
+    Levels whose last refill brought nothing are only requested again once
+    api_client.retry_after has elapsed, as get_question does.
 
+    Args:
+        difficulty (str, optional): The difficulty level to refill. Every level below
+            the low-water mark is refilled if not given.
+    """
+    global prefetch_thread
 
-def ask_question(player: str, scores: dict, difficulty: str) -> None:
+    with prefetch_lock:
+        if prefetch_thread is None or not prefetch_thread.is_alive():
+            prefetch_thread = threading.Thread(target=prefetch_worker, daemon=True)
+            prefetch_thread.start()
+
+        now = time.monotonic()
+        for level in [difficulty] if difficulty else DIFFICULTIES:
+            if (
+                len(question_pool[level]) < POOL_LOW_WATER
+                and level not in pending_prefetches
+                and now >= prefetch_retry_at.get(level, 0.0)
+            ):
+                pending_prefetches.add(level)
+                prefetch_requests.put(level)
+
+
+def get_question_nowait(difficulty: str) -> tuple:
     """
-    Asks a question to the player and updates the scores dictionary accordingly.
+    Takes a question from the pool without waiting for the network, and schedules
+    a background refill when the pool runs low.
 
     Args:
-        player (str): The name of the player.
+        difficulty (str): The difficulty level of the question.
+
+    Returns:
+        tuple: The question tuple (see get_question), or None if the pool is empty.
+    """
+    try:
+        question = question_pool[difficulty].popleft()
+    except IndexError:
+        question = None
+
+    prefetch_questions(difficulty)
+
+    return question
+
+
+def round_turns(players: list, round_num: int, round_mode: str) -> list:
+    """
+    Gives the turns of a round: a question per player in turn, or in simultaneous
+    rounds, a single question for everyone, whose difficulty the players take turns
+    to choose.
+
+    Args:
+        players (list): The names of the players.
+        round_num (int): The number of the round, from 0.
+        round_mode (str): "turns" or "simultaneous" (see config.ROUND_MODE).
+
+    Returns:
+        list: (player choosing the difficulty, players answering) pairs, in order.
+    """
+    if round_mode == "simultaneous":
+        return [(players[round_num % len(players)], list(players))]
+    return [(player, [player]) for player in players]
+
+
+def play_round(
+    players: list,
+    scores: dict,
+    round_num: int,
+    round_mode: str,
+    choose_difficulty,
+    next_question,
+    collect_answers,
+    show_result,
+):
+    """
+    Plays one round with the rules shared by the console game, the Pygame game and the
+    headless simulations, which only differ by how they interact with the players.
+    Each callback may also return a state that stops the game (for instance when a
+    player goes back to the menu), which is then returned.
+
+    Args:
+        players (list): The names of the players.
         scores (dict): A dictionary containing the scores of all players.
+        round_num (int): The number of the round, from 0.
+        round_mode (str): "turns" or "simultaneous" (see config.ROUND_MODE).
+        choose_difficulty (Callable): Gives the difficulty of a turn, given the player
+            choosing it.
+        next_question (Callable): Gives the question tuple of a turn, given its difficulty.
+        collect_answers (Callable): Asks the question, given the answering players, the
+            difficulty and the question tuple. Returns the answers as a dict of
+            player -> (answer, seconds taken), without the players who did not answer.
+        show_result (Callable): Shows the result of a turn, given the answering players,
+            the scores, the difficulty, the question tuple, the answers and the points
+            each player earned (dict).
+
+    Returns:
+        Any: None once the round is over, or the state returned by a callback to stop.
+    """
+    for chooser, answering in round_turns(players, round_num, round_mode):
+        difficulty = choose_difficulty(chooser)
+        if difficulty not in DIFFICULTIES:
+            return difficulty
+
+        question = next_question(difficulty)
+        if not isinstance(question, tuple):
+            return question
+
+        answers = collect_answers(answering, difficulty, question)
+        if not isinstance(answers, dict):
+            return answers
+
+        points = {
+            player: check_answer(
+                player,
+                scores,
+                difficulty,
+                answers[player][0] if player in answers else None,
+                question[2],
+            )
+            for player in answering
+        }
+
+        state = show_result(answering, scores, difficulty, question, answers, points)
+        if state is not None:
+            return state
+
+    return None
+
+
+def read_answers(players: list, difficulty: str, question_data: tuple) -> dict:
+    """
+    Prints a question, then reads the answer of each player in turn from the console,
+    timing each of them (see play_round).
+
+    Args:
+        players (list): The names of the answering players.
         difficulty (str): The difficulty level of the question.
+        question_data (tuple): The question tuple (see get_question).
+
+    Returns:
+        dict: The answers, as player -> (answer, seconds taken).
     """
-    question, choices, correct_answer, category = get_question(difficulty)
+    question, choices, _, category = question_data
+    audience = players[0] if len(players) == 1 else "everyone"
     print(
-        f"\n🤖 : Question of difficulty {difficulty} for {player}: {question}, on subject {category}"
+        f"\n🤖 : Question of difficulty {difficulty} for {audience}: {question}, on subject {category}"
     )
 
     for i, choice in enumerate(choices):
         print(f"{i + 1}. {choice}")
 
+    answers = {}
+    for player in players:
+        start = time.perf_counter()
+        if len(players) == 1:
+            answer = read_answer(choices)
+        else:
+            answer = read_answer(choices, f"\n🤖 : {player}, enter the number of your answer: ")
+        answers[player] = (answer, time.perf_counter() - start)
+
+    return answers
+
+
+def print_result(
+    players: list,
+    scores: dict,
+    difficulty: str,
+    question_data: tuple,
+    answers: dict,
+    points: dict,
+) -> None:
+    """
+    Prints the result of a question in the console (see play_round).
+
+    Args:
+        players (list): The names of the answering players.
+        scores (dict): A dictionary containing the scores of all players.
+        difficulty (str): The difficulty level of the question.
+        question_data (tuple): The question tuple (see get_question).
+        answers (dict): The answers, as player -> (answer, seconds taken).
+        points (dict): The points each player earned.
+    """
+    correct_answer = question_data[2]
+
+    if len(players) == 1:
+        player = players[0]
+        if points[player]:
+            print(f"\n🤖 : Correct answer! ✅\nWell done {player} ✨")
+            print(f"\n🤖 : {player} earns {points[player]} point(s). \nTotal: {scores[player]} points")
+        else:
+            print(
+                f"\n❌❌ Incorrect answer. ❌❌\n🤖 : The correct answer was: {correct_answer}"
+            )
+        return
+
+    print(f"\n🤖 : The correct answer was: {correct_answer}")
+    for player in players:
+        answer_time = f"{answers[player][1]:.1f} s"
+        if points[player]:
+            print(f"✅ {player} earns {points[player]} point(s) ({answer_time}). Total: {scores[player]} points")
+        else:
+            print(f"❌ {player} ({answer_time}). Total: {scores[player]} points")
+
+
+def ask_question(player: str, scores: dict, difficulty: str) -> None:
+    """
+    Asks a question to the player and updates the scores dictionary accordingly.
+
+    Args:
+        player (str): The name of the player.
+        scores (dict): A dictionary containing the scores of all players.
+        difficulty (str): The difficulty level of the question.
+    """
+    play_round(
+        [player],
+        scores,
+        0,
+        "turns",
+        lambda chooser: difficulty,
+        get_question,
+        read_answers,
+        print_result,
+    )
+
+
+def read_answer(choices: list, prompt: str = "\n🤖 : Enter the number of your answer: ") -> str:
+    """
+    Asks for the number of a choice until a valid one is entered.
+
+    Args:
+        choices (list): The choices of the question.
+        prompt (str, optional): The input prompt.
+
+    Returns:
+        str: The chosen answer.
+    """
     while True:
         try:
-            answer = int(input("\n🤖 : Enter the number of your answer: "))
+            answer = int(input(prompt))
             if answer not in range(1, 5):
                 raise ValueError
-            if choices[answer - 1] == correct_answer:
-                print(f"\n🤖 : Correct answer! ✅\nWell done {player} ✨")
-                update_score(player, scores, difficulty)
-                break
-            else:
-                print(
-                    f"\n❌❌ Incorrect answer. ❌❌\n🤖 : The correct answer was: {correct_answer}"
-                )
-                break
+            return choices[answer - 1]
         except (IndexError, ValueError):
             print(
                 "❌❌ Incorrect answer. ❌❌\n🤖 : Please enter a number corresponding to one of the choices."
             )
 
 
-def update_score(player: str, scores: dict, difficulty: str) -> None:
+def ask_question_to_all(players: list, scores: dict, difficulty: str) -> dict:
     """
-    Updates the scores dictionary with the player's score for the given difficulty level.
+    Asks the same question to every player, for simultaneous rounds: the question is
+    fetched once, every player answers it, and each answer is timed.
 
     Args:
-        player (str): The name of the player.
+        players (list): The names of the players.
         scores (dict): A dictionary containing the scores of all players.
         difficulty (str): The difficulty level of the question.
+
+    Returns:
+        dict: The time each player took to answer, in seconds.
     """
+    times = {}
+
+    def collect_answers(answering, level, question_data):
+        answers = read_answers(answering, level, question_data)
+        times.update((player, seconds) for player, (_, seconds) in answers.items())
+        return answers
+
+    play_round(
+        players,
+        scores,
+        0,
+        "simultaneous",
+        lambda chooser: difficulty,
+        get_question,
+        collect_answers,
+        print_result,
+    )
+    return times
+
+
+def get_points(difficulty: str) -> int:
+    """
+    Gives the number of points a good answer earns at the given difficulty level.
+
+    Args:
+        difficulty (str): The difficulty level of the question.
 
+    Returns:
+        int: The number of points (1 for easy, 2 for medium, 3 for hard).
+    """
     if difficulty == "easy":
-        points = 1
+        return 1
     elif difficulty == "medium":
-        points = 2
+        return 2
     elif difficulty == "hard":
-        points = 3
+        return 3
     else:
-        points = 1
+        return 1
+
 
+def check_answer(player: str, scores: dict, difficulty: str, answer: str, correct_answer: str) -> int:
+    """
+    Checks a player's answer and adds the points it earns to their score, without printing anything.
+
+    Args:
+        player (str): The name of the player.
+        scores (dict): A dictionary containing the scores of all players.
+        difficulty (str): The difficulty level of the question.
+        answer (str): The choice picked by the player.
+        correct_answer (str): The correct answer of the question.
+
+    Returns:
+        int: The number of points earned (0 for a wrong answer).
+    """
+    if answer != correct_answer:
+        return 0
+
+    points = get_points(difficulty)
     scores[player] += points
-    print(f"\n🤖 : {player} earns {points} point(s). \nTotal: {scores[player]} points")
+    return points
 
 
-def display_final_ranking(scores: dict) -> None:
+def rank_players(scores: dict) -> list:
     """
-    Displays the final ranking of players. Handles ties by listing tied players together.
+    Ranks the players by score. Tied players share a rank, and the next score gets the
+    next rank (1st: Alice and Bob, 2nd: Carol).
 
     Args:
         scores (dict): A dictionary containing the scores of all players.
+
+    Returns:
+        list: One (rank, players, score) tuple per distinct score, best score first.
     """
-    p = inflect.engine()
+    ranking = []
 
-    sorted_scores = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+    for player, score in sorted(scores.items(), key=lambda item: item[1], reverse=True):
+        if ranking and ranking[-1][2] == score:
+            ranking[-1][1].append(player)
+        else:
+            ranking.append((len(ranking) + 1, [player], score))
 
-    print("\n--- Final Ranking ---\n")
-    print("🤖 : Let's see who's the ultimate champion!\n")
+    return ranking
 
-    rank = 1
-    previous_score = None
-    previous_rank = 1
-    tied_players = []
-    display_rank = 1
 
-    for player, score in sorted_scores:
-        if score == previous_score:
-            tied_players.append(player)
-            rank = previous_rank
-        else:
-            if tied_players:
-                rank_text = p.ordinal(display_rank)
-                player_text = p.join(tied_players)
-                print(f"{rank_text}: {player_text} with {previous_score} points")
-                display_rank = rank
+@lru_cache(maxsize=None)
+def inflect_engine():
+    """
+    Gives the inflect engine that words the final ranking ("1st", "Alice and Bob"),
+    in the console and in the Pygame game.
 
-                tied_players = []
+    Returns:
+        inflect.engine: The engine, created on first use.
+    """
+    # inflect is slow to import, so it is only loaded once the game is over.
+    import inflect
 
-            tied_players.append(player)
-            previous_score = score
-            previous_rank = rank
+    return inflect.engine()
 
-        rank += 1
 
-    # If the last players in the sorted dict ties together.
-    if tied_players:
-        rank_text = p.ordinal(display_rank)
-        player_text = p.join(tied_players)
-        print(f"{rank_text}: {player_text} with {previous_score} points")
+def display_final_ranking(scores: dict) -> None:
+    """
+    Displays the final ranking of players. Handles ties by listing tied players together.
+
+    Args:
+        scores (dict): A dictionary containing the scores of all players.
+    """
+    p = inflect_engine()
+    ranking = rank_players(scores)
 
-    tied_winners = [
-        player for player, score in sorted_scores if score == sorted_scores[0][1]
-    ]
+    print("\n--- Final Ranking ---\n")
+    print("🤖 : Let's see who's the ultimate champion!\n")
+
+    for rank, players, score in ranking:
+        print(f"{p.ordinal(rank)}: {p.join(players)} with {score} points")
+
+    tied_winners = ranking[0][1]
     if len(tied_winners) > 1:
         winner_text = p.join(tied_winners)
         print(f"\n🤖 : Congratulations {winner_text} ! You are all joint winners! ✨")
@@ -350,13 +820,23 @@ def main():
 
     num_questions = get_num_questions()
 
+    start_game_session()
+
     for round in range(num_questions):
         print(f"\n{'-'*10} Round {round + 1} {'-'*10}\n")
 
         difficulty = get_difficulty()
 
-        for player in players:
-            ask_question(player, scores, difficulty)
+        play_round(
+            players,
+            scores,
+            round,
+            ROUND_MODE,
+            lambda chooser: difficulty,
+            get_question,
+            read_answers,
+            print_result,
+        )
 
     print(f"\n{'-'*10} Game Over {'-'*10}")
     display_final_ranking(scores)
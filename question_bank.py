@@ -0,0 +1,295 @@
+import os
+import sys
+import csv
+import json
+import mmap
+import time
+import random
+import struct
+import argparse
+from bisect import bisect_right
+from config import *
+
+# Layout of a bank file, little-endian:
+#   header          magic, version, string count, record count, group count
+#   string offsets  (string count + 1) uint32, relative to the string data
+#   groups          one (difficulty, category string, first record, record count) per
+#                   difficulty and category, records being sorted by group
+#   records         (question, correct answer, 3 incorrect answers) string ids
+#   string data     every distinct string once, UTF-8 encoded
+MAGIC = b"CKQB"
+VERSION = 1
+HEADER = struct.Struct("<4sHxxIII")
+OFFSET = struct.Struct("<I")
+GROUP = struct.Struct("<BxxxIII")
+RECORD = struct.Struct("<5I")
+NO_STRING = 0xFFFFFFFF
+
+DIFFICULTIES = ["easy", "medium", "hard"]
+
+
+def read_results(path: str):
+    """
+    Reads raw questions in OpenTDB's layout from a file: an OpenTDB response or a list
+    of questions (.json), one question per line (.jsonl), or a CSV file with the columns
+    difficulty, category, question, correct_answer and incorrect_answers (separated by "|").
+
+    Args:
+        path (str): The path of the file.
+
+    Yields:
+        dict: The questions, as found in the "results" list of an API response.
+    """
+    if path.endswith(".csv"):
+        with open(path, newline="", encoding="utf-8") as file:
+            for row in csv.DictReader(file):
+                row["incorrect_answers"] = row["incorrect_answers"].split("|")
+                yield row
+    elif path.endswith(".jsonl"):
+        with open(path, encoding="utf-8") as file:
+            for line in file:
+                if line.strip():
+                    yield json.loads(line)
+    else:
+        with open(path, encoding="utf-8") as file:
+            data = json.load(file)
+        yield from data["results"] if isinstance(data, dict) else data
+
+
+def build_bank(results, path: str) -> int:
+    """
+    Writes questions into a bank file. Their text is cleaned once here, as they are
+    streamed through project.clean_results, duplicated questions are dropped, and every
+    distinct string (category names, common answers...) is stored only once.
+
+    Args:
+        results (Iterable): Raw questions in OpenTDB's layout (see read_results).
+        path (str): The path of the bank file.
+
+    Returns:
+        int: The number of questions in the bank.
+    """
+    from project import clean_results
+
+    string_ids = {}
+
+    def string_id(text: str) -> int:
+        return string_ids.setdefault(text, len(string_ids))
+
+    questions = set()
+    groups = {}
+
+    for result in clean_results(results):
+        difficulty = result["difficulty"]
+        question = result["question"]
+        if difficulty not in DIFFICULTIES or question in questions:
+            continue
+        questions.add(question)
+
+        record = [string_id(question), string_id(result["correct_answer"])]
+        record += [string_id(answer) for answer in result["incorrect_answers"][:3]]
+        record += [NO_STRING] * (5 - len(record))
+
+        key = (DIFFICULTIES.index(difficulty), string_id(result["category"]))
+        groups.setdefault(key, []).append(record)
+
+    strings = [text.encode("utf-8") for text in string_ids]
+    offsets = [0]
+    for data in strings:
+        offsets.append(offsets[-1] + len(data))
+
+    partial = path + ".part"
+    with open(partial, "wb") as bank:
+        bank.write(HEADER.pack(MAGIC, VERSION, len(strings), len(questions), len(groups)))
+        bank.write(b"".join(OFFSET.pack(offset) for offset in offsets))
+
+        first = 0
+        for (difficulty, category), records in sorted(groups.items()):
+            bank.write(GROUP.pack(difficulty, category, first, len(records)))
+            first += len(records)
+
+        for _, records in sorted(groups.items()):
+            bank.write(b"".join(RECORD.pack(*record) for record in records))
+
+        bank.write(b"".join(strings))
+    os.replace(partial, path)
+
+    return len(questions)
+
+
+class QuestionBank:
+    """
+    A read-only bank file, memory-mapped: opening it only reads its header and group
+    index, and questions are decoded when they are drawn, so banks of any size start
+    instantly and only use the memory of the pages they touch.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path (str): The path of the bank file (see build_bank).
+        """
+        self.file = open(path, "rb")
+        self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, string_count, record_count, group_count = HEADER.unpack_from(self.data)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a question bank")
+
+        self.offsets_start = HEADER.size
+        groups_start = self.offsets_start + (string_count + 1) * OFFSET.size
+        self.records_start = groups_start + group_count * GROUP.size
+        self.strings_start = self.records_start + record_count * RECORD.size
+        self.record_count = record_count
+
+        self.groups = [
+            GROUP.unpack_from(self.data, groups_start + i * GROUP.size)
+            for i in range(group_count)
+        ]
+        self.group_categories = [self.string(category) for _, category, _, _ in self.groups]
+
+    def __len__(self) -> int:
+        return self.record_count
+
+    def close(self) -> None:
+        """
+        Unmaps and closes the bank file.
+        """
+        self.data.close()
+        self.file.close()
+
+    def string(self, string_id: int) -> str:
+        """
+        Decodes a string of the string table.
+
+        Args:
+            string_id (int): The id of the string.
+
+        Returns:
+            str: The string.
+        """
+        position = self.offsets_start + string_id * OFFSET.size
+        start, end = struct.unpack_from("<2I", self.data, position)
+        return self.data[self.strings_start + start : self.strings_start + end].decode("utf-8")
+
+    def categories(self) -> list:
+        """
+        Returns:
+            list: The names of the categories of the bank.
+        """
+        return sorted(set(self.group_categories))
+
+    def matching_groups(self, difficulty: str = "", category: str = "") -> list:
+        """
+        Finds the groups of records of a difficulty level and category.
+
+        Args:
+            difficulty (str, optional): The difficulty level (any if not given).
+            category (str, optional): The category name (any if not given).
+
+        Returns:
+            list: The indexes of the groups.
+        """
+        return [
+            i
+            for i, (level, _, _, _) in enumerate(self.groups)
+            if (not difficulty or DIFFICULTIES[level] == difficulty)
+            and (not category or self.group_categories[i] == category)
+        ]
+
+    def count(self, difficulty: str = "", category: str = "") -> int:
+        """
+        Counts the questions of a difficulty level and category.
+
+        Args:
+            difficulty (str, optional): The difficulty level (any if not given).
+            category (str, optional): The category name (any if not given).
+
+        Returns:
+            int: The number of questions.
+        """
+        return sum(self.groups[i][3] for i in self.matching_groups(difficulty, category))
+
+    def question(self, group: int, index: int) -> tuple:
+        """
+        Decodes a question.
+
+        Args:
+            group (int): The index of its group.
+            index (int): The index of the question in its group.
+
+        Returns:
+            tuple: The difficulty and the question tuple (see project.parse_question).
+        """
+        level, _, first, _ = self.groups[group]
+        record = RECORD.unpack_from(self.data, self.records_start + (first + index) * RECORD.size)
+
+        question, correct_answer = self.string(record[0]), self.string(record[1])
+        choices = [self.string(answer) for answer in record[2:] if answer != NO_STRING]
+        choices.append(correct_answer)
+        random.shuffle(choices)
+
+        category = self.group_categories[group]
+        return DIFFICULTIES[level], (question, choices, correct_answer, category)
+
+    def sample(self, n: int, difficulty: str = "", category: str = "") -> list:
+        """
+        Draws distinct random questions, without reading the rest of the bank.
+
+        Args:
+            n (int): The number of questions.
+            difficulty (str, optional): The difficulty level (any if not given).
+            category (str, optional): The category name (any if not given).
+
+        Returns:
+            list: Up to n (difficulty, question tuple) pairs.
+        """
+        groups = self.matching_groups(difficulty, category)
+        ends = []
+        total = 0
+        for group in groups:
+            total += self.groups[group][3]
+            ends.append(total)
+
+        questions = []
+        for position in random.sample(range(total), min(n, total)):
+            i = bisect_right(ends, position)
+            start = ends[i - 1] if i else 0
+            questions.append(self.question(groups[i], position - start))
+
+        return questions
+
+
+def main(argv: list = None) -> None:
+    parser = argparse.ArgumentParser(description="Build and inspect question bank files.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = subparsers.add_parser(
+        "import", help="build a bank from OpenTDB dumps (.json, .jsonl) or .csv files"
+    )
+    import_parser.add_argument("paths", nargs="+")
+    import_parser.add_argument("--output", default=QUESTION_BANK_PATH or "questions.bank")
+
+    stats_parser = subparsers.add_parser("stats", help="show the content of a bank")
+    stats_parser.add_argument("path", nargs="?", default=QUESTION_BANK_PATH or "questions.bank")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "import":
+        start = time.perf_counter()
+        results = (result for path in args.paths for result in read_results(path))
+        count = build_bank(results, args.output)
+        elapsed = time.perf_counter() - start
+        print(f"{count} questions written to {args.output} in {elapsed:.1f} s")
+    else:
+        bank = QuestionBank(args.path)
+        for difficulty in DIFFICULTIES:
+            print(f"{difficulty}: {bank.count(difficulty)}")
+        print(f"categories: {len(bank.categories())}")
+        print(f"total: {len(bank)}")
+        bank.close()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
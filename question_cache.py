@@ -0,0 +1,227 @@
+import sys
+import json
+import time
+import random
+import sqlite3
+import argparse
+import threading
+from config import *
+
+cache_path = CACHE_PATH
+
+# One shared connection, used by the game thread and the prefetch worker.
+connection = None
+cache_lock = threading.Lock()
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS questions (
+    question TEXT PRIMARY KEY,
+    difficulty TEXT NOT NULL,
+    category TEXT NOT NULL,
+    correct_answer TEXT NOT NULL,
+    incorrect_answers TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS questions_by_level ON questions (difficulty, category);
+CREATE INDEX IF NOT EXISTS questions_by_use ON questions (last_used);
+"""
+
+
+def get_connection() -> sqlite3.Connection:
+    """
+    Opens the cache database on first use and creates its tables and indexes.
+
+    Returns:
+        sqlite3.Connection: The shared connection to the cache database.
+    """
+    global connection
+
+    if connection is None:
+        connection = sqlite3.connect(cache_path, check_same_thread=False)
+        connection.executescript(SCHEMA)
+
+    return connection
+
+
+def close() -> None:
+    """
+    Closes the shared connection, if it is open.
+    """
+    global connection
+
+    with cache_lock:
+        if connection is not None:
+            connection.close()
+            connection = None
+
+
+def store_questions(questions: list) -> None:
+    """
+    Saves cleaned questions in the cache, then evicts old entries to respect the size cap.
+
+    Args:
+        questions (list): A list of (difficulty, question tuple) pairs, where the question
+            tuple is the one returned by project.parse_question.
+    """
+    now = time.time()
+    rows = []
+    for difficulty, (question, choices, correct_answer, category) in questions:
+        incorrect_answers = [choice for choice in choices if choice != correct_answer]
+        rows.append(
+            (
+                question,
+                difficulty,
+                category,
+                correct_answer,
+                json.dumps(incorrect_answers),
+                now,
+                now,
+            )
+        )
+
+    with cache_lock:
+        db = get_connection()
+        with db:
+            db.executemany(
+                "INSERT OR IGNORE INTO questions VALUES (?, ?, ?, ?, ?, ?, ?)", rows
+            )
+        evict()
+
+
+def load_questions(difficulty: str, category: str = "", limit: int = 15) -> list:
+    """
+    Reads questions from the cache, least recently used first, and marks them as used.
+
+    Args:
+        difficulty (str): The difficulty level of the questions.
+        category (str, optional): Only return questions of this category.
+        limit (int): The maximum number of questions to return.
+
+    Returns:
+        list: A list of question tuples (question, choices, correct answer, category).
+    """
+    query = "SELECT question, category, correct_answer, incorrect_answers FROM questions WHERE difficulty = ?"
+    params = [difficulty]
+    if category:
+        query += " AND category = ?"
+        params.append(category)
+    query += " ORDER BY last_used LIMIT ?"
+    params.append(limit)
+
+    with cache_lock:
+        db = get_connection()
+        rows = db.execute(query, params).fetchall()
+        with db:
+            db.executemany(
+                "UPDATE questions SET last_used = ? WHERE question = ?",
+                [(time.time(), row[0]) for row in rows],
+            )
+
+    questions = []
+    for question, category, correct_answer, incorrect_answers in rows:
+        choices = json.loads(incorrect_answers)
+        choices.append(correct_answer)
+        random.shuffle(choices)
+        questions.append((question, choices, correct_answer, category))
+
+    return questions
+
+
+def count_questions(difficulty: str = "") -> int:
+    """
+    Counts the questions stored in the cache.
+
+    Args:
+        difficulty (str, optional): Only count questions of this difficulty level.
+
+    Returns:
+        int: The number of cached questions.
+    """
+    with cache_lock:
+        db = get_connection()
+        if difficulty:
+            row = db.execute(
+                "SELECT COUNT(*) FROM questions WHERE difficulty = ?", (difficulty,)
+            ).fetchone()
+        else:
+            row = db.execute("SELECT COUNT(*) FROM questions").fetchone()
+
+    return row[0]
+
+
+def evict(max_size: int = CACHE_MAX_SIZE, max_age: float = CACHE_MAX_AGE) -> None:
+    """
+    Removes questions older than max_age, then the least recently used ones until the
+    cache holds at most max_size questions. Must be called with cache_lock held.
+
+    Args:
+        max_size (int): The maximum number of questions kept in the cache.
+        max_age (float): The maximum age of a question, in seconds.
+    """
+    db = get_connection()
+    with db:
+        db.execute("DELETE FROM questions WHERE fetched_at < ?", (time.time() - max_age,))
+        db.execute(
+            """
+            DELETE FROM questions WHERE question IN (
+                SELECT question FROM questions ORDER BY last_used DESC LIMIT -1 OFFSET ?
+            )
+            """,
+            (max_size,),
+        )
+
+
+def warm(batches: int) -> int:
+    """
+    Fills the cache ahead of time by fetching batches of questions from the API.
+
+    Args:
+        batches (int): The number of API requests to make.
+
+    Returns:
+        int: The number of questions in the cache afterwards.
+    """
+    from api_client import fetch_results, build_api_url
+    from project import parse_question, DIFFICULTIES
+
+    for i in range(batches):
+        # Spread the batches evenly over the difficulty levels.
+        difficulty = DIFFICULTIES[i % len(DIFFICULTIES)]
+        results = fetch_results(build_api_url(difficulty, QUESTION_CATEGORY))
+        if results is None:
+            print(f"Batch {i + 1}/{batches} failed")
+        else:
+            store_questions(
+                [(result["difficulty"], parse_question(result)) for result in results]
+            )
+            print(f"Batch {i + 1}/{batches}: {len(results)} questions")
+        # OpenTDB allows one request every 5 seconds per IP.
+        if i + 1 < batches:
+            time.sleep(5)
+
+    return count_questions()
+
+
+def main(argv: list = None) -> None:
+    parser = argparse.ArgumentParser(description="Manage the offline question cache.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    warm_parser = subparsers.add_parser("warm", help="fetch questions from API_URL")
+    warm_parser.add_argument("--batches", type=int, default=10)
+
+    subparsers.add_parser("stats", help="show how many questions are cached")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "warm":
+        total = warm(args.batches)
+        print(f"{total} questions cached in {cache_path}")
+    else:
+        for difficulty in ["easy", "medium", "hard"]:
+            print(f"{difficulty}: {count_questions(difficulty)}")
+        print(f"total: {count_questions()}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,218 @@
+import asyncio
+import threading
+from abc import ABC, abstractmethod
+import api_client
+import question_cache
+from question_bank import QuestionBank
+from collections import deque
+from config import *
+
+DIFFICULTIES = ["easy", "medium", "hard"]
+
+
+def parse_results(results: list) -> list:
+    """
+    Turns raw questions in OpenTDB's layout into the questions returned by sources.
+
+    Args:
+        results (list): The "results" list of an OpenTDB response.
+
+    Returns:
+        list: (difficulty, question tuple) pairs, the question tuple being the one of
+            project.parse_question.
+    """
+    from project import parse_question
+
+    return [(result["difficulty"], parse_question(result)) for result in results]
+
+
+class QuestionSource(ABC):
+    """
+    Where the game takes its questions from. Backends implement fetch, and can be swapped
+    (see project.question_source) without touching the game code.
+    """
+
+    @abstractmethod
+    def fetch(self, n: int, difficulty: str = "", category: int = 0) -> list:
+        """
+        Fetches a batch of questions.
+
+        Args:
+            n (int): The number of questions wanted.
+            difficulty (str, optional): The difficulty level of the questions (any if not given).
+            category (int, optional): The OpenTDB category id (any if not given). Sources
+                which only know category names serve any category.
+
+        Returns:
+            list: Up to n (difficulty, question tuple) pairs (empty if the source has no
+                matching questions), or None if the source is unavailable.
+        """
+
+    async def fetch_async(self, n: int, difficulty: str = "", category: int = 0) -> list:
+        """
+        Fetches a batch of questions on a worker thread, so that the event loop is
+        never blocked by the network or the disk. See fetch.
+        """
+        return await asyncio.to_thread(self.fetch, n, difficulty, category)
+
+    def store(self, questions: list) -> None:
+        """
+        Keeps questions fetched from another source, for sources able to serve them
+        again later (see CompositeSource). Does nothing by default.
+
+        Args:
+            questions (list): (difficulty, question tuple) pairs.
+        """
+
+
+class OpenTDBSource(QuestionSource):
+    """
+    The live OpenTDB API, through api_client (retries, circuit breaker, session token).
+    """
+
+    def __init__(self, url: str = "", retries: int = None, timeout: float = None):
+        """
+        Args:
+            url (str, optional): The URL of the questions endpoint (default is api_client.api_url).
+            retries (int, optional): Retries of a failed request (default is API_MAX_RETRIES).
+            timeout (float, optional): Timeout of each request (default is API_TIMEOUT).
+        """
+        self.url = url
+        self.retries = retries
+        self.timeout = timeout
+
+    def fetch(self, n: int, difficulty: str = "", category: int = 0) -> list:
+        results = api_client.fetch_results(
+            api_client.build_api_url(difficulty, category, n, self.url),
+            self.retries,
+            self.timeout,
+        )
+        if results is None:
+            return None
+        return parse_results(results)
+
+
+class CacheSource(QuestionSource):
+    """
+    The on-disk SQLite question bank (see question_cache), least recently used
+    questions first. Its questions are only known by category name.
+    """
+
+    def fetch(self, n: int, difficulty: str = "", category: int = 0) -> list:
+        questions = []
+        for level in [difficulty] if difficulty else DIFFICULTIES:
+            questions += [
+                (level, question)
+                for question in question_cache.load_questions(level, limit=n - len(questions))
+            ]
+            if len(questions) >= n:
+                break
+        return questions
+
+    def store(self, questions: list) -> None:
+        question_cache.store_questions(questions)
+
+
+class MemorySource(QuestionSource):
+    """
+    A bank of questions kept in memory, each served once, for instance a question set
+    prepared for an event, or tests.
+    """
+
+    def __init__(self, questions: list = ()):
+        """
+        Args:
+            questions (list, optional): (difficulty, question tuple) pairs.
+        """
+        self.questions = deque(questions)
+        self.lock = threading.Lock()
+
+    def fetch(self, n: int, difficulty: str = "", category: int = 0) -> list:
+        with self.lock:
+            matching = [
+                pair for pair in self.questions if not difficulty or pair[0] == difficulty
+            ][:n]
+            for pair in matching:
+                self.questions.remove(pair)
+        return matching
+
+    def store(self, questions: list) -> None:
+        with self.lock:
+            self.questions.extend(questions)
+
+
+class BankSource(QuestionSource):
+    """
+    A question bank file built by question_bank.py, with questions drawn at random.
+    Its questions are only known by category name.
+    """
+
+    def __init__(self, path: str, category: str = ""):
+        """
+        Args:
+            path (str): The path of the bank file.
+            category (str, optional): Only draw questions of this category.
+        """
+        self.bank = QuestionBank(path)
+        self.category = category
+
+    def fetch(self, n: int, difficulty: str = "", category: int = 0) -> list:
+        return self.bank.sample(n, difficulty, self.category)
+
+
+class CompositeSource(QuestionSource):
+    """
+    Tries its sources in order until one returns questions, and saves these questions
+    into the other sources (for instance questions fetched from the network into the
+    cache).
+    """
+
+    def __init__(self, sources: list):
+        """
+        Args:
+            sources (list): The sources, in the order they are tried.
+        """
+        self.sources = sources
+
+    def fetch(self, n: int, difficulty: str = "", category: int = 0) -> list:
+        fetched = None
+
+        for source in self.sources:
+            questions = source.fetch(n, difficulty, category)
+            if questions:
+                for other in self.sources:
+                    if other is not source:
+                        other.store(questions)
+                return questions
+            if questions is not None:
+                fetched = questions
+
+        return fetched
+
+    def store(self, questions: list) -> None:
+        for source in self.sources:
+            source.store(questions)
+
+
+def default_source() -> QuestionSource:
+    """
+    Builds the source of the game: the question bank file if QUESTION_BANK_PATH is set,
+    otherwise the API, falling back to the on-disk cache when it is unreachable, or the
+    cache alone when OFFLINE_MODE is set. The cache comes second so that each game gets
+    fresh questions; the in-memory pool of project comes first. The API gets a single
+    short attempt (API_FALLBACK_RETRIES, API_FALLBACK_TIMEOUT) before the cache is
+    used, and is skipped altogether while the circuit breaker is open.
+
+    Returns:
+        QuestionSource: The source.
+    """
+    if QUESTION_BANK_PATH:
+        return BankSource(QUESTION_BANK_PATH)
+    if OFFLINE_MODE:
+        return CacheSource()
+    return CompositeSource(
+        [
+            OpenTDBSource(retries=API_FALLBACK_RETRIES, timeout=API_FALLBACK_TIMEOUT),
+            CacheSource(),
+        ]
+    )
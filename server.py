@@ -0,0 +1,431 @@
+import sys
+import json
+import random
+import asyncio
+import logging
+import argparse
+import project
+from config import *
+
+# Messages are JSON objects, one per line. The client sends:
+#   {"type": "join", "room": "kings", "name": "Alice"}
+#   {"type": "start", "rounds": 10, "difficulty": "random"}   (room host only)
+#   {"type": "answer", "number": 3, "answer": "Paris"}
+# The server sends "joined", "players", "question", "result", "ranking" and "error".
+
+
+class Player:
+    """
+    A client connected to the server.
+    """
+
+    def __init__(self, name: str, writer: asyncio.StreamWriter):
+        self.name = name
+        self.writer = writer
+        self.room = None
+
+    async def send(self, message: dict) -> None:
+        """
+        Sends a message to the client, ignoring clients that went away.
+
+        Args:
+            message (dict): The message.
+        """
+        try:
+            self.writer.write(json.dumps(message).encode() + b"\n")
+            await self.writer.drain()
+        except (ConnectionError, RuntimeError):
+            pass
+
+
+class Room:
+    """
+    A game between the players who joined the same room. Each question is sent to every
+    player at once, and their answers are collected in parallel until they have all
+    answered or the answer timeout expires. Scoring and ranking are project's.
+    """
+
+    def __init__(self, name: str, answer_timeout: float):
+        """
+        Args:
+            name (str): The name of the room.
+            answer_timeout (float): Seconds given to answer each question.
+        """
+        self.name = name
+        self.answer_timeout = answer_timeout
+        self.players = {}
+        self.scores = {}
+        self.host = None
+        self.game = None
+        self.question_number = 0
+        # The answer of each player to the current question, set by submit_answer.
+        self.answers = {}
+
+    def add_player(self, player: Player) -> str:
+        """
+        Adds a player to the room.
+
+        Args:
+            player (Player): The player.
+
+        Returns:
+            str: An error message, or an empty string if the player joined.
+        """
+        if self.game is not None:
+            return "The game has already started"
+        if len(self.players) >= ROOM_MAX_PLAYERS:
+            return "The room is full"
+        if player.name in self.players:
+            return "This name is already taken"
+
+        self.players[player.name] = player
+        self.scores[player.name] = 0
+        player.room = self
+        if self.host is None:
+            self.host = player.name
+        return ""
+
+    def remove_player(self, player: Player) -> None:
+        """
+        Removes a player who left. Their score stays in the ranking of a started game.
+
+        Args:
+            player (Player): The player.
+        """
+        self.players.pop(player.name, None)
+        if self.game is None:
+            self.scores.pop(player.name, None)
+
+        answer = self.answers.get(player.name)
+        if answer is not None and not answer.done():
+            answer.set_result(None)
+
+        if self.host == player.name:
+            self.host = next(iter(self.players), None)
+
+    async def broadcast(self, message: dict) -> None:
+        """
+        Sends a message to every player of the room at once.
+
+        Args:
+            message (dict): The message.
+        """
+        await asyncio.gather(*(player.send(message) for player in list(self.players.values())))
+
+    async def send_players(self) -> None:
+        await self.broadcast(
+            {"type": "players", "players": list(self.players), "host": self.host}
+        )
+
+    def submit_answer(self, player: Player, number: int, answer: str) -> None:
+        """
+        Records the answer of a player to the current question.
+
+        Args:
+            player (Player): The player.
+            number (int): The number of the question answered, to ignore late answers.
+            answer (str): The choice picked by the player.
+        """
+        pending = self.answers.get(player.name)
+        if number == self.question_number and pending is not None and not pending.done():
+            pending.set_result(answer)
+
+    def start(self, rounds: int, difficulty: str) -> None:
+        """
+        Starts the game in the background.
+
+        Args:
+            rounds (int): The number of questions.
+            difficulty (str): The difficulty of every question, or "random".
+        """
+        self.game = asyncio.create_task(self.run_game(rounds, difficulty))
+
+    async def run_game(self, rounds: int, difficulty: str) -> None:
+        """
+        Plays the game, telling the players if it stops because of an error instead of
+        leaving them waiting for the next question.
+
+        Args:
+            rounds (int): The number of questions.
+            difficulty (str): The difficulty of every question, or "random".
+        """
+        try:
+            await self.play(rounds, difficulty)
+        except Exception:
+            logging.exception("The game of room %s failed", self.name)
+            await self.broadcast({"type": "error", "message": "The game stopped on a server error"})
+
+    async def next_question(self, difficulty: str) -> tuple:
+        """
+        Takes a question from project's pool without blocking the event loop, waiting
+        for the background prefetcher while the pool is empty.
+
+        Args:
+            difficulty (str): The difficulty level of the question.
+
+        Returns:
+            tuple: The question tuple (see project.get_question).
+        """
+        question = project.get_question_nowait(difficulty)
+        while question is None:
+            await asyncio.sleep(0.05)
+            question = project.get_question_nowait(difficulty)
+        return question
+
+    async def play(self, rounds: int, difficulty: str) -> None:
+        """
+        Plays the game, then sends the final ranking.
+
+        Args:
+            rounds (int): The number of questions.
+            difficulty (str): The difficulty of every question, or "random".
+        """
+        for round_number in range(rounds):
+            if not self.players:
+                return
+
+            level = random.choice(project.DIFFICULTIES) if difficulty == "random" else difficulty
+            question, choices, correct_answer, category = await self.next_question(level)
+
+            self.question_number += 1
+            loop = asyncio.get_running_loop()
+            self.answers = {name: loop.create_future() for name in self.players}
+
+            await self.broadcast(
+                {
+                    "type": "question",
+                    "number": self.question_number,
+                    "round": round_number + 1,
+                    "rounds": rounds,
+                    "difficulty": level,
+                    "category": category,
+                    "question": question,
+                    "choices": choices,
+                    "timeout": self.answer_timeout,
+                }
+            )
+
+            await asyncio.wait(self.answers.values(), timeout=self.answer_timeout)
+
+            points = {
+                name: project.check_answer(
+                    name,
+                    self.scores,
+                    level,
+                    answer.result() if answer.done() else None,
+                    correct_answer,
+                )
+                for name, answer in self.answers.items()
+                if name in self.scores
+            }
+            self.answers = {}
+
+            await self.broadcast(
+                {
+                    "type": "result",
+                    "number": self.question_number,
+                    "correct_answer": correct_answer,
+                    "points": points,
+                    "scores": self.scores,
+                }
+            )
+
+        ranking = project.rank_players(self.scores)
+        await self.broadcast(
+            {
+                "type": "ranking",
+                "ranking": [
+                    {"rank": rank, "players": players, "score": score}
+                    for rank, players, score in ranking
+                ],
+                "winners": ranking[0][1] if ranking else [],
+            }
+        )
+
+
+def start_error(message: dict) -> str:
+    """
+    Checks the options of a "start" message.
+
+    Args:
+        message (dict): The "start" message.
+
+    Returns:
+        str: What is wrong with the options, or an empty string if they are valid.
+    """
+    try:
+        rounds = int(message.get("rounds", 10))
+    except (ValueError, TypeError):
+        rounds = 0
+    if rounds < 1:
+        return "The number of rounds must be a positive integer"
+
+    if message.get("difficulty", "random") not in project.DIFFICULTIES + ["random"]:
+        return "The difficulty must be easy, medium, hard or random"
+
+    return ""
+
+
+class GameServer:
+    """
+    An asyncio TCP server hosting many concurrent rooms in a single thread.
+    Questions come from project's shared pool, refilled by its background prefetcher.
+    """
+
+    def __init__(
+        self,
+        host: str = SERVER_HOST,
+        port: int = SERVER_PORT,
+        answer_timeout: float = ANSWER_TIMEOUT,
+    ):
+        """
+        Args:
+            host (str): The address to listen on.
+            port (int): The port to listen on (0 for any free port).
+            answer_timeout (float): Seconds given to answer each question.
+        """
+        self.host = host
+        self.port = port
+        self.answer_timeout = answer_timeout
+        self.rooms = {}
+        self.server = None
+        # Connection handlers, waited for when stopping.
+        self.clients = {}
+
+    async def start(self) -> None:
+        """
+        Starts listening. The port is known once started.
+        """
+        project.start_game_session()
+        self.server = await asyncio.start_server(self.handle_client, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        """
+        Stops listening, cancels the running games and disconnects every client.
+        """
+        self.server.close()
+        for room in self.rooms.values():
+            if room.game is not None:
+                room.game.cancel()
+        for writer in self.clients.values():
+            writer.close()
+        await asyncio.gather(*self.clients, return_exceptions=True)
+        await self.server.wait_closed()
+
+    async def handle_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """
+        Serves one connected client until it disconnects.
+        """
+        player = None
+        self.clients[asyncio.current_task()] = writer
+
+        try:
+            while line := await reader.readline():
+                try:
+                    message = json.loads(line)
+                    kind = message["type"]
+                except (ValueError, KeyError, TypeError):
+                    writer.write(b'{"type": "error", "message": "Invalid message"}\n')
+                    continue
+
+                if player is None:
+                    if kind == "join":
+                        player = await self.join(message, writer)
+                    continue
+
+                room = player.room
+                if kind == "answer":
+                    room.submit_answer(player, message.get("number"), message.get("answer"))
+                elif kind == "start" and room.host == player.name and room.game is None:
+                    error = start_error(message)
+                    if error:
+                        await player.send({"type": "error", "message": error})
+                    else:
+                        room.start(
+                            int(message.get("rounds", 10)),
+                            message.get("difficulty", "random"),
+                        )
+        except ConnectionError:
+            pass
+        finally:
+            del self.clients[asyncio.current_task()]
+            if player is not None:
+                self.leave(player)
+                if player.room.players:
+                    await player.room.send_players()
+            writer.close()
+
+    async def join(self, message: dict, writer: asyncio.StreamWriter) -> Player:
+        """
+        Adds a client to the room it asks for, creating the room if needed.
+
+        Args:
+            message (dict): The "join" message.
+            writer (asyncio.StreamWriter): The connection of the client.
+
+        Returns:
+            Player: The new player, or None if the client could not join.
+        """
+        player = Player(str(message.get("name", "")).strip()[:30], writer)
+        room_name = str(message.get("room", "")).strip()[:30]
+
+        if not player.name or not room_name:
+            await player.send({"type": "error", "message": "A name and a room are required"})
+            return None
+
+        room = self.rooms.get(room_name)
+        if room is None or (room.game is not None and room.game.done()):
+            room = self.rooms[room_name] = Room(room_name, self.answer_timeout)
+
+        error = room.add_player(player)
+        if error:
+            await player.send({"type": "error", "message": error})
+            return None
+
+        await player.send({"type": "joined", "room": room.name, "host": room.host == player.name})
+        await room.send_players()
+        return player
+
+    def leave(self, player: Player) -> None:
+        """
+        Removes a disconnected player, and their room once it is empty.
+
+        Args:
+            player (Player): The player.
+        """
+        room = player.room
+        room.remove_player(player)
+        if not room.players and self.rooms.get(room.name) is room:
+            del self.rooms[room.name]
+            if room.game is not None:
+                room.game.cancel()
+
+
+async def serve(host: str, port: int, answer_timeout: float) -> None:
+    server = GameServer(host, port, answer_timeout)
+    await server.start()
+    print(f"Culture Kingdom server listening on {server.host}:{server.port}")
+    await server.server.serve_forever()
+
+
+def main(argv: list = None) -> None:
+    parser = argparse.ArgumentParser(description="Host online Culture Kingdom games.")
+    parser.add_argument("--host", default=SERVER_HOST)
+    parser.add_argument("--port", type=int, default=SERVER_PORT)
+    parser.add_argument(
+        "--timeout", type=float, default=ANSWER_TIMEOUT, help="seconds to answer a question"
+    )
+
+    args = parser.parse_args(argv)
+
+    try:
+        asyncio.run(serve(args.host, args.port, args.timeout))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
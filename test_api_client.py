@@ -0,0 +1,142 @@
+import pytest
+import api_client
+
+
+class FakeResponse:
+    def __init__(self, response_code, status_code=200, token=""):
+        self.status_code = status_code
+        self.response_code = response_code
+        self.token = token
+
+    def json(self):
+        if self.token:
+            return {"response_code": self.response_code, "token": self.token}
+        return {"response_code": self.response_code, "results": [{"question": "Q"}] if self.response_code == 0 else []}
+
+
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(api_client.time, "sleep", sleeps.append)
+    monkeypatch.setattr(api_client, "consecutive_failures", 0)
+    monkeypatch.setattr(api_client, "circuit_open_until", 0.0)
+    monkeypatch.setattr(api_client, "rate_limited_until", 0.0)
+    monkeypatch.setattr(api_client, "USE_SESSION_TOKEN", False)
+    monkeypatch.setattr(api_client, "session_token", "")
+    monkeypatch.setattr(api_client, "token_retry_at", 0.0)
+    return sleeps
+
+
+def serve(monkeypatch, responses):
+    calls = []
+
+    def fake_get(url, timeout):
+        calls.append(url)
+        response = responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    monkeypatch.setattr(api_client.session, "get", fake_get)
+    return calls
+
+
+def test_fetch_results_retries_rate_limit(monkeypatch, no_sleep):
+    calls = serve(monkeypatch, [FakeResponse(5), FakeResponse(0, 429), FakeResponse(0)])
+
+    assert api_client.fetch_results() == [{"question": "Q"}]
+    assert len(calls) == 3
+    assert len(no_sleep) == 2
+    assert all(delay > api_client.API_RATE_LIMIT_DELAY - 0.1 for delay in no_sleep)
+
+
+def test_rate_limit_does_not_open_the_circuit(monkeypatch):
+    monkeypatch.setattr(api_client, "API_MAX_RETRIES", 0)
+    calls = serve(monkeypatch, [FakeResponse(0, 429) for _ in range(10)])
+
+    for _ in range(api_client.CIRCUIT_BREAKER_THRESHOLD):
+        assert api_client.fetch_results() is None
+    assert not api_client.circuit_is_open()
+    assert api_client.consecutive_failures == 0
+    assert api_client.retry_after() > api_client.API_RATE_LIMIT_DELAY - 0.1
+    # Without retries, nothing is requested until the rate limit is over.
+    assert len(calls) == 1
+
+
+def test_fetch_results_no_results_does_not_retry(monkeypatch):
+    calls = serve(monkeypatch, [FakeResponse(1)])
+
+    assert api_client.fetch_results() == []
+    assert len(calls) == 1
+
+
+def test_fetch_results_gives_up_after_max_retries(monkeypatch, no_sleep):
+    calls = serve(monkeypatch, [FakeResponse(0, 500) for _ in range(10)])
+
+    assert api_client.fetch_results() is None
+    assert len(calls) == api_client.API_MAX_RETRIES + 1
+    assert all(0 <= delay <= api_client.API_BACKOFF_MAX for delay in no_sleep)
+
+
+def test_circuit_breaker_opens_after_failures(monkeypatch):
+    monkeypatch.setattr(api_client, "API_MAX_RETRIES", 0)
+    calls = serve(monkeypatch, [FakeResponse(0, 500) for _ in range(10)])
+
+    for _ in range(api_client.CIRCUIT_BREAKER_THRESHOLD):
+        assert api_client.fetch_results() is None
+    assert api_client.circuit_is_open()
+
+    assert api_client.fetch_results() is None
+    assert len(calls) == api_client.CIRCUIT_BREAKER_THRESHOLD
+
+
+def test_fetch_results_sends_session_token(monkeypatch):
+    monkeypatch.setattr(api_client, "USE_SESSION_TOKEN", True)
+    calls = serve(monkeypatch, [FakeResponse(0, token="abc"), FakeResponse(0)])
+
+    assert api_client.fetch_results("https://example.com/api.php?amount=15") == [{"question": "Q"}]
+    assert calls[0] == "https://example.com/api_token.php?command=request"
+    assert calls[1] == "https://example.com/api.php?amount=15&token=abc"
+
+
+def test_fetch_results_resets_exhausted_token(monkeypatch):
+    monkeypatch.setattr(api_client, "USE_SESSION_TOKEN", True)
+    monkeypatch.setattr(api_client, "session_token", "abc")
+    calls = serve(monkeypatch, [FakeResponse(4), FakeResponse(0, token="abc"), FakeResponse(0)])
+
+    assert api_client.fetch_results("https://example.com/api.php") == [{"question": "Q"}]
+    assert calls[1] == "https://example.com/api_token.php?command=reset&token=abc"
+    assert api_client.session_token == "abc"
+
+
+def test_token_renewal_is_not_a_retry(monkeypatch):
+    monkeypatch.setattr(api_client, "API_MAX_RETRIES", 0)
+    monkeypatch.setattr(api_client, "USE_SESSION_TOKEN", True)
+    monkeypatch.setattr(api_client, "session_token", "old")
+    calls = serve(monkeypatch, [FakeResponse(3), FakeResponse(0, token="new"), FakeResponse(0)])
+
+    assert api_client.fetch_results("https://example.com/api.php") == [{"question": "Q"}]
+    assert calls[2] == "https://example.com/api.php?token=new"
+
+
+def test_failed_token_request_backs_off(monkeypatch):
+    monkeypatch.setattr(api_client, "API_MAX_RETRIES", 0)
+    monkeypatch.setattr(api_client, "USE_SESSION_TOKEN", True)
+    calls = serve(monkeypatch, [api_client.requests.exceptions.Timeout(), FakeResponse(0)])
+
+    # The API is unreachable: the questions are not even requested.
+    assert api_client.fetch_results("https://example.com/api.php") is None
+    assert len(calls) == 1
+
+    # The next fetch goes on without a token rather than asking for one again.
+    assert api_client.fetch_results("https://example.com/api.php") == [{"question": "Q"}]
+    assert calls[1] == "https://example.com/api.php"
+
+
+def test_build_api_url(monkeypatch):
+    monkeypatch.setattr(api_client, "api_url", "https://example.com/api.php?amount=15&type=multiple")
+
+    assert api_client.build_api_url() == "https://example.com/api.php?amount=15&type=multiple"
+    assert api_client.build_api_url("hard", 9, 30) == (
+        "https://example.com/api.php?amount=30&type=multiple&difficulty=hard&category=9"
+    )
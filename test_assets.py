@@ -0,0 +1,70 @@
+import pygame
+import pytest
+import assets
+from assets import (
+    get_font,
+    preload_fonts,
+    get_image,
+    set_screen_size,
+    declare_screen_assets,
+    preload_screen,
+    memory_usage,
+    memory_report,
+)
+
+
+@pytest.fixture(autouse=True)
+def fonts(monkeypatch):
+    pygame.font.init()
+    monkeypatch.setattr(assets, "fonts", {})
+    monkeypatch.setattr(assets, "images", {})
+    monkeypatch.setattr(assets, "screen_assets", {})
+    monkeypatch.setattr(assets, "screen_size", None)
+
+
+@pytest.fixture
+def image_path(tmp_path):
+    path = str(tmp_path / "background.png")
+    pygame.image.save(pygame.Surface((20, 10)), path)
+    return path
+
+
+def test_get_font_is_shared():
+    font = get_font(40)
+    assert get_font(40) is font
+    assert get_font(41) is not font
+    assert font.get_height() > 0
+
+
+def test_preload_fonts():
+    preload_fonts([20, 30])
+    assert set(assets.fonts) == {(None, 20), (None, 30)}
+
+
+def test_get_image_is_loaded_once(image_path):
+    set_screen_size((40, 30))
+
+    image = get_image(image_path)
+    assert get_image(image_path) is image
+    assert image.get_size() == (20, 10)
+    assert get_image(image_path, fit_screen=True).get_size() == (40, 30)
+    assert memory_usage()["images"] >= 20 * 10 + 40 * 30
+    assert memory_report().startswith("assets: images ")
+
+
+def test_set_screen_size_drops_scaled_images(image_path):
+    set_screen_size((40, 30))
+    image = get_image(image_path)
+    get_image(image_path, fit_screen=True)
+
+    set_screen_size((80, 60))
+    assert get_image(image_path) is image
+    assert get_image(image_path, fit_screen=True).get_size() == (80, 60)
+
+
+def test_preload_screen(image_path):
+    set_screen_size((40, 30))
+    declare_screen_assets("settings", [(image_path, True)])
+
+    preload_screen("settings").join()
+    assert (image_path, True) in assets.images
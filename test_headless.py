@@ -0,0 +1,77 @@
+import pytest
+import api_client
+from headless import (
+    StubQuestionSource,
+    stub_environment,
+    play_headless_game,
+    run_benchmark,
+    run_import_benchmark,
+    scripted_strategy,
+    correct_strategy,
+    percentile,
+)
+
+
+@pytest.fixture(autouse=True)
+def no_token(monkeypatch):
+    monkeypatch.setattr(api_client, "USE_SESSION_TOKEN", False)
+
+
+def test_stub_question_source():
+    source = StubQuestionSource()
+    questions = source.fetch(5, "hard")
+
+    assert len(questions) == 5
+    assert {difficulty for difficulty, _ in questions} == {"hard"}
+    assert len({question[0] for _, question in questions}) == 5
+    assert source.calls == 1
+
+
+def test_play_headless_game_scripted():
+    with stub_environment(StubQuestionSource()):
+        result = play_headless_game(
+            ["Alice", "Bob"], 3, scripted_strategy([True, False]), difficulty="hard"
+        )
+
+    assert result["scores"] == {"Alice": 9, "Bob": 0}
+    assert len(result["times"]) == 6
+
+
+def test_play_headless_game_simultaneous():
+    source = StubQuestionSource()
+    with stub_environment(source):
+        result = play_headless_game(
+            ["Alice", "Bob"],
+            3,
+            scripted_strategy([True, False]),
+            difficulty="hard",
+            round_mode="simultaneous",
+        )
+
+    assert result["scores"] == {"Alice": 9, "Bob": 0}
+    assert len(result["times"]) == 3
+    assert source.calls == 1
+
+
+@pytest.mark.parametrize("flow", ["console", "app"])
+def test_run_benchmark(flow):
+    report = run_benchmark(4, 10, correct_strategy, difficulty="easy", flow=flow)
+
+    assert report["questions"] == 40
+    assert report["scores"] == {f"Player_{i}": 10 for i in range(1, 5)}
+    assert report["api_calls_per_question"] < 0.2
+    assert report["cache_hit_rate"] > 0.5
+
+
+def test_run_import_benchmark():
+    report = run_import_benchmark(500)
+
+    assert report["questions"] == 500
+    assert report["imported_per_second"] > 0
+    assert report["clean_cache_hit_rate"] > 0.5
+
+
+def test_percentile():
+    assert percentile([], 0.5) == 0.0
+    assert percentile([3, 1, 2], 0.5) == 2
+    assert percentile(list(range(100)), 0.99) == 99
@@ -0,0 +1,61 @@
+import pytest
+import project
+import api_client
+
+
+@pytest.fixture
+def server(mock_server, monkeypatch):
+    monkeypatch.setattr(api_client, "USE_SESSION_TOKEN", True)
+    return mock_server
+
+
+def test_get_question_end_to_end(server):
+    question, choices, answer, category = project.get_question("hard")
+
+    assert question.startswith('Which is "answer ') and "hard" in question
+    assert answer in choices and len(choices) == 4
+    assert any("&" in choice for choice in choices)
+    assert category in ("General Knowledge", "Science & Nature", "History")
+    assert server.token_requests == 1
+    assert api_client.session_token in server.tokens
+
+
+def test_token_never_repeats_then_resets(server):
+    url = api_client.build_api_url("easy", 9, 5)
+
+    first = api_client.fetch_results(url)
+    second = api_client.fetch_results(url)
+    assert {r["question"] for r in first}.isdisjoint(r["question"] for r in second)
+
+    # Only 10 easy questions in the category: the token is exhausted, then reset.
+    assert len(api_client.fetch_results(url)) == 5
+    assert server.token_requests == 2
+
+
+def test_unknown_token_is_renewed(server, monkeypatch):
+    monkeypatch.setattr(api_client, "session_token", "expired")
+
+    assert len(api_client.fetch_results(api_client.build_api_url("medium"))) == 15
+    assert api_client.session_token in server.tokens
+
+
+def test_rate_limit_is_retried(server):
+    server.rate_limit_interval = 0.1
+
+    assert api_client.fetch_results(api_client.build_api_url("easy", amount=1))
+    assert api_client.fetch_results(api_client.build_api_url("easy", amount=1))
+    assert server.question_requests == 3
+
+
+def test_invalid_parameters(server):
+    assert api_client.fetch_results(api_client.build_api_url("easy", 9, 20)) == []
+    assert api_client.fetch_results(api_client.build_api_url("legendary")) == []
+
+
+def test_server_errors_open_the_circuit(server, monkeypatch):
+    monkeypatch.setattr(api_client, "API_MAX_RETRIES", 0)
+    server.error_rate = 1.0
+
+    for _ in range(api_client.CIRCUIT_BREAKER_THRESHOLD):
+        assert api_client.fetch_results() is None
+    assert api_client.circuit_is_open()
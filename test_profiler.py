@@ -0,0 +1,87 @@
+import csv
+import json
+import pygame
+import pytest
+import profiler
+
+
+@pytest.fixture(autouse=True)
+def profiling():
+    profiler.enable()
+    yield
+    profiler.enable(False)
+
+
+def test_disabled_stages_record_nothing():
+    profiler.enable(False)
+
+    assert profiler.stage("flip") is profiler.disabled_stage
+    with profiler.stage("flip"):
+        pass
+    profiler.record("flip", 1.0)
+    profiler.end_frame()
+
+    assert not profiler.frames
+    assert not profiler.current_stages
+
+
+def test_stages_are_added_per_frame():
+    with profiler.stage("text_render"):
+        pass
+    profiler.record("text_render", 0.5)
+    profiler.record("flip", 0.25)
+    profiler.end_frame()
+    profiler.end_frame()
+
+    (_, _, first), (_, _, second) = profiler.frames
+    assert first["text_render"] >= 0.5
+    assert first["flip"] == 0.25
+    assert second == {}
+
+
+def test_summary():
+    profiler.frames.extend([(0.0, 0.02, {"flip": 0.004}), (0.02, 0.02, {})])
+
+    stats = profiler.summary()
+    assert stats["fps"] == pytest.approx(50)
+    assert stats["frame_time"] == pytest.approx(0.02)
+    assert stats["stages"]["flip"] == pytest.approx(0.002)
+
+
+def test_export_trace(tmp_path):
+    profiler.frames.extend([(10.0, 0.02, {"flip": 0.004}), (10.02, 0.01, {})])
+
+    profiler.export_trace(str(tmp_path / "trace.csv"))
+    with open(tmp_path / "trace.csv") as trace:
+        rows = list(csv.DictReader(trace))
+    assert [row["frame_ms"] for row in rows] == ["20.0", "10.0"]
+    assert rows[1]["start_ms"] == "20.0"
+    assert rows[0]["flip_ms"] == "4.0"
+
+    profiler.export_trace(str(tmp_path / "trace.json"))
+    with open(tmp_path / "trace.json") as trace:
+        frames = json.load(trace)["frames"]
+    assert frames[0]["video_decode_ms"] == 0.0
+
+
+def test_draw_overlay():
+    pygame.font.init()
+    screen = pygame.Surface((800, 600))
+    profiler.frames.extend([(0.0, 0.016, {}), (0.016, 0.05, {})])
+
+    overlay = profiler.draw_overlay(screen, pygame.font.Font(None, 24))
+
+    assert overlay.topleft == (0, 0)
+    assert screen.get_at((overlay.right - 1, 1))[:3] == (0, 0, 0)
+
+
+def test_draw_overlay_extra_lines():
+    pygame.font.init()
+    screen = pygame.Surface((800, 600))
+    font = pygame.font.Font(None, 24)
+    profiler.frames.extend([(0.0, 0.016, {}), (0.016, 0.05, {})])
+
+    overlay = profiler.draw_overlay(screen, font)
+    extended = profiler.draw_overlay(screen, font, ["assets: images 1.0 MiB"])
+
+    assert extended.height > overlay.height
@@ -1,6 +1,26 @@
-from project import get_num_players, get_num_questions, get_difficulty, clean_text
+import time
+import pytest
+import project
+import api_client
+import question_cache
+import question_sources
+from project import get_num_players, get_num_questions, get_difficulty, clean_text, clean_results, parse_question, get_question, get_question_nowait, mark_seen, check_answer
 from pytest import raises
 
+
+def make_result(difficulty, question="What is 5 &amp; 3?"):
+    return {
+        "difficulty": difficulty,
+        "category": "Science &amp; Nature",
+        "question": question,
+        "correct_answer": "8",
+        "incorrect_answers": ["2", "15", "53"],
+    }
+
+
+pytestmark = pytest.mark.usefixtures("fresh_game")
+
+
 def test_get_num_players():
     assert get_num_players(1) == 1
     assert get_num_players(20) == 20
@@ -24,6 +44,20 @@ def test_clean_text():
     text_cleaned = "Hello & welcome to the world of coding! <Python> is awesome & versatile."
     assert clean_text(text_to_clean) == text_cleaned
     
+def test_clean_text_double_encoded():
+    assert clean_text("Tom &amp;amp; Jerry") == "Tom & Jerry"
+    assert clean_text("&amp;quot;Caf&amp;eacute;&amp;quot;") == '"Café"'
+    assert clean_text("No entities") == "No entities"
+
+
+def test_clean_results():
+    results = (make_result("easy") for _ in range(3))
+    cleaned = list(clean_results(results))
+
+    assert [result["question"] for result in cleaned] == ["What is 5 & 3?"] * 3
+    assert cleaned[0]["category"] == "Science & Nature"
+    assert cleaned[0]["difficulty"] == "easy"
+
 def test_get_num_players_str():
     with raises(ValueError):
         assert get_num_players("abc")
@@ -34,4 +68,178 @@ def test_get_num_questions_str():
         
 def test_get_difficulty_str():
     with raises(ValueError):
-        assert get_difficulty("abc")
\ No newline at end of file
+        assert get_difficulty("abc")
+
+def test_parse_question():
+    question, choices, correct_answer, category = parse_question(make_result("easy"))
+    assert question == "What is 5 & 3?"
+    assert sorted(choices) == ["15", "2", "53", "8"]
+    assert correct_answer == "8"
+    assert category == "Science & Nature"
+
+
+def test_get_question_uses_pool(mock_server):
+    questions = [get_question("easy")[0] for _ in range(10)]
+
+    assert len(set(questions)) == 10
+    assert all("-easy-" in question for question in questions)
+    assert mock_server.question_requests == 1
+
+
+def test_get_question_nowait(monkeypatch):
+    requested = []
+    monkeypatch.setattr(project, "prefetch_questions", requested.append)
+    monkeypatch.setattr(project, "question_pool", {"easy": project.deque([("Q", [], "A", "C")]), "medium": project.deque(), "hard": project.deque()})
+
+    assert get_question_nowait("easy") == ("Q", [], "A", "C")
+    assert get_question_nowait("easy") is None
+    assert requested == ["easy", "easy"]
+
+
+def test_prefetch_worker_survives_errors(monkeypatch):
+    class BrokenSource(question_sources.QuestionSource):
+        def fetch(self, n, difficulty="", category=0):
+            raise KeyError("question")
+
+    monkeypatch.setattr(project, "question_source", BrokenSource())
+    monkeypatch.setattr(project, "prefetch_retry_at", {})
+    monkeypatch.setattr(project, "question_pool", {"easy": project.deque(), "medium": project.deque(), "hard": project.deque()})
+
+    assert get_question_nowait("easy") is None
+    project.prefetch_requests.join()
+    assert project.prefetch_thread.is_alive()
+
+    # Refills are not requested again before the retry delay.
+    assert get_question_nowait("easy") is None
+    assert "easy" not in project.pending_prefetches
+
+    project.prefetch_retry_at.clear()
+    monkeypatch.setattr(project, "question_source", question_sources.MemorySource([("easy", ("Q", [], "A", "C"))]))
+    get_question_nowait("easy")
+    project.prefetch_requests.join()
+    assert get_question_nowait("easy") == ("Q", [], "A", "C")
+
+
+def test_prefetch_waits_out_rate_limit(mock_server):
+    mock_server.rate_limit_interval = 0.2
+
+    deadline = time.monotonic() + 5
+    while not all(project.question_pool.values()) and time.monotonic() < deadline:
+        project.prefetch_questions()
+        time.sleep(0.01)
+
+    assert all(project.question_pool.values())
+    assert not api_client.circuit_is_open()
+
+
+def test_get_question_offline_uses_cache(mock_server):
+    mock_server.error_rate = 1.0
+    question_cache.store_questions([("hard", parse_question(make_result("hard")))])
+
+    assert get_question("hard")[0] == "What is 5 & 3?"
+
+
+def test_get_question_skips_seen_questions(mock_server, monkeypatch):
+    # A batch is the 10 hard questions of the category, and all but one were seen.
+    monkeypatch.setattr(project, "QUESTION_CATEGORY", 9)
+    monkeypatch.setattr(project, "QUESTION_BATCH_SIZE", 10)
+    questions = [
+        clean_text(result["question"])
+        for category, result in mock_server.bank
+        if category == 9 and result["difficulty"] == "hard"
+    ]
+    for question in questions[1:]:
+        mark_seen(question)
+
+    assert get_question("hard")[0] == questions[0]
+    assert len(project.question_pool["hard"]) == 0
+
+
+def test_get_question_repeats_exhausted_cache(monkeypatch):
+    monkeypatch.setattr(project, "question_source", question_sources.CacheSource())
+    monkeypatch.setattr(project, "question_pool", {"easy": project.deque(), "medium": project.deque(), "hard": project.deque()})
+    question_cache.store_questions([("hard", parse_question(make_result("hard", f"Q{i}"))) for i in range(3)])
+
+    questions = [get_question("hard")[0] for _ in range(5)]
+    assert sorted(questions[:3]) == ["Q0", "Q1", "Q2"]
+    assert set(questions[3:]) <= {"Q0", "Q1", "Q2"}
+
+
+def test_mark_seen_is_bounded(monkeypatch):
+    monkeypatch.setattr(project, "SEEN_QUESTIONS_LIMIT", 3)
+
+    assert mark_seen("Q0")
+    assert not mark_seen("Q0")
+    for i in range(1, 4):
+        assert mark_seen(f"Q{i}")
+    assert len(project.seen_questions) == 3
+    assert mark_seen("Q0")
+
+
+def test_check_answer():
+    scores = {"Alice": 0}
+    assert check_answer("Alice", scores, "medium", "Paris", "Paris") == 2
+    assert check_answer("Alice", scores, "hard", "Rome", "Paris") == 0
+    assert scores == {"Alice": 2}
+
+
+def test_rank_players():
+    scores = {"Alice": 5, "Bob": 3, "Carol": 5, "Dan": 1}
+
+    assert project.rank_players(scores) == [
+        (1, ["Alice", "Carol"], 5),
+        (2, ["Bob"], 3),
+        (3, ["Dan"], 1),
+    ]
+
+
+def test_play_round():
+    question = ("Q?", ["A", "B", "C", "D"], "C", "Art")
+    scores = {"Alice": 0, "Bob": 0}
+    turns = []
+
+    def collect_answers(answering, difficulty, question_data):
+        turns.append(answering)
+        return {player: ("C" if player == "Alice" else "A", 1.0) for player in answering}
+
+    def show_result(answering, scores, difficulty, question_data, answers, points):
+        assert points == {player: 3 if player == "Alice" else 0 for player in answering}
+
+    for round_mode, expected in [("turns", [["Alice"], ["Bob"]]), ("simultaneous", [["Alice", "Bob"]])]:
+        turns.clear()
+        state = project.play_round(
+            ["Alice", "Bob"], scores, 0, round_mode, lambda player: "hard", lambda level: question, collect_answers, show_result
+        )
+        assert state is None
+        assert turns == expected
+    assert scores == {"Alice": 6, "Bob": 0}
+
+    # A callback returning something else than expected stops the round.
+    assert project.play_round(["Alice"], scores, 0, "turns", lambda player: "menu", None, None, None) == "menu"
+
+
+def test_ask_question_to_all(monkeypatch):
+    monkeypatch.setattr(
+        project, "get_question", lambda difficulty: ("Q?", ["A", "B", "C", "D"], "C", "Art")
+    )
+    answers = iter(["3", "9", "1", "3"])
+    monkeypatch.setattr("builtins.input", lambda prompt: next(answers))
+    scores = {"Alice": 0, "Bob": 0, "Carol": 0}
+
+    times = project.ask_question_to_all(["Alice", "Bob", "Carol"], scores, "medium")
+
+    assert scores == {"Alice": 2, "Bob": 0, "Carol": 2}
+    assert set(times) == {"Alice", "Bob", "Carol"}
+
+
+def test_ask_question_prints_points(monkeypatch, capsys):
+    monkeypatch.setattr(
+        project, "get_question", lambda difficulty: ("Q?", ["A", "B", "C", "D"], "C", "Art")
+    )
+    monkeypatch.setattr("builtins.input", lambda prompt: "3")
+    scores = {"Alice": 1}
+
+    project.ask_question("Alice", scores, "medium")
+
+    assert scores == {"Alice": 3}
+    assert "Alice earns 2 point(s). \nTotal: 3 points" in capsys.readouterr().out
@@ -0,0 +1,94 @@
+import json
+import pytest
+from question_bank import QuestionBank, build_bank, read_results, main
+from question_sources import BankSource
+
+
+def make_result(number, difficulty="easy", category="History"):
+    return {
+        "type": "multiple",
+        "difficulty": difficulty,
+        "category": category,
+        "question": f"Question &quot;{number}&quot;?",
+        "correct_answer": f"Answer {number}",
+        "incorrect_answers": ["Wrong &amp; 1", "Wrong 2", "Wrong 3"],
+    }
+
+
+@pytest.fixture
+def bank_path(tmp_path):
+    results = [make_result(i) for i in range(10)]
+    results += [make_result(i, "hard", "Science &amp; Nature") for i in range(10, 15)]
+    results.append(make_result(0))  # duplicate
+    path = str(tmp_path / "questions.bank")
+    assert build_bank(results, path) == 15
+    return path
+
+
+def test_bank_counts(bank_path):
+    bank = QuestionBank(bank_path)
+    try:
+        assert len(bank) == 15
+        assert bank.count("easy") == 10
+        assert bank.count("hard", "Science & Nature") == 5
+        assert bank.count("medium") == 0
+        assert bank.categories() == ["History", "Science & Nature"]
+    finally:
+        bank.close()
+
+
+def test_bank_sample(bank_path):
+    bank = QuestionBank(bank_path)
+    try:
+        questions = bank.sample(8, "easy")
+        assert len(questions) == 8
+        assert len({question[0] for _, question in questions}) == 8
+
+        [(difficulty, (question, choices, correct_answer, category))] = bank.sample(1, "hard")
+        assert difficulty == "hard"
+        assert question.startswith('Question "1')
+        assert correct_answer in choices and "Wrong & 1" in choices
+        assert category == "Science & Nature"
+
+        assert len(bank.sample(50)) == 15
+        assert bank.sample(5, "easy", "Science & Nature") == []
+    finally:
+        bank.close()
+
+
+def test_bank_source(bank_path):
+    source = BankSource(bank_path, "History")
+
+    assert {difficulty for difficulty, _ in source.fetch(20)} == {"easy"}
+    assert source.fetch(5, "hard") == []
+
+
+def test_not_a_bank(tmp_path):
+    path = tmp_path / "other.bank"
+    path.write_bytes(b"not a bank at all, really")
+
+    with pytest.raises(ValueError):
+        QuestionBank(str(path))
+
+
+def test_import_files(tmp_path, capsys):
+    (tmp_path / "dump.json").write_text(
+        json.dumps({"response_code": 0, "results": [make_result(1), make_result(2)]})
+    )
+    (tmp_path / "more.jsonl").write_text(json.dumps(make_result(3, "medium")) + "\n")
+    (tmp_path / "own.csv").write_text(
+        "difficulty,category,question,correct_answer,incorrect_answers\n"
+        "hard,Art,Who painted it?,Me,You|Them|Us\n"
+    )
+    paths = [str(tmp_path / name) for name in ["dump.json", "more.jsonl", "own.csv"]]
+
+    assert len(list(read_results(paths[2]))) == 1
+    main(["import", *paths, "--output", str(tmp_path / "all.bank")])
+    assert "4 questions" in capsys.readouterr().out
+
+    bank = QuestionBank(str(tmp_path / "all.bank"))
+    try:
+        assert [bank.count(level) for level in ["easy", "medium", "hard"]] == [2, 1, 1]
+        assert sorted(bank.sample(1, "hard")[0][1][1]) == ["Me", "Them", "Us", "You"]
+    finally:
+        bank.close()
@@ -0,0 +1,46 @@
+import pytest
+import question_cache
+
+
+pytestmark = pytest.mark.usefixtures("temporary_cache")
+
+
+def make_question(text, category="History"):
+    return (text, ["A", "B", "C", "D"], "B", category)
+
+
+def test_store_and_load_questions():
+    question_cache.store_questions(
+        [("easy", make_question("Q1")), ("easy", make_question("Q2", "Art")), ("hard", make_question("Q3"))]
+    )
+
+    assert question_cache.count_questions() == 3
+    assert question_cache.count_questions("easy") == 2
+    assert [q[0] for q in question_cache.load_questions("easy", "Art")] == ["Q2"]
+
+    question, choices, correct_answer, category = question_cache.load_questions("hard")[0]
+    assert question == "Q3"
+    assert sorted(choices) == ["A", "B", "C", "D"]
+    assert correct_answer == "B"
+    assert category == "History"
+
+
+def test_load_questions_least_recently_used_first():
+    question_cache.store_questions([("easy", make_question("Q1"))])
+    question_cache.store_questions([("easy", make_question("Q2"))])
+
+    assert question_cache.load_questions("easy", limit=1)[0][0] == "Q1"
+    assert question_cache.load_questions("easy", limit=1)[0][0] == "Q2"
+
+
+def test_evict_keeps_most_recently_used():
+    for i in range(5):
+        question_cache.store_questions([("medium", make_question(f"Q{i}"))])
+
+    with question_cache.cache_lock:
+        question_cache.evict(max_size=2)
+
+    assert question_cache.count_questions() == 2
+    with question_cache.cache_lock:
+        question_cache.evict(max_age=-1)
+    assert question_cache.count_questions() == 0
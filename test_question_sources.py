@@ -0,0 +1,110 @@
+import time
+import asyncio
+import pytest
+import api_client
+import question_cache
+import question_sources
+from question_sources import (
+    QuestionSource,
+    OpenTDBSource,
+    CacheSource,
+    MemorySource,
+    CompositeSource,
+    default_source,
+    parse_results,
+)
+from mock_opentdb import MockOpenTDB
+
+
+pytestmark = pytest.mark.usefixtures("temporary_cache")
+
+
+def make_question(text, difficulty="easy"):
+    return (difficulty, (text, ["A", "B", "C", "D"], "B", "History"))
+
+
+class UnavailableSource(QuestionSource):
+    def fetch(self, n, difficulty="", category=0):
+        return None
+
+
+def test_parse_results():
+    results = [
+        {
+            "difficulty": "hard",
+            "category": "Art",
+            "question": "Who&#039;s there?",
+            "correct_answer": "Me",
+            "incorrect_answers": ["You", "Them", "Us"],
+        }
+    ]
+
+    [(difficulty, (question, choices, correct_answer, category))] = parse_results(results)
+    assert difficulty == "hard"
+    assert question == "Who's there?"
+    assert sorted(choices) == ["Me", "Them", "Us", "You"]
+
+
+def test_question_source_is_abstract():
+    with pytest.raises(TypeError):
+        QuestionSource()
+
+
+def test_memory_source_serves_each_question_once():
+    source = MemorySource([make_question("Q1"), make_question("Q2", "hard"), make_question("Q3")])
+
+    assert source.fetch(5, "easy") == [make_question("Q1"), make_question("Q3")]
+    assert source.fetch(5, "easy") == []
+    assert source.fetch(5) == [make_question("Q2", "hard")]
+
+
+def test_cache_source():
+    source = CacheSource()
+    source.store([make_question("Q1"), make_question("Q2", "hard")])
+
+    assert [(d, q[0]) for d, q in source.fetch(5, "hard")] == [("hard", "Q2")]
+    assert len(source.fetch(1)) == 1
+    assert len(source.fetch(5)) == 2
+
+
+def test_composite_source_falls_back_and_stores():
+    memory = MemorySource([make_question("Q1")])
+    cache = CacheSource()
+    source = CompositeSource([UnavailableSource(), memory, cache])
+
+    assert source.fetch(5, "easy") == [make_question("Q1")]
+    assert question_cache.count_questions() == 1
+
+    # The memory bank is empty now, the cache answers.
+    assert [q[0] for _, q in source.fetch(5, "easy")] == ["Q1"]
+    assert CompositeSource([UnavailableSource()]).fetch(5) is None
+
+
+def test_fetch_async():
+    source = MemorySource([make_question("Q1")])
+
+    assert asyncio.run(source.fetch_async(1, "easy")) == [make_question("Q1")]
+
+
+def test_opentdb_source(monkeypatch):
+    monkeypatch.setattr(api_client, "USE_SESSION_TOKEN", False)
+    with MockOpenTDB() as server:
+        questions = OpenTDBSource(server.url).fetch(5, "medium", 17)
+
+    assert len(questions) == 5
+    assert all(difficulty == "medium" for difficulty, _ in questions)
+    assert all(question[3] == "Science & Nature" for _, question in questions)
+
+
+def test_default_source_falls_back_to_cache_quickly(mock_server, monkeypatch):
+    monkeypatch.setattr(api_client, "USE_SESSION_TOKEN", True)
+    monkeypatch.setattr(question_sources, "API_FALLBACK_TIMEOUT", 0.1)
+    mock_server.latency = 0.5
+    CacheSource().store([make_question("Q1")])
+
+    start = time.perf_counter()
+    assert [q[0] for _, q in default_source().fetch(5, "easy")] == ["Q1"]
+    # A single short attempt at the API, token included, before using the cache.
+    assert time.perf_counter() - start < 0.4
+    # The next fetches go on without a token rather than wait for another one.
+    assert api_client.token_retry_at > time.monotonic()
@@ -0,0 +1,163 @@
+import json
+import asyncio
+import pytest
+import headless
+from server import GameServer, Room
+
+
+@pytest.fixture(autouse=True)
+def stub_questions():
+    with headless.stub_environment(headless.StubQuestionSource()) as source:
+        yield source
+
+
+async def send(writer, message):
+    writer.write(json.dumps(message).encode() + b"\n")
+    await writer.drain()
+
+
+async def receive(reader, kind):
+    while True:
+        message = json.loads(await reader.readline())
+        if message["type"] == kind:
+            return message
+
+
+async def join(server, room, name):
+    reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+    await send(writer, {"type": "join", "room": room, "name": name})
+    await receive(reader, "joined")
+    return reader, writer
+
+
+async def play_bot(reader, writer, correct):
+    """
+    Answers every question, rightly or wrongly, and returns the final ranking.
+    """
+    while True:
+        message = json.loads(await reader.readline())
+        if message["type"] == "question":
+            answer = next(
+                choice
+                for choice in message["choices"]
+                if choice.startswith("Answer") == correct
+            )
+            await send(writer, {"type": "answer", "number": message["number"], "answer": answer})
+        elif message["type"] == "ranking":
+            writer.close()
+            return message
+
+
+def run_server(test, answer_timeout=5):
+    async def main():
+        server = GameServer("127.0.0.1", 0, answer_timeout)
+        await server.start()
+        try:
+            return await test(server)
+        finally:
+            await server.stop()
+
+    return asyncio.run(main())
+
+
+def test_room_game():
+    async def test(server):
+        alice = await join(server, "room", "Alice")
+        bob = await join(server, "room", "Bob")
+        await send(alice[1], {"type": "start", "rounds": 3, "difficulty": "hard"})
+        return await asyncio.gather(play_bot(*alice, True), play_bot(*bob, False))
+
+    alice_ranking, bob_ranking = run_server(test)
+
+    assert alice_ranking == bob_ranking
+    assert alice_ranking["ranking"] == [
+        {"rank": 1, "players": ["Alice"], "score": 9},
+        {"rank": 2, "players": ["Bob"], "score": 0},
+    ]
+    assert alice_ranking["winners"] == ["Alice"]
+
+
+def test_unanswered_question_times_out():
+    async def test(server):
+        alice = await join(server, "room", "Alice")
+        bob = await join(server, "room", "Bob")
+        await send(alice[1], {"type": "start", "rounds": 1, "difficulty": "easy"})
+        # Bob never answers.
+        question = await receive(bob[0], "question")
+        results = await asyncio.gather(play_bot(*alice, True), receive(bob[0], "result"))
+        return question, results[1]
+
+    question, result = run_server(test, answer_timeout=0.2)
+
+    assert question["timeout"] == 0.2
+    assert result["points"] == {"Alice": 1, "Bob": 0}
+
+
+def test_only_host_starts_and_names_are_unique():
+    async def test(server):
+        alice = await join(server, "room", "Alice")
+        bob = await join(server, "room", "Bob")
+        await send(bob[1], {"type": "start", "rounds": 1})
+
+        reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+        await send(writer, {"type": "join", "room": "room", "name": "Alice"})
+        error = await receive(reader, "error")
+        writer.close()
+        return server.rooms["room"].game, error
+
+    game, error = run_server(test)
+
+    assert game is None
+    assert error["message"] == "This name is already taken"
+
+
+def test_invalid_start_options():
+    async def test(server):
+        reader, writer = await join(server, "room", "Alice")
+        errors = []
+        for options in [{"rounds": "ten"}, {"rounds": 0}, {"difficulty": "insane"}]:
+            await send(writer, {"type": "start", **options})
+            errors.append((await receive(reader, "error"))["message"])
+
+        # The host is still connected and can start with valid options.
+        await send(writer, {"type": "start", "rounds": 1, "difficulty": "easy"})
+        await receive(reader, "question")
+        writer.close()
+        return errors
+
+    errors = run_server(test)
+
+    assert errors[0] == errors[1] == "The number of rounds must be a positive integer"
+    assert errors[2] == "The difficulty must be easy, medium, hard or random"
+
+
+def test_failed_game_is_reported(monkeypatch):
+    async def failing_question(self, difficulty):
+        raise KeyError(difficulty)
+
+    monkeypatch.setattr(Room, "next_question", failing_question)
+
+    async def test(server):
+        reader, writer = await join(server, "room", "Alice")
+        await send(writer, {"type": "start", "rounds": 1})
+        error = await receive(reader, "error")
+        writer.close()
+        return error
+
+    assert run_server(test)["message"] == "The game stopped on a server error"
+
+
+def test_many_concurrent_rooms():
+    async def test(server):
+        bots = []
+        for i in range(100):
+            host = await join(server, f"room{i}", "Host")
+            guest = await join(server, f"room{i}", "Guest")
+            await send(host[1], {"type": "start", "rounds": 3})
+            bots += [play_bot(*host, True), play_bot(*guest, i % 2 == 0)]
+        return await asyncio.gather(*bots)
+
+    rankings = run_server(test)
+
+    assert len(rankings) == 200
+    assert all(ranking["ranking"][0]["players"][0] == "Host" for ranking in rankings)
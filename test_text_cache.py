@@ -0,0 +1,43 @@
+import pygame
+import pytest
+import text_cache
+from text_cache import wrap_text, render_text, clear_text_cache
+
+
+@pytest.fixture(autouse=True)
+def fonts():
+    pygame.font.init()
+    clear_text_cache()
+    yield
+    clear_text_cache()
+
+
+def test_wrap_text():
+    font = pygame.font.Font(None, 30)
+    width = font.size("Hello world")[0]
+
+    assert wrap_text("Hello world again", font) == ("Hello world again",)
+    assert wrap_text("Hello world again", font, width) == ("Hello world", "again")
+
+
+def test_render_text_reuses_surfaces():
+    font = pygame.font.Font(None, 30)
+
+    surfaces = render_text("Score : 3", font, (255, 255, 255))
+    assert len(surfaces) == 1
+    assert render_text("Score : 3", font, (255, 255, 255)) is surfaces
+    assert render_text("Score : 3", font, (0, 0, 0)) is not surfaces
+    assert len(text_cache.text_surfaces) == 2
+
+
+def test_render_text_respects_budget(monkeypatch):
+    font = pygame.font.Font(None, 30)
+    size = text_cache.surfaces_size(render_text("Round 1", font, (0, 0, 0)))
+    monkeypatch.setattr(text_cache, "TEXT_CACHE_BUDGET", size * 2)
+
+    for i in range(2, 10):
+        render_text(f"Round {i}", font, (0, 0, 0))
+
+    assert text_cache.text_cache_bytes <= size * 2
+    assert ("Round 9", font, (0, 0, 0), None) in text_cache.text_surfaces
+    assert ("Round 1", font, (0, 0, 0), None) not in text_cache.text_surfaces
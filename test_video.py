@@ -0,0 +1,212 @@
+import cv2
+import time
+import numpy as np
+import pytest
+import video
+from video import BackgroundVideo
+
+
+@pytest.fixture(autouse=True)
+def transcode_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(video, "VIDEO_TRANSCODE_DIR", str(tmp_path / "cache"))
+
+
+@pytest.fixture
+def video_path(tmp_path):
+    path = str(tmp_path / "clip.avi")
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), 10, (64, 48))
+    for i in range(5):
+        writer.write(np.full((48, 64, 3), i * 40, dtype=np.uint8))
+    writer.release()
+    return path
+
+
+def wait_for_frame(clip):
+    for _ in range(100):
+        frame = clip.get_frame()
+        if frame is not None:
+            return frame
+        time.sleep(0.01)
+
+
+def test_background_video_scales_frames(video_path):
+    clip = BackgroundVideo(video_path, (32, 24), buffer_size=2, preload=False)
+    try:
+        assert clip.fps == 10
+        assert wait_for_frame(clip).get_size() == (32, 24)
+    finally:
+        clip.stop()
+
+
+def test_background_video_loops(video_path):
+    clip = BackgroundVideo(video_path, (32, 24), buffer_size=2, preload=False)
+    try:
+        frames = [wait_for_frame(clip)]
+        for _ in range(12):
+            time.sleep(0.02)
+            frames.append(clip.get_frame())
+        assert all(frame is not None for frame in frames)
+        assert not clip.stopped.is_set()
+        assert clip.thread.is_alive()
+    finally:
+        clip.stop()
+
+
+def wait_for_cache(clip):
+    # The clip is cached while it plays.
+    for _ in range(200):
+        if clip.cache_complete:
+            return True
+        clip.get_frame()
+        time.sleep(0.01)
+    return False
+
+
+def frame_number(frame):
+    # The test clip's frame i is a flat gray of value i * 40.
+    return round(frame.get_at((5, 5))[0] / 40)
+
+
+def test_background_video_preload_caches_clip(video_path):
+    clip = BackgroundVideo(video_path, (32, 24), buffer_size=2, preload=True)
+    try:
+        assert wait_for_cache(clip)
+        assert len(clip.cached_frames) == 5
+        # Cached at the decode size, not the clip size.
+        assert clip.cached_frames[0].shape == (24, 32, 3)
+        assert video.cache_bytes_used >= clip.cached_bytes == 5 * 24 * 32 * 3
+        assert clip.thread.is_alive()
+        assert wait_for_frame(clip).get_size() == (32, 24)
+    finally:
+        clip.stop()
+    assert clip.cached_frames == []
+
+
+def test_background_video_preload_falls_back_to_streaming(video_path, monkeypatch):
+    monkeypatch.setattr(video, "VIDEO_CACHE_BUDGET", 32 * 24 * 3 * 2)
+    clip = BackgroundVideo(video_path, (32, 24), buffer_size=2, preload=True)
+    try:
+        assert wait_for_frame(clip) is not None
+        assert not clip.cache_complete
+        assert clip.thread.is_alive()
+    finally:
+        clip.stop()
+
+
+@pytest.mark.parametrize("preload", [False, True])
+def test_background_video_follows_native_frame_rate(video_path, monkeypatch, preload):
+    now = [100.0]
+    monkeypatch.setattr(video.time, "monotonic", lambda: now[0])
+    clip = BackgroundVideo(video_path, (32, 24), buffer_size=8, preload=preload)
+
+    def next_frame(seconds):
+        now[0] += seconds
+        for _ in range(200):
+            if clip.frames.full():
+                break
+            time.sleep(0.01)
+        return frame_number(clip.get_frame())
+
+    try:
+        assert next_frame(0) == 0
+        assert next_frame(0.05) == 0
+        assert next_frame(0.05) == 1
+        assert next_frame(0.3) == 4
+        # Looping goes on from the current frame, cached or not.
+        assert next_frame(0.1) == 0
+        assert next_frame(10) == 1
+    finally:
+        clip.stop()
+
+
+def test_background_video_streams_into_reused_buffers(video_path):
+    clip = BackgroundVideo(video_path, (32, 24), buffer_size=2, preload=False)
+    try:
+        frames = {id(wait_for_frame(clip))}
+        for _ in range(20):
+            time.sleep(0.02)
+            frames.add(id(clip.get_frame()))
+        assert frames <= {id(surface) for _, surface in clip.frame_pool}
+        assert len(clip.frame_pool) == 4
+    finally:
+        clip.stop()
+
+
+def test_convert_frame_keeps_colors(video_path):
+    clip = BackgroundVideo(video_path, (32, 24), buffer_size=2, preload=False)
+    clip.stop()
+    frame = np.zeros((48, 64, 3), dtype=np.uint8)
+    frame[..., 0] = 200  # blue, in OpenCV's BGR order
+
+    target = clip.allocate_frame()
+    surface = clip.convert_frame(frame, target)
+
+    assert surface is target[1]
+    assert surface.get_at((5, 5))[:3] == (0, 0, 200)
+
+
+def test_decode_size():
+    assert video.decode_size((1920, 1080), 1.0) == (1920, 1080)
+    assert video.decode_size((1920, 1080), 0.5) == (960, 540)
+    assert video.decode_size((1920, 1080), 1.0, (640, 640)) == (640, 640)
+    assert video.decode_size((1920, 1080), 0.5, (1280, 720)) == (640, 360)
+
+
+def test_transcoded_clip_is_used(video_path):
+    assert video.find_clip(video_path, (32, 24)) == video_path
+
+    transcoded = video.transcode_clip(video_path, (32, 24))
+    assert transcoded == video.transcoded_path(video_path, (32, 24))
+    assert video.find_clip(video_path, (32, 24)) == transcoded
+    assert video.find_clip(video_path, (16, 12)) == video_path
+
+    clip = BackgroundVideo(video_path, (32, 24), buffer_size=2, preload=True)
+    try:
+        assert wait_for_cache(clip)
+        assert clip.path == transcoded
+        assert len(clip.cached_frames) == 5
+    finally:
+        clip.stop()
+
+
+def test_cancelled_transcode_leaves_no_partial_file(video_path, tmp_path):
+    video.transcode_stop.set()
+    try:
+        assert video.transcode_clip(video_path, (32, 24)) is None
+    finally:
+        video.transcode_stop.clear()
+    assert list((tmp_path / "cache").iterdir()) == []
+
+    video.transcode_in_background(video_path, (32, 24))
+    video.stop_transcodes()
+    assert not video.transcoding
+    assert not list((tmp_path / "cache").glob("*.part.avi"))
+
+
+def test_clip_is_transcoded_in_background(video_path, monkeypatch):
+    monkeypatch.setattr(video, "VIDEO_TRANSCODE", True)
+
+    clip = BackgroundVideo(video_path, (32, 24), buffer_size=2, preload=False, quality=0.5)
+    try:
+        assert clip.decode_size == (16, 12)
+        assert wait_for_frame(clip).get_size() == (32, 24)
+    finally:
+        clip.stop()
+
+    for _ in range(100):
+        if video.find_clip(video_path, (16, 12)) != video_path:
+            break
+        time.sleep(0.02)
+    assert video.find_clip(video_path, (16, 12)) == video.transcoded_path(video_path, (16, 12))
+
+    # Clips smaller than the screen are decoded at their own size, scaled by the quality.
+    BackgroundVideo(video_path, (128, 96), buffer_size=2, preload=False).stop()
+    assert not video.transcoding
+    clip = BackgroundVideo(video_path, (128, 96), buffer_size=2, preload=False, quality=0.5)
+    clip.stop()
+    assert clip.decode_size == (32, 24)
+    for _ in range(100):
+        if video.find_clip(video_path, (32, 24)) != video_path:
+            break
+        time.sleep(0.02)
+    assert video.find_clip(video_path, (32, 24)) == video.transcoded_path(video_path, (32, 24))
@@ -0,0 +1,109 @@
+import pygame
+from functools import lru_cache
+from collections import OrderedDict
+from config import *
+
+# Rendered lines of text, least recently used first, keyed by (text, font, color, max_width).
+text_surfaces = OrderedDict()
+text_cache_bytes = 0
+
+
+@lru_cache(maxsize=TEXT_WRAP_CACHE_SIZE)
+def wrap_text(text: str, font: pygame.font.Font, max_width: int = None) -> tuple:
+    """
+    Splits text into lines that fit in the given width when rendered with the given font.
+    Results are memoized, since the same labels are wrapped again on every frame.
+
+    Args:
+        text (str): The text to wrap.
+        font (pygame.font.Font): The font used to render the text.
+        max_width (int, optional): Maximum width of a line, in pixels (no wrapping if not given).
+
+    Returns:
+        tuple: The lines of text.
+    """
+    if not max_width:
+        return (text,)
+
+    words = text.split(" ")
+    lines = []
+    current_line = ""
+
+    for word in words:
+        # Test if adding the next word will exceed the width
+        test_line = f"{current_line} {word}".strip()
+        text_width, _ = font.size(test_line)
+
+        if text_width <= max_width:
+            # Add word to the current line
+            current_line = test_line
+        else:
+            # Start a new line and add the current line to lines
+            lines.append(current_line)
+            current_line = word  # Start new line with the word that exceeded width
+
+    # Add the last line
+    if current_line:
+        lines.append(current_line)
+
+    return tuple(lines)
+
+
+def render_text(
+    text: str, font: pygame.font.Font, color: tuple, max_width: int = None
+) -> list:
+    """
+    Renders text, wrapped to max_width, reusing the surfaces rendered on previous frames.
+    The least recently used surfaces are dropped once the cache exceeds TEXT_CACHE_BUDGET bytes.
+
+    Args:
+        text (str): The text to render.
+        font (pygame.font.Font): The font used to render the text.
+        color (tuple): The color of the text.
+        max_width (int, optional): Maximum width of a line, in pixels.
+
+    Returns:
+        list: One rendered surface per line of text.
+    """
+    global text_cache_bytes
+
+    key = (text, font, tuple(color), max_width)
+
+    surfaces = text_surfaces.get(key)
+    if surfaces is not None:
+        text_surfaces.move_to_end(key)
+        return surfaces
+
+    surfaces = [font.render(line, True, color) for line in wrap_text(text, font, max_width)]
+    text_surfaces[key] = surfaces
+    text_cache_bytes += surfaces_size(surfaces)
+
+    while text_cache_bytes > TEXT_CACHE_BUDGET and len(text_surfaces) > 1:
+        _, evicted = text_surfaces.popitem(last=False)
+        text_cache_bytes -= surfaces_size(evicted)
+
+    return surfaces
+
+
+def surfaces_size(surfaces: list) -> int:
+    """
+    Computes the memory used by the pixels of some surfaces.
+
+    Args:
+        surfaces (list): The surfaces to measure.
+
+    Returns:
+        int: The size in bytes.
+    """
+    return sum(surface.get_pitch() * surface.get_height() for surface in surfaces)
+
+
+def clear_text_cache() -> None:
+    """
+    Drops every cached text surface and wrapping result.
+    """
+    global text_cache_bytes
+
+    text_surfaces.clear()
+    text_cache_bytes = 0
+    wrap_text.cache_clear()
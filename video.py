@@ -0,0 +1,501 @@
+import os
+import sys
+import cv2
+import time
+import queue
+import argparse
+import numpy
+import pygame
+import profiler
+import threading
+from config import *
+
+# Memory shared by the clips decoded once into memory (see VIDEO_CACHE_BUDGET).
+cache_lock = threading.Lock()
+cache_bytes_used = 0
+
+
+def reserve_cache_memory(size: int) -> bool:
+    """
+    Reserves memory for cached video frames within VIDEO_CACHE_BUDGET.
+
+    Args:
+        size (int): The number of bytes to reserve (negative to release memory).
+
+    Returns:
+        bool: True if the memory was reserved, False if it would exceed the budget.
+    """
+    global cache_bytes_used
+
+    with cache_lock:
+        if cache_bytes_used + size > VIDEO_CACHE_BUDGET:
+            return False
+        cache_bytes_used += size
+        return True
+
+
+# Clips being transcoded in the background, with their threads, so that each is
+# transcoded only once and running transcodes can be cancelled at exit.
+transcode_lock = threading.Lock()
+transcoding = {}
+transcode_stop = threading.Event()
+
+
+def decode_size(
+    size: tuple, quality: float = VIDEO_QUALITY, clip_size: tuple = None
+) -> tuple:
+    """
+    Computes the resolution background clips are decoded at: the screen resolution, or
+    the clip's own if it is smaller, scaled by the quality.
+
+    Args:
+        size (tuple): The (width, height) of the screen.
+        quality (float): The decode resolution relative to the screen (or smaller clip).
+        clip_size (tuple, optional): The (width, height) of the original clip.
+
+    Returns:
+        tuple: The (width, height) to decode at.
+    """
+    width, height = size
+    if clip_size:
+        width, height = min(width, clip_size[0]), min(height, clip_size[1])
+    return max(1, round(width * quality)), max(1, round(height * quality))
+
+
+def clip_size(capture) -> tuple:
+    """
+    Gives the resolution of an opened clip.
+
+    Args:
+        capture (cv2.VideoCapture): The opened clip.
+
+    Returns:
+        tuple: The (width, height) of its frames.
+    """
+    return (
+        int(capture.get(cv2.CAP_PROP_FRAME_WIDTH)),
+        int(capture.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+    )
+
+
+def transcoded_path(path: str, size: tuple) -> str:
+    """
+    Gives where the version of a clip transcoded to a resolution is kept.
+
+    Args:
+        path (str): The path of the original clip.
+        size (tuple): The (width, height) of the transcoded clip.
+
+    Returns:
+        str: The path of the transcoded clip in VIDEO_TRANSCODE_DIR.
+    """
+    name = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(VIDEO_TRANSCODE_DIR, f"{name}_{size[0]}x{size[1]}.avi")
+
+
+def find_clip(path: str, size: tuple) -> str:
+    """
+    Picks the file to decode a clip from: its transcoded version at the given resolution
+    if it exists and is newer than the original, otherwise the original.
+
+    Args:
+        path (str): The path of the original clip.
+        size (tuple): The (width, height) the clip is decoded at.
+
+    Returns:
+        str: The path of the file to decode.
+    """
+    transcoded = transcoded_path(path, size)
+    try:
+        if os.path.getmtime(transcoded) >= os.path.getmtime(path):
+            return transcoded
+    except OSError:
+        pass
+    return path
+
+
+def transcode_clip(path: str, size: tuple) -> str:
+    """
+    Transcodes a clip to a resolution, into VIDEO_TRANSCODE_DIR. Frames are downscaled
+    with area averaging, which looks better than the per-frame scaling it replaces.
+    The file only appears once it is complete: a failed or cancelled transcode (see
+    stop_transcodes) removes its partial file.
+
+    Args:
+        path (str): The path of the original clip.
+        size (tuple): The (width, height) to transcode to.
+
+    Returns:
+        str: The path of the transcoded clip, or None if the clip could not be transcoded.
+    """
+    transcoded = transcoded_path(path, size)
+    # Keep the extension, which tells OpenCV the container format.
+    partial = transcoded[: -len(".avi")] + ".part.avi"
+    os.makedirs(VIDEO_TRANSCODE_DIR, exist_ok=True)
+
+    capture = cv2.VideoCapture(path)
+    fps = capture.get(cv2.CAP_PROP_FPS) or 30
+    # Motion JPEG keeps every frame independent and cheap to decode.
+    writer = cv2.VideoWriter(partial, cv2.VideoWriter_fourcc(*"MJPG"), fps, size)
+    frames = 0
+    complete = False
+
+    try:
+        if capture.isOpened() and writer.isOpened():
+            while not transcode_stop.is_set():
+                ret, frame = capture.read()
+                if not ret:
+                    complete = True
+                    break
+                writer.write(cv2.resize(frame, size, interpolation=cv2.INTER_AREA))
+                frames += 1
+    finally:
+        capture.release()
+        writer.release()
+        if not (complete and frames):
+            try:
+                os.remove(partial)
+            except OSError:
+                pass
+
+    if not (complete and frames):
+        return None
+
+    os.replace(partial, transcoded)
+    return transcoded
+
+
+def transcode_in_background(path: str, size: tuple) -> None:
+    """
+    Transcodes a clip on a background thread, for the next time it is opened.
+
+    Args:
+        path (str): The path of the original clip.
+        size (tuple): The (width, height) to transcode to.
+    """
+
+    def run():
+        try:
+            transcode_clip(path, size)
+        finally:
+            with transcode_lock:
+                transcoding.pop((path, size), None)
+
+    with transcode_lock:
+        if (path, size) in transcoding or transcode_stop.is_set():
+            return
+        thread = threading.Thread(target=run, daemon=True)
+        transcoding[(path, size)] = thread
+        thread.start()
+
+
+def stop_transcodes() -> None:
+    """
+    Cancels the background transcodes and waits for them to remove their partial files.
+    Called when the game exits.
+    """
+    transcode_stop.set()
+    with transcode_lock:
+        threads = list(transcoding.values())
+    for thread in threads:
+        thread.join()
+    transcode_stop.clear()
+
+
+class BackgroundVideo:
+    """
+    A looping background video, decoded, converted and scaled to the screen size ahead
+    of the render loop by its own thread. OpenCV releases the GIL while it decodes and
+    resizes, so this runs in parallel with rendering.
+
+    Decoded frames wait in a bounded ring buffer; the render loop only has to blit them.
+    Frames are scaled into preallocated buffers wrapped once in surfaces, so no
+    frame-sized memory is allocated per frame.
+
+    With preload, a short looping clip is decoded only once, and its frames are kept in
+    memory at most at the decode size, so later loops only need scaling. Clips which do
+    not fit VIDEO_CACHE_BUDGET are streamed.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        size: tuple,
+        buffer_size: int = VIDEO_BUFFER_SIZE,
+        preload: bool = VIDEO_PRELOAD,
+        quality: float = VIDEO_QUALITY,
+    ):
+        """
+        Opens the video and starts its decoder thread.
+
+        Args:
+            path (str): The path of the video file.
+            size (tuple): The (width, height) the frames are scaled to.
+            buffer_size (int): The number of decoded frames kept ahead of the render loop.
+            preload (bool): Whether to keep every decoded frame in memory for looping.
+            quality (float): The decode resolution relative to size.
+        """
+        self.source_path = path
+        self.size = size
+        self.path = path
+        self.capture = cv2.VideoCapture(path)
+        original_size = clip_size(self.capture)
+        self.decode_size = decode_size(size, quality, original_size)
+
+        if self.decode_size != original_size:
+            transcoded = find_clip(path, self.decode_size)
+            if transcoded != path:
+                self.capture.release()
+                self.path = transcoded
+                self.capture = cv2.VideoCapture(transcoded)
+            elif VIDEO_TRANSCODE:
+                transcode_in_background(path, self.decode_size)
+
+        # Nearest-neighbour is enough to scale up frames decoded at a lower quality.
+        self.interpolation = cv2.INTER_NEAREST if quality < 1 else cv2.INTER_LINEAR
+        self.fps = self.capture.get(cv2.CAP_PROP_FPS) or 30
+        self.frames = queue.Queue(maxsize=buffer_size)
+        # Streaming buffers, allocated by the decoder thread.
+        self.frame_pool = []
+        self.pool_position = 0
+        self.decoded = None
+        self.current_frame = None
+        self.preload = preload
+        self.cached_frames = []
+        self.cached_bytes = 0
+        self.cache_complete = False
+        self.next_frame_time = 0.0
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.decode_loop, daemon=True)
+        self.thread.start()
+
+    def read_frame(self, loop: bool = True):
+        """
+        Reads the next frame from the video, looping back to the start if the video ends.
+
+        Args:
+            loop (bool): Whether to loop back to the start at the end of the video.
+
+        Returns:
+            numpy.ndarray: The frame in BGR order, or None if unable to read a frame.
+        """
+        with profiler.stage("video_decode"):
+            # Decode into the previous frame's array instead of a new one.
+            ret, frame = self.capture.read(self.decoded)
+            if not ret and loop:  # Loop video if it ends
+                self.capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                ret, frame = self.capture.read(self.decoded)
+        if not ret:
+            return None
+        self.decoded = frame
+        return frame
+
+    def allocate_frame(self) -> tuple:
+        """
+        Allocates a screen-sized frame buffer and the surface sharing its memory.
+
+        Returns:
+            tuple: The BGR numpy array and the Pygame surface. Pixels written into the
+                array show up in the surface, which swaps the BGR order while being blitted.
+        """
+        width, height = self.size
+        pixels = numpy.empty((height, width, 3), numpy.uint8)
+        return pixels, pygame.image.frombuffer(pixels, self.size, "BGR")
+
+    def convert_frame(self, frame, target: tuple = None) -> pygame.Surface:
+        """
+        Scales a decoded frame to the screen size, directly into the memory of a surface.
+
+        Args:
+            frame (numpy.ndarray): The frame in BGR order.
+            target (tuple, optional): The (array, surface) buffer to write to, from
+                allocate_frame (default is a new one).
+
+        Returns:
+            pygame.Surface: The frame, ready to be blitted.
+        """
+        pixels, surface = target or self.allocate_frame()
+        with profiler.stage("scaling"):
+            if frame.shape[:2] == pixels.shape[:2]:
+                # Already at the screen size (transcoded clip).
+                numpy.copyto(pixels, frame)
+            else:
+                cv2.resize(frame, self.size, dst=pixels, interpolation=self.interpolation)
+        return surface
+
+    def next_pool_frame(self) -> tuple:
+        """
+        Takes the next streaming buffer. It is free: the ring buffer holds at most
+        len(frame_pool) - 2 newer frames, and the render loop shows the frame before them.
+
+        Returns:
+            tuple: The (array, surface) buffer to write the next frame into.
+        """
+        target = self.frame_pool[self.pool_position]
+        self.pool_position = (self.pool_position + 1) % len(self.frame_pool)
+        return target
+
+    def cache_clip(self) -> bool:
+        """
+        Runs on the decoder thread: decodes the whole clip once into memory, at most at
+        the decode size, while playing it through the ring buffer like a streamed clip.
+
+        Returns:
+            bool: True if the whole clip was cached, False if it exceeded the memory budget
+                (the clip is then streamed from where caching stopped).
+        """
+        frame_count = int(self.capture.get(cv2.CAP_PROP_FRAME_COUNT))
+        width = min(int(self.capture.get(cv2.CAP_PROP_FRAME_WIDTH)), self.decode_size[0])
+        height = min(int(self.capture.get(cv2.CAP_PROP_FRAME_HEIGHT)), self.decode_size[1])
+        if frame_count * width * height * 3 > VIDEO_CACHE_BUDGET - cache_bytes_used:
+            # Too long to fit, don't waste time decoding it twice.
+            return False
+
+        while not self.stopped.is_set():
+            frame = self.read_frame(loop=False)
+            if frame is None:
+                break
+
+            # Cached frames each keep their own compact copy, scaled on playback.
+            if frame.shape[1] > width or frame.shape[0] > height:
+                cached = cv2.resize(frame, (width, height), interpolation=cv2.INTER_AREA)
+            else:
+                cached = frame.copy()
+
+            if not reserve_cache_memory(cached.nbytes):
+                reserve_cache_memory(-self.cached_bytes)
+                self.cached_frames = []
+                self.cached_bytes = 0
+                self.queue_frame(frame)
+                return False
+
+            self.cached_frames.append(cached)
+            self.cached_bytes += cached.nbytes
+            self.queue_frame(cached)
+
+        return bool(self.cached_frames)
+
+    def queue_frame(self, frame) -> None:
+        """
+        Scales a frame into the next streaming buffer and adds it to the ring buffer,
+        waiting for room unless the video is stopped.
+
+        Args:
+            frame (numpy.ndarray): The frame in BGR order.
+        """
+        surface = self.convert_frame(frame, self.next_pool_frame())
+
+        while not self.stopped.is_set():
+            try:
+                self.frames.put(surface, timeout=0.1)
+                break
+            except queue.Full:
+                pass
+
+    def decode_loop(self) -> None:
+        """
+        Runs on the decoder thread: keeps the ring buffer full until the video is stopped.
+        With preload, the clip is decoded only during its first loop, and later loops
+        are scaled from the frames cached in memory.
+        """
+        # Room for the queued frames, the current frame and the one being written.
+        self.frame_pool = [self.allocate_frame() for _ in range(self.frames.maxsize + 2)]
+
+        if self.preload and self.cache_clip():
+            self.cache_complete = True
+            self.capture.release()
+            # Playback goes on from the first frame, right after the last one cached.
+            while not self.stopped.is_set():
+                for frame in self.cached_frames:
+                    if self.stopped.is_set():
+                        return
+                    self.queue_frame(frame)
+
+        while not self.stopped.is_set():
+            frame = self.read_frame()
+            if frame is None:
+                break
+            self.queue_frame(frame)
+
+        self.capture.release()
+
+    def frames_due(self) -> int:
+        """
+        Tells how many frames the video must advance to keep its native frame rate,
+        whatever the frame rate of the render loop. Playback restarts smoothly when the
+        video is shown again after a pause, instead of skipping a long run of frames.
+
+        Returns:
+            int: The number of frames to advance (0 if the current frame is still due).
+        """
+        now = time.monotonic()
+        frame_time = 1 / self.fps
+
+        if self.current_frame is not None and now < self.next_frame_time:
+            return 0
+
+        if now - self.next_frame_time > frame_time * VIDEO_MAX_FRAME_SKIP:
+            self.next_frame_time = now + frame_time
+            return 1
+
+        due = 1 + int((now - self.next_frame_time) * self.fps + 1e-6)
+        self.next_frame_time += due * frame_time
+        return due
+
+    def get_frame(self) -> pygame.Surface:
+        """
+        Takes the frame to show now from the ring buffer, without waiting for the decoder.
+        Late frames are dropped.
+
+        Returns:
+            pygame.Surface: The current frame, the previous one if the decoder is late,
+                or None if no frame has been decoded yet.
+        """
+        due = self.frames_due()
+
+        for _ in range(due):
+            try:
+                self.current_frame = self.frames.get_nowait()
+            except queue.Empty:
+                break
+        return self.current_frame
+
+    def stop(self) -> None:
+        """
+        Stops the decoder thread, releases the video and frees its cached frames.
+        """
+        self.stopped.set()
+        self.thread.join()
+        reserve_cache_memory(-self.cached_bytes)
+        self.cached_frames = []
+        self.cached_bytes = 0
+        self.cache_complete = False
+        self.frame_pool = []
+
+
+def main(argv: list = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Transcode background clips to the resolution of a display."
+    )
+    parser.add_argument("paths", nargs="+", help="the clips to transcode")
+    parser.add_argument("--width", type=int, required=True, help="screen width")
+    parser.add_argument("--height", type=int, required=True, help="screen height")
+    parser.add_argument("--quality", type=float, default=VIDEO_QUALITY)
+
+    args = parser.parse_args(argv)
+
+    for path in args.paths:
+        capture = cv2.VideoCapture(path)
+        original_size = clip_size(capture)
+        capture.release()
+
+        size = decode_size((args.width, args.height), args.quality, original_size)
+        if size == original_size:
+            print(f"{path}: already at {size[0]}x{size[1]}")
+            continue
+        transcoded = transcode_clip(path, size)
+        print(f"{path}: {transcoded or 'could not be transcoded'}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])